@@ -13,6 +13,9 @@ sys.path.append(str(Path(__file__).parent.parent))
 # Import models to ensure they are registered with the Base metadata
 from app.db.base import Base
 from app.models.patient import Patient  # noqa
+from app.models.notification import NotificationOutbox  # noqa
+from app.models.thumbnail import DocumentThumbnail  # noqa
+from app.models.idempotency import IdempotencyKey  # noqa
 from app.core.config import settings
 
 # this is the Alembic Config object
@@ -0,0 +1,24 @@
+"""Add document_photo_original_size to patients
+
+Revision ID: 2c8f5a9e7b13
+Revises: 9e3a6b4d1f52
+Create Date: 2026-10-18 16:11:05.603417
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '2c8f5a9e7b13'
+down_revision = '9e3a6b4d1f52'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('patients', sa.Column('document_photo_original_size', sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('patients', 'document_photo_original_size')
@@ -0,0 +1,50 @@
+"""Add document photo content address columns
+
+Revision ID: 3f9c1d7a2e4b
+Revises: b2faf5a283cc
+Create Date: 2026-10-18 09:12:41.208513
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import mysql
+
+# revision identifiers, used by Alembic.
+revision = '3f9c1d7a2e4b'
+down_revision = 'b2faf5a283cc'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('patients', sa.Column('document_photo_sha256', sa.String(length=64), nullable=True))
+    op.add_column('patients', sa.Column('document_photo_size', sa.Integer(), nullable=True))
+    
+    # Backfill existing rows from the stored bytes
+    op.execute(
+        "UPDATE patients "
+        "SET document_photo_sha256 = SHA2(document_photo, 256), "
+        "document_photo_size = LENGTH(document_photo)"
+    )
+    
+    op.alter_column('patients', 'document_photo_sha256',
+               existing_type=sa.String(length=64),
+               nullable=False)
+    op.alter_column('patients', 'document_photo_size',
+               existing_type=sa.Integer(),
+               nullable=False)
+    op.alter_column('patients', 'document_photo',
+               existing_type=mysql.MEDIUMBLOB(),
+               nullable=True)
+    op.create_index('idx_patients_document_photo_sha256', 'patients', ['document_photo_sha256'], unique=False)
+
+
+def downgrade() -> None:
+    # Rows whose documents live in an external store must be moved back
+    # into document_photo before downgrading, or the NOT NULL change fails
+    op.drop_index('idx_patients_document_photo_sha256', table_name='patients')
+    op.alter_column('patients', 'document_photo',
+               existing_type=mysql.MEDIUMBLOB(),
+               nullable=False)
+    op.drop_column('patients', 'document_photo_size')
+    op.drop_column('patients', 'document_photo_sha256')
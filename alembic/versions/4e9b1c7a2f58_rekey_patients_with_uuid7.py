@@ -0,0 +1,71 @@
+"""Rekey patients with time-ordered UUIDv7 ids
+
+New patients get UUIDv7 ids from the application. Existing patients keep their
+UUIDv4 ids unless asked otherwise, because clients may have stored them:
+
+    alembic -x rekey_uuid7=true upgrade head
+
+rewrites every UUIDv4 id as a UUIDv7 of the patient's created_at (updating
+patient_documents too), drops stored idempotent responses that carry the old ids
+and rebuilds the table so the clustered index is in key order.
+
+Revision ID: 4e9b1c7a2f58
+Revises: 7d4e2a9c6b31
+Create Date: 2026-10-18 19:02:37.481920
+
+"""
+from alembic import context, op
+import sqlalchemy as sa
+
+from app.utils.uuid7 import uuid7_at
+
+# revision identifiers, used by Alembic.
+revision = '4e9b1c7a2f58'
+down_revision = '7d4e2a9c6b31'
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 5000
+
+
+def upgrade() -> None:
+    if context.get_x_argument(as_dictionary=True).get("rekey_uuid7", "").lower() not in ("1", "true", "yes"):
+        return
+
+    bind = op.get_bind()
+    op.execute(
+        "CREATE TEMPORARY TABLE patient_id_map ("
+        "old_id BINARY(16) NOT NULL PRIMARY KEY, new_id BINARY(16) NOT NULL)"
+    )
+
+    # Only ids that aren't UUIDv7 yet, so running it again doesn't rekey the same patients twice
+    rows = bind.execute(sa.text(
+        "SELECT id, created_at FROM patients WHERE (ASCII(SUBSTRING(id, 7, 1)) >> 4) <> 7"
+    )).all()
+    insert_mapping = sa.text("INSERT INTO patient_id_map (old_id, new_id) VALUES (:old_id, :new_id)")
+    for start in range(0, len(rows), BATCH_SIZE):
+        bind.execute(insert_mapping, [
+            {"old_id": id, "new_id": uuid7_at(created_at).bytes}
+            for id, created_at in rows[start:start + BATCH_SIZE]
+        ])
+
+    # Old and new ids can't collide, the version nibble differs
+    op.execute("SET FOREIGN_KEY_CHECKS = 0")
+    op.execute(
+        "UPDATE patient_documents JOIN patient_id_map ON patient_documents.patient_id = patient_id_map.old_id "
+        "SET patient_documents.patient_id = patient_id_map.new_id"
+    )
+    op.execute(
+        "UPDATE patients JOIN patient_id_map ON patients.id = patient_id_map.old_id "
+        "SET patients.id = patient_id_map.new_id"
+    )
+    op.execute("SET FOREIGN_KEY_CHECKS = 1")
+    op.execute("DROP TEMPORARY TABLE patient_id_map")
+
+    op.execute("DELETE FROM idempotency_keys")
+    op.execute("ALTER TABLE patients FORCE")
+
+
+def downgrade() -> None:
+    # UUIDv7 ids are valid UUIDs for every previous revision, rekeyed patients keep them
+    pass
@@ -0,0 +1,24 @@
+"""Add patients created_at, id index for keyset pagination
+
+Revision ID: 5d2b7f1e8c36
+Revises: c41d8e5f7a90
+Create Date: 2026-10-18 13:40:52.107385
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5d2b7f1e8c36'
+down_revision = 'c41d8e5f7a90'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index('idx_patients_created_at_id', 'patients', ['created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('idx_patients_created_at_id', table_name='patients')
@@ -0,0 +1,31 @@
+"""Create document_thumbnails table
+
+Revision ID: 9e3a6b4d1f52
+Revises: 5d2b7f1e8c36
+Create Date: 2026-10-18 15:02:37.481920
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import mysql
+
+# revision identifiers, used by Alembic.
+revision = '9e3a6b4d1f52'
+down_revision = '5d2b7f1e8c36'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('document_thumbnails',
+    sa.Column('document_sha256', sa.String(length=64), nullable=False),
+    sa.Column('size', sa.Integer(), nullable=False),
+    sa.Column('content_type', sa.String(length=100), nullable=False),
+    sa.Column('content', mysql.MEDIUMBLOB(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('document_sha256', 'size')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('document_thumbnails')
@@ -0,0 +1,39 @@
+"""Move document photo bytes to patient_documents
+
+Revision ID: c41d8e5f7a90
+Revises: 6a0e4c2b9d17
+Create Date: 2026-10-18 12:24:08.915732
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import mysql
+
+# revision identifiers, used by Alembic.
+revision = 'c41d8e5f7a90'
+down_revision = '6a0e4c2b9d17'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('patient_documents',
+    sa.Column('patient_id', sa.BINARY(length=16), nullable=False),
+    sa.Column('content', mysql.MEDIUMBLOB(), nullable=False),
+    sa.ForeignKeyConstraint(['patient_id'], ['patients.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('patient_id')
+    )
+    op.execute(
+        "INSERT INTO patient_documents (patient_id, content) "
+        "SELECT id, document_photo FROM patients WHERE document_photo IS NOT NULL"
+    )
+    op.drop_column('patients', 'document_photo')
+
+
+def downgrade() -> None:
+    op.add_column('patients', sa.Column('document_photo', mysql.MEDIUMBLOB(), nullable=True))
+    op.execute(
+        "UPDATE patients JOIN patient_documents ON patient_documents.patient_id = patients.id "
+        "SET patients.document_photo = patient_documents.content"
+    )
+    op.drop_table('patient_documents')
@@ -1,9 +1,17 @@
 from fastapi import APIRouter
 
 from app.api.endpoints.create_patients import router as patients_router
+from app.api.endpoints.download_documents import router as download_documents_router
+from app.api.endpoints.import_patients import router as import_patients_router
+from app.api.endpoints.list_patients import router as list_patients_router
+from app.api.endpoints.internal import router as internal_router
 
 # Main API router
 router = APIRouter()
 
 # Include all endpoint routers
 router.include_router(patients_router)
+router.include_router(import_patients_router)
+router.include_router(list_patients_router)
+router.include_router(download_documents_router)
+router.include_router(internal_router)
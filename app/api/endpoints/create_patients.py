@@ -2,13 +2,20 @@ from fastapi import APIRouter, Depends, status, BackgroundTasks, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 import logging
+from typing import Dict
 
+from app.core.config import settings
 from app.db.base import get_db
-from app.models.patient import Patient
+from app.db.errors import is_unique_violation
+from app.models.patient import EMAIL_UNIQUE_INDEX, Patient, PatientDocument
 from app.schemas.patient import PatientResponse, PatientFormData
-from app.services.notifications import NotificationFactory
-from app.services.file_handling import FileProcessingService
+from app.services.notifications import schedule_fan_out
+from app.services.outbox import enqueue_notification
+from app.services.patient_lookup import DUPLICATE_EMAIL_ERROR, known_emails
+from app.services.storage import documents_in_database, encode_document, store_document
+from app.services.thumbnails import thumbnail_service
 from app.utils.form import get_patient_form
+from app.utils.metrics import registration_stage_seconds
 
 logger = logging.getLogger(__name__)
 
@@ -17,7 +24,13 @@ router = APIRouter(
     tags=["patients"],
 )
 
-file_service = FileProcessingService()
+REGISTRATION_SUBJECT = "Registration Confirmation"
+REGISTRATION_MESSAGE = "Thank you for registering with our service. Your information has been received."
+
+def notification_recipients(patient: Patient) -> Dict[str, str]:
+    """Recipient of the registration notification on each configured channel"""
+    addresses = {"email": patient.email, "sms": patient.phone_number}
+    return {channel: addresses[channel] for channel in settings.NOTIFICATION_CHANNELS if channel in addresses}
 
 @router.post("/", response_model=PatientResponse, status_code=status.HTTP_201_CREATED)
 async def create_patient(
@@ -31,43 +44,76 @@ async def create_patient(
     All form data is pre-validated through dependencies.
     """
     logger.info("Starting patient creation process")
-    logger.debug(f"Processing patient data for: {form_data.patient_data.name}")
+    logger.debug("Processing patient data for: %s", form_data.patient_data.name)
+    
+    try:
+        # Store the document first so a committed patient never points at missing content
+        with registration_stage_seconds.time("document_storage"):
+            document_columns = await store_document(form_data.document_content)
+            if documents_in_database():
+                stored_content = await encode_document(form_data.document_content)
+    except Exception as e:
+        logger.error("Failed to store document: %s", e)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="An error occurred while saving the patient document"
+        )
     
     patient = Patient(
         name=form_data.patient_data.name,
         email=form_data.patient_data.email,
         phone_number=form_data.patient_data.phone_number,
-        document_photo=form_data.document_content,
         document_photo_filename=form_data.document_filename,
-        document_photo_content_type=form_data.document_content_type
+        document_photo_content_type=form_data.document_content_type,
+        document_photo_original_size=form_data.document_original_size,
+        **document_columns
     )
+    if documents_in_database():
+        patient.document = PatientDocument(content=stored_content)
     
     try:
         logger.debug("Attempting to save patient to database")
         db.add(patient)
-        await db.commit()
-        await db.refresh(patient)
-        logger.info(f"Patient {patient.id} created successfully")
+        
+        if settings.NOTIFICATION_DELIVERY == "outbox":
+            # Queued in the same transaction, so the notifications exist if and only if the patient does.
+            # One row per channel, the dispatcher delivers them concurrently and retries each on its own
+            for channel, recipient in notification_recipients(patient).items():
+                enqueue_notification(
+                    db,
+                    channel,
+                    recipient,
+                    REGISTRATION_SUBJECT,
+                    {"name": patient.name, "message": REGISTRATION_MESSAGE}
+                )
+        
+        with registration_stage_seconds.time("insert_commit"):
+            await db.commit()
+        # Only the server-generated timestamps need fetching back, never the document
+        with registration_stage_seconds.time("refresh"):
+            await db.refresh(patient, attribute_names=["created_at", "updated_at"])
+        known_emails.add(patient.email)
+        logger.info("Patient %s created successfully", patient.id)
         
     except IntegrityError as e:
         await db.rollback()
-        error_msg = str(e).lower()
-        logger.warning(f"IntegrityError during patient creation: {error_msg}")
+        logger.warning("IntegrityError during patient creation: %s", e.orig)
         
-        if "duplicate" in error_msg and "email" in error_msg:
-            logger.info(f"Duplicate email attempt: {form_data.patient_data.email}")
+        if is_unique_violation(e, EMAIL_UNIQUE_INDEX, column="email"):
+            logger.info("Duplicate email attempt: %s", form_data.patient_data.email)
+            known_emails.add(form_data.patient_data.email)
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
-                detail="A patient with this email address already exists"
+                detail=DUPLICATE_EMAIL_ERROR
             )
-        elif "duplicate" in error_msg:
+        elif is_unique_violation(e):
             logger.info("Duplicate record attempt")
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="This record already exists in the system"
             )
         else:
-            logger.error(f"Database constraint violation: {str(e)}")
+            logger.error("Database constraint violation: %s", e)
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Invalid data provided - database constraint violation"
@@ -75,27 +121,36 @@ async def create_patient(
             
     except SQLAlchemyError as e:
         await db.rollback()
-        logger.error(f"SQLAlchemy error while creating patient: {str(e)}")
+        logger.error("SQLAlchemy error while creating patient: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="An error occurred while saving the patient data"
         )
     
-    try:
-        logger.info(f"Scheduling notification for patient {patient.id}")
-        notifier = NotificationFactory.get_notifier("email")
-        notifier.schedule_notification(
-            background_tasks,
-            patient.email,
-            "Registration Confirmation",
-            {
-                "name": patient.name,
-                "message": "Thank you for registering with our service. Your information has been received."
-            }
-        )
-        logger.debug(f"Notification scheduled successfully for {patient.email}")
-    except Exception as e:
-        logger.error(f"Failed to schedule notification: {str(e)}")
+    # Rendered in a worker process once the response is sent
+    background_tasks.add_task(
+        thumbnail_service.generate_in_background,
+        patient.document_photo_sha256,
+        form_data.document_content,
+        patient.document_photo_content_type
+    )
+    
+    if settings.NOTIFICATION_DELIVERY != "outbox":
+        try:
+            logger.info("Scheduling notifications for patient %s", patient.id)
+            with registration_stage_seconds.time("notification_scheduling"):
+                schedule_fan_out(
+                    background_tasks,
+                    notification_recipients(patient),
+                    REGISTRATION_SUBJECT,
+                    {
+                        "name": patient.name,
+                        "message": REGISTRATION_MESSAGE
+                    }
+                )
+            logger.debug("Notifications scheduled successfully for %s", patient.email)
+        except Exception as e:
+            logger.error("Failed to schedule notification: %s", e)
     
-    logger.info(f"Patient creation process completed for ID: {patient.id}")
+    logger.info("Patient creation process completed for ID: %s", patient.id)
     return patient
@@ -0,0 +1,208 @@
+import uuid
+from typing import AsyncIterator, Optional
+from urllib.parse import quote
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+import logging
+
+from app.core.config import settings
+from app.db.base import SessionLocal, get_db
+from app.errors.storage import DocumentNotFoundError
+from app.models.patient import Patient, PatientDocument
+from app.services.storage import STREAM_CHUNK_SIZE, decode_document, documents_in_database, get_document_storage
+from app.services.storage.compression import HEADER_SIZE, is_compressed
+from app.services.thumbnails import thumbnail_service
+from app.utils.http_range import etag_matches, parse_range_header
+from app.utils.thumbnails import THUMBNAIL_CONTENT_TYPE
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(
+    prefix="/patients",
+    tags=["patients"],
+)
+
+DOCUMENT_NOT_FOUND_ERROR = "Patient document not found"
+THUMBNAIL_NOT_AVAILABLE_ERROR = "No thumbnail available for this document"
+
+@router.get(
+    "/{patient_id}/document",
+    response_class=StreamingResponse,
+    responses={
+        200: {"description": "The full document"},
+        206: {"description": "The requested byte range of the document"},
+        304: {"description": "The document matches If-None-Match"},
+        404: {"description": "Patient or document not found"},
+        416: {"description": "Requested range not satisfiable"},
+    }
+)
+async def download_document(
+    *,
+    patient_id: uuid.UUID,
+    range_header: Optional[str] = Header(None, alias="Range"),
+    if_none_match: Optional[str] = Header(None),
+    if_range: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Download a patient's document photo.
+    The document is streamed in chunks, single byte ranges are honoured and the
+    SHA-256 of the content is used as a strong ETag.
+    """
+    in_database = documents_in_database()
+    query = select(
+        Patient.document_photo_filename,
+        Patient.document_photo_content_type,
+        Patient.document_photo_sha256,
+        Patient.document_photo_size,
+    ).where(Patient.id == patient_id.bytes)
+    if in_database:
+        # The codec header tells whether the row can be read in ranges or must be decompressed
+        query = query.add_columns(
+            PatientDocument.patient_id,
+            func.substring(PatientDocument.content, 1, HEADER_SIZE).label("header")
+        ).outerjoin(PatientDocument)
+    
+    document = (await db.execute(query)).first()
+    if document is None or (in_database and document.patient_id is None):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=DOCUMENT_NOT_FOUND_ERROR)
+    
+    storage = None if in_database else get_document_storage()
+    if storage and not await storage.exists(document.document_photo_sha256):
+        logger.error("Document %s of patient %s is missing from the document store", document.document_photo_sha256, patient_id)
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=DOCUMENT_NOT_FOUND_ERROR)
+    
+    size = document.document_photo_size
+    etag = f'"{document.document_photo_sha256}"'
+    headers = {
+        "ETag": etag,
+        "Accept-Ranges": "bytes",
+        "Cache-Control": "private, no-cache",
+    }
+    
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    
+    # A stale If-Range means the client's partial copy is outdated, send everything
+    byte_range = None
+    if if_range is None or if_range.strip() == etag:
+        byte_range = parse_range_header(range_header, size)
+    
+    start, end = byte_range or (0, size - 1)
+    headers["Content-Length"] = str(end - start + 1)
+    headers["Content-Disposition"] = _content_disposition(document.document_photo_filename)
+    if byte_range:
+        headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    
+    if storage:
+        body = storage.stream(document.document_photo_sha256, start, end)
+    elif is_compressed(document.header):
+        body = _stream_compressed_from_database(patient_id.bytes, start, end)
+    else:
+        body = _stream_from_database(patient_id.bytes, start, end)
+    
+    return StreamingResponse(
+        body,
+        status_code=status.HTTP_206_PARTIAL_CONTENT if byte_range else status.HTTP_200_OK,
+        media_type=document.document_photo_content_type,
+        headers=headers
+    )
+
+@router.get(
+    "/{patient_id}/document/thumbnail",
+    response_class=Response,
+    responses={
+        200: {"content": {THUMBNAIL_CONTENT_TYPE: {}}, "description": "The thumbnail"},
+        304: {"description": "The thumbnail matches If-None-Match"},
+        404: {"description": "Patient not found or no thumbnail available"},
+    }
+)
+async def get_document_thumbnail(
+    *,
+    patient_id: uuid.UUID,
+    size: Optional[int] = Query(None, description="Longest edge in pixels, one of the configured THUMBNAIL_SIZES (default: smallest)"),
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Get a JPEG thumbnail of a patient's document photo, the first page for PDFs.
+    Thumbnails are generated after registration and served from an in-memory LRU.
+    """
+    sizes = sorted(settings.THUMBNAIL_SIZES)
+    size = size or sizes[0]
+    if size not in sizes:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid thumbnail size: {size}. Allowed sizes: {', '.join(map(str, sizes))}"
+        )
+    
+    document = (await db.execute(
+        select(Patient.document_photo_sha256, Patient.document_photo_content_type)
+        .where(Patient.id == patient_id.bytes)
+    )).first()
+    if document is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=DOCUMENT_NOT_FOUND_ERROR)
+    
+    # Thumbnails of a document never change, so the document hash and size identify them
+    headers = {
+        "ETag": f'"{document.document_photo_sha256}-{size}"',
+        "Cache-Control": "private, max-age=3600",
+    }
+    if etag_matches(if_none_match, headers["ETag"]):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    
+    try:
+        thumbnail = await thumbnail_service.get_thumbnail(
+            db,
+            patient_id.bytes,
+            document.document_photo_sha256,
+            document.document_photo_content_type,
+            size
+        )
+    except DocumentNotFoundError:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=DOCUMENT_NOT_FOUND_ERROR)
+    
+    if thumbnail is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=THUMBNAIL_NOT_AVAILABLE_ERROR)
+    
+    return Response(content=thumbnail, media_type=THUMBNAIL_CONTENT_TYPE, headers=headers)
+
+async def _stream_from_database(patient_id: bytes, start: int, end: int, chunk_size: int = STREAM_CHUNK_SIZE) -> AsyncIterator[bytes]:
+    """
+    Yield bytes start..end (inclusive) of a patient_documents row, one SUBSTRING per chunk.
+    The request session is already closed while the body is sent, and each chunk
+    checks a connection out only for its own query so slow clients don't hold one.
+    """
+    position = start
+    while position <= end:
+        length = min(chunk_size, end + 1 - position)
+        async with SessionLocal() as session:
+            chunk = await session.scalar(
+                select(func.substring(PatientDocument.content, position + 1, length))
+                .where(PatientDocument.patient_id == patient_id)
+            )
+        if not chunk:
+            break
+        position += len(chunk)
+        yield chunk
+
+async def _stream_compressed_from_database(patient_id: bytes, start: int, end: int,
+                                          chunk_size: int = STREAM_CHUNK_SIZE) -> AsyncIterator[bytes]:
+    """Yield bytes start..end (inclusive) of a compressed patient_documents row, which is decompressed whole"""
+    async with SessionLocal() as session:
+        data = await session.scalar(select(PatientDocument.content).where(PatientDocument.patient_id == patient_id))
+    if data is None:
+        return
+    content = await decode_document(data)
+    for position in range(start, end + 1, chunk_size):
+        yield content[position:min(position + chunk_size, end + 1)]
+
+def _content_disposition(filename: str) -> str:
+    """Build an inline Content-Disposition, with an RFC 5987 filename for non-ASCII names"""
+    quoted = quote(filename)
+    if quoted == filename:
+        return f'inline; filename="{filename}"'
+    return f"inline; filename*=utf-8''{quoted}"
@@ -0,0 +1,26 @@
+from fastapi import APIRouter, status
+from fastapi.responses import JSONResponse
+
+from app.services.warmup import warm_up
+
+router = APIRouter(
+    prefix="/health",
+    tags=["health"],
+)
+
+@router.get("/live")
+async def liveness():
+    """The process is up and serving requests"""
+    return {"status": "ok"}
+
+@router.get("/ready")
+async def readiness():
+    """
+    The process is warmed up (database connections open, templates compiled,
+    libmagic loaded) and not shutting down. 503 until then, with the state of each step.
+    """
+    snapshot = warm_up.snapshot()
+    return JSONResponse(
+        snapshot,
+        status_code=status.HTTP_200_OK if snapshot["ready"] else status.HTTP_503_SERVICE_UNAVAILABLE
+    )
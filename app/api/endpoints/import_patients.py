@@ -0,0 +1,33 @@
+from fastapi import APIRouter, Depends, File, UploadFile
+from sqlalchemy.ext.asyncio import AsyncSession
+import logging
+
+from app.db.base import get_db
+from app.schemas.patient import PatientImportReport
+from app.services.file_handling import file_processing_service
+from app.services.patient_import import PatientImportService
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(
+    prefix="/patients",
+    tags=["patients"],
+)
+
+import_service = PatientImportService(file_processing_service)
+
+@router.post("/import", response_model=PatientImportReport)
+async def import_patients(
+    *,
+    manifest: UploadFile = File(..., description="NDJSON or CSV manifest with name, email, phone_number and document columns"),
+    documents: UploadFile = File(..., description="Zip archive with the documents referenced by the manifest"),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Import patients in bulk.
+    Every manifest row is validated like a single registration and the
+    response reports the outcome of each row; invalid rows and duplicate
+    emails are rejected without aborting the rest of the import.
+    """
+    logger.info("Starting bulk import from manifest %s", manifest.filename)
+    return await import_service.import_patients(db, manifest, documents)
@@ -0,0 +1,45 @@
+from fastapi import APIRouter
+
+from app.db.base import pool_stats, replicas
+from app.services.file_handling import validation_timings
+from app.services.memory_budget import memory_budget
+
+router = APIRouter(
+    prefix="/internal",
+    tags=["internal"],
+)
+
+@router.get("/db-pool")
+async def get_db_pool_stats():
+    """
+    Live database connection pool statistics: current checked-out and
+    overflow connections, checkout wait-time and connection lifetime histograms.
+    """
+    return pool_stats.snapshot()
+
+
+@router.get("/validation")
+async def get_validation_timings():
+    """
+    Time spent in each document validator, as histograms in seconds,
+    to see where upload validation time goes.
+    """
+    return validation_timings.snapshot()
+
+
+@router.get("/memory-budget")
+async def get_memory_budget():
+    """
+    Upload memory budget of this process: bytes reserved by in-flight uploads,
+    requests waiting for room, admitted and rejected counts, and queue wait times.
+    """
+    return memory_budget.snapshot()
+
+
+@router.get("/db-replicas")
+async def get_db_replicas():
+    """
+    Read replicas of this process: health, ejections, sessions served and pool
+    statistics of each, and how often reads fell back to the primary.
+    """
+    return replicas.snapshot()
@@ -0,0 +1,75 @@
+from datetime import datetime
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy import and_, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+import logging
+
+from app.db.base import get_read_db
+from app.models.patient import Patient
+from app.schemas.patient import PatientListResponse, PatientResponse
+from app.utils.pagination import decode_cursor, encode_cursor
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(
+    prefix="/patients",
+    tags=["patients"],
+)
+
+# Explicit projection, listing never needs the document
+LIST_COLUMNS = (
+    Patient.id,
+    Patient.name,
+    Patient.email,
+    Patient.phone_number,
+    Patient.document_photo_filename,
+    Patient.document_photo_content_type,
+    Patient.created_at,
+    Patient.updated_at,
+)
+
+@router.get("/", response_model=PatientListResponse)
+async def list_patients(
+    *,
+    limit: int = Query(50, ge=1, le=200, description="Maximum number of patients per page"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    created_after: Optional[datetime] = Query(None, description="Only patients created at or after this time"),
+    created_before: Optional[datetime] = Query(None, description="Only patients created before this time"),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """
+    List patients, newest first.
+    Read-only, so it's served by a read replica when any are configured.
+    Uses keyset pagination on (created_at, id), so every page costs the same
+    index range scan no matter how deep it is.
+    """
+    query = select(*LIST_COLUMNS)
+    
+    if created_after is not None:
+        query = query.where(Patient.created_at >= created_after)
+    if created_before is not None:
+        query = query.where(Patient.created_at < created_before)
+    
+    if cursor:
+        cursor_created_at, cursor_id = decode_cursor(cursor)
+        # Spelled out instead of a row comparison so MySQL uses a range scan on idx_patients_created_at_id
+        query = query.where(or_(
+            Patient.created_at < cursor_created_at,
+            and_(Patient.created_at == cursor_created_at, Patient.id < cursor_id)
+        ))
+    
+    query = query.order_by(Patient.created_at.desc(), Patient.id.desc()).limit(limit + 1)
+    rows = (await db.execute(query)).all()
+    
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].created_at, rows[-1].id)
+    
+    logger.debug("Listed %s patients", len(rows))
+    return PatientListResponse(
+        items=[PatientResponse.model_validate(row) for row in rows],
+        next_cursor=next_cursor
+    )
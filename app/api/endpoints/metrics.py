@@ -0,0 +1,68 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from app.db.base import pool_stats, replicas
+from app.services.file_handling import validation_timings
+from app.services.memory_budget import memory_budget
+from app.utils.metrics import metrics, render_histogram
+
+router = APIRouter(
+    tags=["internal"],
+)
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+def _pool_metrics():
+    """Database pool statistics, read at scrape time"""
+    snapshot = pool_stats.snapshot()
+    for name in ("checked_out", "checked_in", "overflow"):
+        if name in snapshot:
+            yield f"# TYPE db_pool_{name} gauge"
+            yield f"db_pool_{name} {snapshot[name]}"
+    for name in ("checkouts", "checkout_timeouts", "connections_opened", "connections_invalidated"):
+        yield f"# TYPE db_pool_{name}_total counter"
+        yield f"db_pool_{name}_total {snapshot[name]}"
+    yield "# TYPE db_pool_checkout_wait_seconds histogram"
+    yield from render_histogram("db_pool_checkout_wait_seconds", pool_stats.checkout_wait)
+
+def _replica_metrics():
+    """Read replica health and routing, labelled by replica"""
+    if not replicas.replicas:
+        return
+    yield "# TYPE db_replica_healthy gauge"
+    for replica in replicas.replicas:
+        yield f'db_replica_healthy{{replica="{replica.name}"}} {int(replica.healthy)}'
+    for name in ("sessions", "ejections"):
+        yield f"# TYPE db_replica_{name}_total counter"
+        for replica in replicas.replicas:
+            yield f'db_replica_{name}_total{{replica="{replica.name}"}} {getattr(replica, name)}'
+    yield "# TYPE db_replica_primary_fallbacks_total counter"
+    yield f"db_replica_primary_fallbacks_total {replicas.primary_fallbacks}"
+
+def _validator_metrics():
+    """Per-validator timings of the document validator chain"""
+    yield "# TYPE document_validator_seconds histogram"
+    for validator, histogram in validation_timings.histograms().items():
+        yield from render_histogram("document_validator_seconds", histogram, {"validator": validator})
+
+def _memory_budget_metrics():
+    """Upload memory budget utilisation"""
+    snapshot = memory_budget.snapshot()
+    for name in ("capacity_bytes", "in_use_bytes", "waiting"):
+        yield f"# TYPE memory_budget_{name} gauge"
+        yield f"memory_budget_{name} {snapshot[name]}"
+    for name in ("admitted", "rejected"):
+        yield f"# TYPE memory_budget_{name}_total counter"
+        yield f"memory_budget_{name}_total {snapshot[name]}"
+    yield "# TYPE memory_budget_queue_wait_seconds histogram"
+    yield from render_histogram("memory_budget_queue_wait_seconds", memory_budget.queue_wait)
+
+metrics.register_collector(_pool_metrics)
+metrics.register_collector(_replica_metrics)
+metrics.register_collector(_validator_metrics)
+metrics.register_collector(_memory_budget_metrics)
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    """Application metrics in the Prometheus text exposition format"""
+    return PlainTextResponse(metrics.render(), media_type=PROMETHEUS_CONTENT_TYPE)
@@ -1,14 +1,143 @@
+from typing import Dict, List, Optional
+
 from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
     # Database
     DATABASE_URL: str
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0
+    # Recycle connections before MySQL's wait_timeout closes them server-side
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    DB_CONNECT_TIMEOUT: int = 10
+    # Connections opened at startup, before the process reports ready (at most DB_POOL_SIZE)
+    DB_POOL_WARMUP_CONNECTIONS: int = 2
+    
+    # Optional read replicas, used by routes that only read (get_read_db)
+    # "round_robin" or "least_connections", an unreachable replica is skipped for DB_REPLICA_EJECT_SECONDS
+    DATABASE_REPLICA_URLS: List[str] = []
+    DB_REPLICA_STRATEGY: str = "round_robin"
+    DB_REPLICA_EJECT_SECONDS: float = 30.0
     
     # Email
     EMAIL_HOST: str
     EMAIL_PORT: int
     EMAIL_USER: str
     EMAIL_PASSWORD: str
+    EMAIL_POOL_SIZE: int = 5
+    EMAIL_POOL_IDLE_TIMEOUT: float = 60.0
+    # Locale of email templates used when a notification doesn't ask for one
+    EMAIL_DEFAULT_LOCALE: str = "en"
+    
+    # Notifications
+    # "outbox" queues notifications in the database for the dispatcher worker,
+    # "background" sends them from the API process with FastAPI BackgroundTasks
+    NOTIFICATION_DELIVERY: str = "outbox"
+    # Channels notified on registration, "email" and/or "sms"
+    NOTIFICATION_CHANNELS: List[str] = ["email"]
+    # Concurrent sends and seconds per send (including the wait for a slot), per channel
+    NOTIFICATION_CONCURRENCY: Dict[str, int] = {"email": 10, "sms": 20}
+    NOTIFICATION_TIMEOUTS: Dict[str, float] = {"email": 15.0, "sms": 5.0}
+    NOTIFICATION_DEFAULT_CONCURRENCY: int = 10
+    NOTIFICATION_DEFAULT_TIMEOUT: float = 10.0
+    OUTBOX_BATCH_SIZE: int = 50
+    OUTBOX_POLL_INTERVAL: float = 1.0
+    OUTBOX_LEASE_SECONDS: int = 300
+    OUTBOX_MAX_ATTEMPTS: int = 8
+    OUTBOX_BACKOFF_BASE: float = 5.0
+    OUTBOX_BACKOFF_MAX: float = 3600.0
+    
+    # Document storage
+    # "database" keeps document bytes in the patients table,
+    # any other value selects a registered DocumentStorage backend (e.g. "local")
+    DOCUMENT_STORAGE_BACKEND: str = "database"
+    DOCUMENT_STORAGE_PATH: str = "/data/documents"
+    # Compression of document bytes kept in the database: "zlib", "zstd" (needs the zstandard package) or "none".
+    # Documents are stored raw when compressing saves less than DOCUMENT_COMPRESSION_MIN_SAVINGS (e.g. JPEGs),
+    # documents above DOCUMENT_COMPRESSION_THREADPOOL_BYTES are (de)compressed in a worker thread
+    DOCUMENT_COMPRESSION: str = "zlib"
+    DOCUMENT_COMPRESSION_LEVEL: Optional[int] = None
+    DOCUMENT_COMPRESSION_MIN_SAVINGS: float = 0.1
+    DOCUMENT_COMPRESSION_THREADPOOL_BYTES: int = 64 * 1024
+    
+    # Worker processes for CPU-bound image work (thumbnails, normalization)
+    IMAGE_WORKERS: int = 2
+    
+    # Document normalization (opt-in)
+    # Downscales photos to DOCUMENT_MAX_DIMENSION pixels, strips metadata and re-encodes
+    # them as JPEG at DOCUMENT_JPEG_QUALITY before they are stored
+    DOCUMENT_NORMALIZATION: bool = False
+    DOCUMENT_MAX_DIMENSION: int = 2048
+    DOCUMENT_JPEG_QUALITY: int = 85
+    
+    # Document thumbnails
+    # Longest edge in pixels of each thumbnail
+    THUMBNAIL_SIZES: List[int] = [128, 512]
+    THUMBNAIL_QUALITY: int = 80
+    # In-memory LRU of recently served thumbnails
+    THUMBNAIL_CACHE_MAX_BYTES: int = 32 * 1024 * 1024
+    
+    # Cache of registered emails used to reject duplicates before reading the document
+    KNOWN_EMAIL_CACHE_SIZE: int = 10000
+    KNOWN_EMAIL_CACHE_TTL: float = 300.0
+    
+    # Idempotency-Key support for POST /api/patients/
+    # Responses are kept for IDEMPOTENCY_TTL seconds, a key claimed by a request that never
+    # finished can be claimed again after IDEMPOTENCY_LOCK_SECONDS
+    IDEMPOTENCY_TTL: int = 24 * 60 * 60
+    IDEMPOTENCY_LOCK_SECONDS: int = 60
+    # How long a retry waits for the original request before answering 409 Conflict
+    IDEMPOTENCY_WAIT_TIMEOUT: float = 30.0
+    IDEMPOTENCY_CACHE_SIZE: int = 1000
+    
+    # Memory budget for uploads in flight, per process
+    # A request reserves its Content-Length times MEMORY_BUDGET_COPIES (the upload is copied
+    # while it is read, validated and written), or MEMORY_BUDGET_DEFAULT_REQUEST_BYTES without one.
+    # Requests that don't fit wait up to MEMORY_BUDGET_QUEUE_TIMEOUT seconds, then get 503
+    MEMORY_BUDGET_BYTES: int = 256 * 1024 * 1024
+    MEMORY_BUDGET_COPIES: int = 4
+    MEMORY_BUDGET_DEFAULT_REQUEST_BYTES: int = 5 * 1024 * 1024
+    MEMORY_BUDGET_QUEUE_TIMEOUT: float = 5.0
+    MEMORY_BUDGET_RETRY_AFTER: int = 2
+    
+    # Production server, see gunicorn_conf.py (development runs uvicorn --reload instead)
+    # SERVER_WORKERS of 0 starts one worker per available core
+    SERVER_BIND: str = "0.0.0.0:8080"
+    SERVER_WORKERS: int = 0
+    SERVER_PRELOAD: bool = True
+    # A worker is replaced after SERVER_MAX_REQUESTS requests, plus a random jitter so they don't all restart at once,
+    # or once its resident memory exceeds SERVER_WORKER_MAX_MEMORY_MB (0 disables it), checked every N requests
+    SERVER_MAX_REQUESTS: int = 10000
+    SERVER_MAX_REQUESTS_JITTER: int = 1000
+    SERVER_WORKER_MAX_MEMORY_MB: int = 0
+    SERVER_MEMORY_CHECK_INTERVAL: int = 100
+    # Seconds in-flight requests get to finish when a worker stops, and before a silent worker is killed
+    SERVER_GRACEFUL_TIMEOUT: int = 30
+    SERVER_WORKER_TIMEOUT: int = 60
+    
+    # Startup warm-up, failed steps (e.g. the database isn't up yet) are retried
+    # with exponential backoff up to WARMUP_RETRY_MAX seconds between attempts
+    WARMUP_RETRY_INITIAL: float = 0.5
+    WARMUP_RETRY_MAX: float = 30.0
+    
+    # Bulk import
+    # Batches are flushed when either limit is reached, the byte limit keeps
+    # multi-row INSERTs with document bytes under MySQL's max_allowed_packet
+    BULK_IMPORT_BATCH_SIZE: int = 100
+    BULK_IMPORT_BATCH_MAX_BYTES: int = 32 * 1024 * 1024
+    
+    # Logging
+    # "console" writes coloured lines, "json" compact JSON lines for log shippers
+    LOG_FORMAT: str = "console"
+    LOG_LEVEL: str = "INFO"
+    # Level of the application's own "app.*" loggers
+    APP_LOG_LEVEL: str = "DEBUG"
+    # Write logs from a background thread so stdout never blocks the event loop
+    LOG_QUEUE: bool = False
+    # Fraction of INFO and lower records kept per logger name, e.g. {"app.api.endpoints.create_patients": 0.1}
+    LOG_SAMPLING: Dict[str, float] = {}
     
     model_config = {
         "env_file": ".env",
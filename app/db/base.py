@@ -1,15 +1,94 @@
-from typing import AsyncGenerator
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+import asyncio
+from typing import AsyncGenerator, List, Optional
+from sqlalchemy.ext.asyncio import AsyncAttrs, AsyncConnection, AsyncEngine, AsyncSession, create_async_engine
 from sqlalchemy.orm import declarative_base, sessionmaker
 
 from app.core.config import settings
+from app.db.errors import is_connection_error
+from app.db.pool_stats import PoolStatistics, instrumented_pool_class
+from app.db.replicas import ReplicaSet
 
-engine = create_async_engine(settings.DATABASE_URL)
-SessionLocal = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+def create_engine(url: str, stats: PoolStatistics) -> AsyncEngine:
+    """Create an engine with the configured pool, reporting to `stats`"""
+    engine = create_async_engine(
+        url,
+        poolclass=instrumented_pool_class(stats),
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        connect_args={"connect_timeout": settings.DB_CONNECT_TIMEOUT}
+    )
+    stats.attach(engine)
+    return engine
 
-Base = declarative_base()
+pool_stats = PoolStatistics()
+
+_engine: Optional[AsyncEngine] = None
+
+def get_engine() -> AsyncEngine:
+    """Get the primary engine, creating it on first use rather than at import"""
+    global _engine
+    if _engine is None:
+        _engine = create_engine(settings.DATABASE_URL, pool_stats)
+    return _engine
+
+class _PrimarySessionMaker(sessionmaker):
+    """sessionmaker bound to the primary engine when the first session is made"""
+    
+    def __call__(self, **local_kw) -> AsyncSession:
+        if self.kw.get("bind") is None:
+            self.configure(bind=get_engine())
+        return super().__call__(**local_kw)
+
+
+SessionLocal = _PrimarySessionMaker(class_=AsyncSession, expire_on_commit=False)
+
+# Optional read replicas for read-only sessions, see get_read_db
+replicas = ReplicaSet(
+    settings.DATABASE_REPLICA_URLS,
+    create_engine,
+    SessionLocal,
+    strategy=settings.DB_REPLICA_STRATEGY,
+    eject_seconds=settings.DB_REPLICA_EJECT_SECONDS
+)
+
+# AsyncAttrs allows lazy relationships to be loaded explicitly with `await obj.awaitable_attrs.<name>`
+Base = declarative_base(cls=AsyncAttrs)
+
+async def warm_up_pool(connections: int) -> None:
+    """
+    Open up to `connections` primary pool connections at once and return them to the pool,
+    so the first requests don't pay for connecting
+    """
+    engine = get_engine()
+    opened: List[AsyncConnection] = []
+    try:
+        for _ in range(min(connections, settings.DB_POOL_SIZE)):
+            connection = engine.connect()
+            await connection.start()
+            opened.append(connection)
+    finally:
+        await asyncio.gather(*(connection.close() for connection in opened), return_exceptions=True)
+
+def dispose_engines_after_fork() -> None:
+    """
+    Give a forked worker its own connection pools. Connections inherited from the
+    parent are dropped without being closed, they still belong to the parent
+    """
+    if _engine is not None:
+        _engine.sync_engine.dispose(close=False)
+    replicas.dispose_after_fork()
+
+async def dispose_engines() -> None:
+    """Close every pooled connection of the primary and the replicas, e.g. on shutdown"""
+    if _engine is not None:
+        await _engine.dispose()
+    await replicas.dispose()
 
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
+    """Session on the primary, for writes and reads that must see them"""
     async with SessionLocal() as session:
         try:
             yield session
@@ -18,4 +97,21 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
             await session.rollback()
             raise
         finally:
-            await session.close()
\ No newline at end of file
+            await session.close()
+
+async def get_read_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Session for read-only work, on a read replica when any are configured and healthy.
+    Replicas may lag behind the primary, so flows that read their own writes use get_db.
+    Nothing is committed.
+    """
+    replica, session = await replicas.open_session()
+    try:
+        yield session
+    except Exception as e:
+        if replica is not None and is_connection_error(e):
+            replicas.eject(replica, e)
+        raise
+    finally:
+        await session.rollback()
+        await session.close()
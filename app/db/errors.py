@@ -0,0 +1,63 @@
+import re
+from typing import Optional
+
+from sqlalchemy.exc import DBAPIError, IntegrityError, InterfaceError, OperationalError
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+# MySQL error code for duplicate entries in a unique index
+MYSQL_DUPLICATE_ENTRY = 1062
+# MySQL client errors for unreachable or lost servers, and "Too many connections"
+MYSQL_CONNECTION_ERRORS = {1040, 2002, 2003, 2006, 2013}
+# SQLSTATE for unique violations in PostgreSQL
+POSTGRES_UNIQUE_VIOLATION = "23505"
+
+_MYSQL_KEY_PATTERN = re.compile(r"for key '(?:[^'.]+\.)?([^']+)'")
+
+def is_unique_violation(exc: IntegrityError, index_name: Optional[str] = None,
+                        column: Optional[str] = None) -> bool:
+    """
+    Check whether an IntegrityError was caused by a unique index or constraint.
+    When index_name is given the violation must be on that index. SQLite only
+    reports the columns involved, so column is matched there instead.
+    """
+    orig = exc.orig
+    args = getattr(orig, "args", ())
+    
+    # MySQL drivers (asyncmy, pymysql, mysqlclient): (1062, "Duplicate entry 'x' for key 'table.index'")
+    if args and args[0] == MYSQL_DUPLICATE_ENTRY:
+        if index_name is None:
+            return True
+        match = _MYSQL_KEY_PATTERN.search(str(args[1]) if len(args) > 1 else "")
+        return bool(match) and match.group(1) == index_name
+    
+    # PostgreSQL drivers expose the SQLSTATE and the violated constraint
+    sqlstate = getattr(orig, "sqlstate", None) or getattr(orig, "pgcode", None)
+    if sqlstate == POSTGRES_UNIQUE_VIOLATION:
+        if index_name is None:
+            return True
+        diag = getattr(orig, "diag", None)
+        constraint = getattr(orig, "constraint_name", None) or getattr(diag, "constraint_name", None)
+        return constraint == index_name
+    
+    # SQLite: "UNIQUE constraint failed: table.column"
+    message = str(orig)
+    if message.startswith("UNIQUE constraint failed"):
+        if column is None:
+            return index_name is None
+        return re.search(rf"\.{re.escape(column)}\b", message) is not None
+    
+    return False
+
+def is_connection_error(exc: BaseException) -> bool:
+    """
+    Check whether an error means the database couldn't be reached, as opposed
+    to a problem with the statement itself
+    """
+    if isinstance(exc, (PoolTimeoutError, ConnectionError, OSError)):
+        return True
+    if isinstance(exc, DBAPIError):
+        if exc.connection_invalidated or isinstance(exc, InterfaceError):
+            return True
+        args = getattr(exc.orig, "args", ())
+        return isinstance(exc, OperationalError) and bool(args) and args[0] in MYSQL_CONNECTION_ERRORS
+    return False
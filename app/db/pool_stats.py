@@ -0,0 +1,112 @@
+import time
+from typing import Any, Dict, Optional, Type
+
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from app.utils.stats import Histogram, LATENCY_BUCKETS
+
+# Connection lifetimes, in seconds
+LIFETIME_BUCKETS = (1, 10, 60, 300, 900, 1800, 3600, 7200, 14400)
+
+class PoolStatistics:
+    """
+    Live statistics for a connection pool, collected through SQLAlchemy pool
+    events plus checkout wait times measured by an instrumented pool class.
+    """
+    
+    def __init__(self):
+        self.checkout_wait = Histogram(LATENCY_BUCKETS + (30.0,))
+        self.connection_lifetime = Histogram(LIFETIME_BUCKETS)
+        self.connections_opened = 0
+        self.connections_closed = 0
+        self.connections_invalidated = 0
+        self.checkouts = 0
+        self.checkout_timeouts = 0
+        self._engine: Optional[AsyncEngine] = None
+    
+    def attach(self, engine: AsyncEngine) -> None:
+        """Listen to the engine's pool events"""
+        self._engine = engine
+        pool = engine.sync_engine.pool
+        event.listen(pool, "connect", self._on_connect)
+        event.listen(pool, "checkout", self._on_checkout)
+        event.listen(pool, "close", self._on_close)
+        event.listen(pool, "close_detached", self._on_close_detached)
+        event.listen(pool, "invalidate", self._on_invalidate)
+    
+    def _on_connect(self, dbapi_connection, connection_record) -> None:
+        self.connections_opened += 1
+        connection_record.info["connected_at"] = time.monotonic()
+    
+    def _on_checkout(self, dbapi_connection, connection_record, connection_proxy) -> None:
+        self.checkouts += 1
+    
+    def _observe_lifetime(self, info: Dict[str, Any]) -> None:
+        connected_at = info.pop("connected_at", None)
+        if connected_at is not None:
+            self.connections_closed += 1
+            self.connection_lifetime.observe(time.monotonic() - connected_at)
+    
+    def _on_close(self, dbapi_connection, connection_record) -> None:
+        self._observe_lifetime(connection_record.info)
+    
+    def _on_close_detached(self, dbapi_connection) -> None:
+        self.connections_closed += 1
+    
+    def _on_invalidate(self, dbapi_connection, connection_record, exception) -> None:
+        self.connections_invalidated += 1
+    
+    def observe_checkout_wait(self, seconds: float, timed_out: bool = False) -> None:
+        self.checkout_wait.observe(seconds)
+        if timed_out:
+            self.checkout_timeouts += 1
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """Current pool state and collected statistics"""
+        state = {}
+        if self._engine is not None:
+            pool = self._engine.sync_engine.pool
+            state = {
+                "size": pool.size(),
+                "checked_out": pool.checkedout(),
+                "checked_in": pool.checkedin(),
+                "overflow": pool.overflow()
+            }
+        return {
+            **state,
+            "checkouts": self.checkouts,
+            "checkout_timeouts": self.checkout_timeouts,
+            "connections_opened": self.connections_opened,
+            "connections_closed": self.connections_closed,
+            "connections_invalidated": self.connections_invalidated,
+            "checkout_wait_seconds": self.checkout_wait.snapshot(),
+            "connection_lifetime_seconds": self.connection_lifetime.snapshot()
+        }
+
+
+def instrumented_pool_class(stats: PoolStatistics) -> Type[AsyncAdaptedQueuePool]:
+    """
+    Build a queue pool class that reports how long each checkout waited.
+    Pools recreate themselves from their class on dispose(), so the
+    statistics are bound to the class rather than to the pool instance.
+    """
+    class InstrumentedAsyncQueuePool(AsyncAdaptedQueuePool):
+        # SQLAlchemy names the pool logger after the class module. Under app.* it would
+        # inherit APP_LOG_LEVEL and log every checkout, keep it under sqlalchemy.pool
+        __module__ = AsyncAdaptedQueuePool.__module__
+        
+        def _do_get(self):
+            start = time.perf_counter()
+            timed_out = False
+            try:
+                return super()._do_get()
+            except PoolTimeoutError:
+                timed_out = True
+                raise
+            finally:
+                stats.observe_checkout_wait(time.perf_counter() - start, timed_out)
+    
+    return InstrumentedAsyncQueuePool
@@ -0,0 +1,142 @@
+import itertools
+import logging
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+from app.db.errors import is_connection_error
+from app.db.pool_stats import PoolStatistics
+
+logger = logging.getLogger(__name__)
+
+ROUND_ROBIN = "round_robin"
+LEAST_CONNECTIONS = "least_connections"
+STRATEGIES = (ROUND_ROBIN, LEAST_CONNECTIONS)
+
+class Replica:
+    """A read replica with its own engine, pool statistics and health state"""
+    
+    def __init__(self, url: str, engine: AsyncEngine, pool_stats: PoolStatistics):
+        self.name = make_url(url).render_as_string(hide_password=True)
+        self.engine = engine
+        self.pool_stats = pool_stats
+        self.session_factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+        self.ejected_until = 0.0
+        self.ejections = 0
+        self.sessions = 0
+    
+    @property
+    def healthy(self) -> bool:
+        return self.ejected_until <= time.monotonic()
+    
+    @property
+    def checked_out(self) -> int:
+        return self.engine.sync_engine.pool.checkedout()
+    
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "healthy": self.healthy,
+            "ejected_for_seconds": max(self.ejected_until - time.monotonic(), 0.0),
+            "ejections": self.ejections,
+            "sessions": self.sessions,
+            "pool": self.pool_stats.snapshot()
+        }
+
+
+class ReplicaSet:
+    """
+    Read replicas that read-only sessions are spread over, their engines are created on first use.
+    Replicas are picked round-robin or by fewest checked-out connections. One that
+    can't be reached is ejected for eject_seconds and skipped, and when no replica
+    is healthy sessions fall back to the primary.
+    """
+    
+    def __init__(
+        self,
+        urls: Sequence[str],
+        engine_factory: Callable[[str, PoolStatistics], AsyncEngine],
+        primary_session_factory: Callable[[], AsyncSession],
+        strategy: str = ROUND_ROBIN,
+        eject_seconds: float = 30.0
+    ):
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Unknown replica strategy {strategy!r}, expected one of {', '.join(STRATEGIES)}")
+        self.urls = list(urls)
+        self.engine_factory = engine_factory
+        self._replicas: Optional[List[Replica]] = None
+        self.primary_session_factory = primary_session_factory
+        self.strategy = strategy
+        self.eject_seconds = eject_seconds
+        self.primary_fallbacks = 0
+        self._next = itertools.count()
+    
+    @property
+    def replicas(self) -> List[Replica]:
+        if self._replicas is None:
+            self._replicas = []
+            for url in self.urls:
+                stats = PoolStatistics()
+                self._replicas.append(Replica(url, self.engine_factory(url, stats), stats))
+        return self._replicas
+    
+    def candidates(self) -> List[Replica]:
+        """Healthy replicas, the preferred one first and the others as fallbacks"""
+        healthy = [replica for replica in self.replicas if replica.healthy]
+        if not healthy:
+            return []
+        if self.strategy == LEAST_CONNECTIONS:
+            # Stable sort, so ties keep rotating with the round-robin start below
+            start = next(self._next) % len(healthy)
+            rotated = healthy[start:] + healthy[:start]
+            return sorted(rotated, key=lambda replica: replica.checked_out)
+        start = next(self._next) % len(healthy)
+        return healthy[start:] + healthy[:start]
+    
+    async def open_session(self) -> Tuple[Optional[Replica], AsyncSession]:
+        """
+        Open a session with a connection on a healthy replica, or on the primary if none can be reached.
+        Returns (replica or None for the primary, session)
+        """
+        for replica in self.candidates():
+            session = replica.session_factory()
+            try:
+                # Check out the connection now, so an unreachable replica is skipped before the request uses it
+                await session.connection()
+            except Exception as e:
+                await session.close()
+                if not is_connection_error(e):
+                    raise
+                self.eject(replica, e)
+                continue
+            replica.sessions += 1
+            return replica, session
+        
+        if self.urls:
+            self.primary_fallbacks += 1
+        return None, self.primary_session_factory()
+    
+    def eject(self, replica: Replica, error: BaseException) -> None:
+        """Stop using a replica for eject_seconds"""
+        replica.ejected_until = time.monotonic() + self.eject_seconds
+        replica.ejections += 1
+        logger.warning("Ejected read replica %s for %.0fs: %s", replica.name, self.eject_seconds, error)
+    
+    def dispose_after_fork(self) -> None:
+        """Forget connections inherited from the parent process, without closing them under it"""
+        for replica in self._replicas or []:
+            replica.engine.sync_engine.dispose(close=False)
+    
+    async def dispose(self) -> None:
+        for replica in self._replicas or []:
+            await replica.engine.dispose()
+    
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "strategy": self.strategy,
+            "primary_fallbacks": self.primary_fallbacks,
+            "replicas": [replica.snapshot() for replica in self.replicas]
+        }
@@ -0,0 +1,13 @@
+class IdempotencyError(Exception):
+    """Base error for Idempotency-Key handling"""
+    pass
+
+class IdempotencyKeyInProgressError(IdempotencyError):
+    """Error raised when a request with the same key is still being processed"""
+    def __str__(self):
+        return "A request with this Idempotency-Key is still being processed"
+
+class IdempotencyKeyReusedError(IdempotencyError):
+    """Error raised when a key is reused for a different request"""
+    def __str__(self):
+        return "This Idempotency-Key was already used for a different request"
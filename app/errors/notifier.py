@@ -6,3 +6,13 @@ class NoNotifierError(NotifierError):
     """Error raised when a requested notifier type is not registered"""
     def __str__(self):
         return "No notifier found for the requested type"
+
+class NotificationTimeoutError(NotifierError):
+    """Error raised when a channel didn't deliver a notification in time"""
+    def __init__(self, channel: str, timeout: float):
+        super().__init__(channel, timeout)
+        self.channel = channel
+        self.timeout = timeout
+    
+    def __str__(self):
+        return f"Notification on channel {self.channel} timed out after {self.timeout:g}s"
@@ -0,0 +1,22 @@
+class StorageError(Exception):
+    """Base error for document storage issues"""
+    pass
+
+class NoStorageBackendError(StorageError):
+    """Error raised when a requested storage backend is not registered"""
+    def __str__(self):
+        return "No storage backend found for the requested type"
+
+class DocumentCodecError(StorageError):
+    """Error raised when stored document bytes use a codec that can't be decoded here"""
+    def __init__(self, codec: str):
+        super().__init__(codec)
+        self.codec = codec
+    
+    def __str__(self):
+        return f"Document is compressed with unsupported codec: {self.codec}"
+
+class DocumentNotFoundError(StorageError):
+    """Error raised when a document is not present in the store"""
+    def __str__(self):
+        return "Document not found in storage"
@@ -0,0 +1,47 @@
+"""
+Gunicorn configuration for production: several uvicorn worker processes per container.
+
+    cd /app && gunicorn main:app -c gunicorn_conf.py
+
+Development keeps a single `uvicorn main:app --reload` process, see the Dockerfile.
+Values come from the SERVER_* settings.
+"""
+import os
+
+from app.core.config import settings
+from app.db.base import dispose_engines_after_fork
+from app.utils.logger import setup_logging
+
+def available_cores() -> int:
+    """Cores this process may run on, which respects CPU affinity unlike os.cpu_count()"""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+def worker_count() -> int:
+    """Configured number of workers, one per available core by default"""
+    return settings.SERVER_WORKERS if settings.SERVER_WORKERS > 0 else available_cores()
+
+bind = settings.SERVER_BIND
+worker_class = "uvicorn_worker.UvicornWorker"
+workers = worker_count()
+
+# Import the app once in the master, so workers start quickly and share its pages.
+# Safe because importing it opens no connections or threads, those are created per worker
+# (engines on first use, warm-up in the lifespan, image worker processes are spawned)
+preload_app = settings.SERVER_PRELOAD
+
+# Recycle workers after a number of requests, spread out by the jitter.
+# WorkerRecycleMiddleware also recycles them above SERVER_WORKER_MAX_MEMORY_MB
+max_requests = settings.SERVER_MAX_REQUESTS
+max_requests_jitter = settings.SERVER_MAX_REQUESTS_JITTER
+
+# On SIGTERM (or a restart) workers stop accepting connections and get this long to finish in-flight requests
+graceful_timeout = settings.SERVER_GRACEFUL_TIMEOUT
+timeout = settings.SERVER_WORKER_TIMEOUT
+
+def post_fork(server, worker):
+    # Pools and the log writer thread must not be shared with the master or other workers
+    dispose_engines_after_fork()
+    setup_logging()
@@ -1,27 +1,71 @@
+import asyncio
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from starlette.concurrency import run_in_threadpool
 import logging
 
 from app.api.endpoints import router as api_router
+from app.api.endpoints.health import router as health_router
+from app.api.endpoints.metrics import router as metrics_router
+from app.core.config import settings
+from app.middleware import IdempotencyMiddleware, MemoryBudgetMiddleware, MetricsMiddleware, WorkerRecycleMiddleware
+from app.db.base import dispose_engines, warm_up_pool
+from app.services import NotificationFactory
+from app.services.email_templates import email_templates
+from app.services.file_handling import file_processing_service
+from app.services.image_workers import shutdown_image_executor
+from app.services.warmup import warm_up
 from app.utils.logger import setup_logging
 
-setup_logging(logging.INFO)
+setup_logging()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Pay for connecting, compiling templates and loading libmagic before the first request
+    # instead of during it. Runs in the background, GET /health/ready reports when it's done
+    warm_up.add("database_pool", lambda: warm_up_pool(settings.DB_POOL_WARMUP_CONNECTIONS))
+    warm_up.add("email_templates", lambda: run_in_threadpool(email_templates.load))
+    warm_up.add("document_validation", file_processing_service.warm_up)
+    warm_up_task = asyncio.create_task(warm_up.run())
+    yield
+    # Stop reporting ready, then release shared resources
+    warm_up.stopping = True
+    warm_up_task.cancel()
+    await asyncio.gather(warm_up_task, return_exceptions=True)
+    await NotificationFactory.close_all()
+    shutdown_image_executor()
+    await dispose_engines()
 
 app = FastAPI(
     title="Patient Registration API",
     description="API for registering patients and uploading their documents",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
+# Uploads are admitted against the per-process memory budget before their body is read.
+# Added first so it runs last, replayed idempotent responses don't need a reservation
+app.add_middleware(MemoryBudgetMiddleware, paths=["/api/patients/", "/api/patients/import"])
+# Retried registrations with the same Idempotency-Key get the first response back
+app.add_middleware(IdempotencyMiddleware, paths=["/api/patients/"])
+app.add_middleware(MetricsMiddleware)
+# Restarts the worker once it holds more than SERVER_WORKER_MAX_MEMORY_MB, off by default
+app.add_middleware(WorkerRecycleMiddleware)
+# Added last so it's outermost, responses answered by the middlewares above get CORS headers too
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Idempotent-Replayed", "Retry-After"],
 )
 
 app.include_router(api_router, prefix="/api")
+app.include_router(metrics_router)
+app.include_router(health_router)
 
 @app.get("/")
 async def root():
@@ -0,0 +1,11 @@
+from app.middleware.idempotency import IdempotencyMiddleware
+from app.middleware.memory_budget import MemoryBudgetMiddleware
+from app.middleware.metrics import MetricsMiddleware
+from app.middleware.worker_recycle import WorkerRecycleMiddleware
+
+__all__ = [
+    'IdempotencyMiddleware',
+    'MemoryBudgetMiddleware',
+    'MetricsMiddleware',
+    'WorkerRecycleMiddleware'
+]
@@ -0,0 +1,111 @@
+from typing import Iterable, List, Optional
+
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.errors.idempotency import IdempotencyKeyInProgressError, IdempotencyKeyReusedError
+from app.services.idempotency import (
+    IdempotencyStore,
+    StoredResponse,
+    idempotency_store,
+    request_fingerprint
+)
+
+IDEMPOTENCY_KEY_HEADER = b"idempotency-key"
+MAX_KEY_LENGTH = 255
+# Only small responses such as PatientResponse are stored, larger ones are never replayed
+MAX_STORED_BODY_BYTES = 64 * 1024
+
+class IdempotencyMiddleware:
+    """
+    Replays the stored response of requests retried with the same Idempotency-Key header.
+    Runs before the request body is read, so a retried upload is answered without being received.
+    Only successful responses are stored, a failed request can be retried with the same key.
+    """
+    
+    def __init__(self, app: ASGIApp, paths: Iterable[str], methods: Iterable[str] = ("POST",),
+                 store: Optional[IdempotencyStore] = None):
+        self.app = app
+        self.paths = {path.rstrip("/") for path in paths}
+        self.methods = set(methods)
+        self.store = store or idempotency_store
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        key = self._idempotency_key(scope)
+        if key is None:
+            await self.app(scope, receive, send)
+            return
+        
+        if not key or len(key) > MAX_KEY_LENGTH:
+            await _error(400, f"Idempotency-Key must be 1 to {MAX_KEY_LENGTH} characters")(scope, receive, send)
+            return
+        
+        fingerprint = request_fingerprint(scope["method"], scope["path"])
+        try:
+            stored = await self.store.acquire(key, fingerprint)
+        except IdempotencyKeyReusedError as e:
+            await _error(422, str(e))(scope, receive, send)
+            return
+        except IdempotencyKeyInProgressError as e:
+            await _error(409, str(e), {"Retry-After": "1"})(scope, receive, send)
+            return
+        
+        if stored is not None:
+            await _replay(stored, send)
+            return
+        
+        status_code = None
+        content_type = ""
+        body: List[bytes] = []
+        body_size = 0
+        
+        async def send_and_capture(message: Message) -> None:
+            nonlocal status_code, content_type, body_size
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                for name, value in message.get("headers", []):
+                    if name.lower() == b"content-type":
+                        content_type = value.decode("latin-1")
+            elif message["type"] == "http.response.body" and body_size <= MAX_STORED_BODY_BYTES:
+                chunk = message.get("body", b"")
+                body.append(chunk)
+                body_size += len(chunk)
+            await send(message)
+        
+        completed = False
+        try:
+            await self.app(scope, receive, send_and_capture)
+            completed = status_code is not None and 200 <= status_code < 300 and body_size <= MAX_STORED_BODY_BYTES
+        finally:
+            if completed:
+                await self.store.complete(key, fingerprint, StoredResponse(status_code, content_type, b"".join(body)))
+            else:
+                await self.store.release(key)
+    
+    def _idempotency_key(self, scope: Scope) -> Optional[str]:
+        if scope["type"] != "http" or scope["method"] not in self.methods:
+            return None
+        if scope["path"].rstrip("/") not in self.paths:
+            return None
+        for name, value in scope["headers"]:
+            if name == IDEMPOTENCY_KEY_HEADER:
+                return value.decode("latin-1").strip()
+        return None
+
+
+async def _replay(stored: StoredResponse, send: Send) -> None:
+    await send({
+        "type": "http.response.start",
+        "status": stored.status_code,
+        "headers": [
+            (b"content-type", stored.content_type.encode("latin-1")),
+            (b"content-length", str(len(stored.body)).encode()),
+            (b"idempotent-replayed", b"true"),
+        ],
+    })
+    await send({"type": "http.response.body", "body": stored.body})
+
+
+def _error(status_code: int, detail: str, headers: Optional[dict] = None) -> JSONResponse:
+    # Same body as FastAPI's HTTPException responses
+    return JSONResponse({"detail": detail}, status_code=status_code, headers=headers)
@@ -0,0 +1,65 @@
+import time
+from typing import Iterable, Optional
+
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core.config import settings
+from app.services.memory_budget import MemoryBudget, memory_budget
+
+MEMORY_BUDGET_EXCEEDED_ERROR = "The server is busy processing other uploads, please retry shortly"
+
+class MemoryBudgetMiddleware:
+    """
+    Admits upload requests against the process memory budget before their body is read.
+    The reservation is held until the response and its background tasks are done,
+    since those keep the document bytes alive too.
+    """
+    
+    def __init__(
+        self,
+        app: ASGIApp,
+        paths: Iterable[str],
+        budget: Optional[MemoryBudget] = None,
+        copies: Optional[int] = None,
+        default_request_bytes: Optional[int] = None,
+        queue_timeout: Optional[float] = None
+    ):
+        self.app = app
+        self.paths = {path.rstrip("/") for path in paths}
+        self.budget = budget or memory_budget
+        self.copies = copies or settings.MEMORY_BUDGET_COPIES
+        self.default_request_bytes = default_request_bytes or settings.MEMORY_BUDGET_DEFAULT_REQUEST_BYTES
+        self.queue_timeout = settings.MEMORY_BUDGET_QUEUE_TIMEOUT if queue_timeout is None else queue_timeout
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] != "POST" or scope["path"].rstrip("/") not in self.paths:
+            await self.app(scope, receive, send)
+            return
+        
+        reservation = self._request_bytes(scope) * self.copies
+        if not await self.budget.acquire(reservation, self.queue_timeout):
+            response = JSONResponse(
+                {"detail": MEMORY_BUDGET_EXCEEDED_ERROR},
+                status_code=503,
+                headers={"Retry-After": str(settings.MEMORY_BUDGET_RETRY_AFTER)}
+            )
+            await response(scope, receive, send)
+            return
+        # Handlers tell the admission wait (and idempotency checks) apart from receiving the body
+        scope.setdefault("state", {})["request_admitted"] = time.perf_counter()
+        
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.budget.release(reservation)
+    
+    def _request_bytes(self, scope: Scope) -> int:
+        for name, value in scope["headers"]:
+            if name == b"content-length":
+                try:
+                    return max(int(value), 0)
+                except ValueError:
+                    break
+        # Chunked uploads are assumed to be as large as an accepted document
+        return self.default_request_bytes
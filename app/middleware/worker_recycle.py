@@ -0,0 +1,70 @@
+import logging
+import os
+import resource
+import signal
+import sys
+from typing import Callable, Optional
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+BYTES_PER_MB = 1024 * 1024
+
+def resident_memory_bytes() -> int:
+    """Current resident set size of this process, or its peak where the current one isn't available"""
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Kilobytes on Linux, bytes on macOS
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+class WorkerRecycleMiddleware:
+    """
+    Stops the worker gracefully once its resident memory exceeds max_memory_bytes,
+    so memory held after large uploads (fragmentation, caches, leaks) can't grow without bound.
+    The worker gets SIGTERM, drains its in-flight requests and gunicorn starts a fresh one.
+    Memory is checked every check_interval requests, a limit of 0 disables the check.
+    """
+    
+    def __init__(
+        self,
+        app: ASGIApp,
+        max_memory_bytes: Optional[int] = None,
+        check_interval: Optional[int] = None,
+        memory_usage: Callable[[], int] = resident_memory_bytes
+    ):
+        self.app = app
+        self.max_memory_bytes = settings.SERVER_WORKER_MAX_MEMORY_MB * BYTES_PER_MB if max_memory_bytes is None else max_memory_bytes
+        self.check_interval = check_interval or settings.SERVER_MEMORY_CHECK_INTERVAL
+        self.memory_usage = memory_usage
+        self.requests = 0
+        self.recycling = False
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self.max_memory_bytes or self.recycling:
+            await self.app(scope, receive, send)
+            return
+        
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.requests += 1
+            if self.requests % self.check_interval == 0:
+                self._check_memory()
+    
+    def _check_memory(self) -> None:
+        used = self.memory_usage()
+        if used <= self.max_memory_bytes:
+            return
+        self.recycling = True
+        logger.warning(
+            "Worker %s uses %.0fMB, over the %.0fMB limit after %s requests, restarting it",
+            os.getpid(), used / BYTES_PER_MB, self.max_memory_bytes / BYTES_PER_MB, self.requests
+        )
+        os.kill(os.getpid(), signal.SIGTERM)
@@ -0,0 +1,34 @@
+from sqlalchemy import Column, DateTime, Integer, LargeBinary, String, func, Index
+
+from app.db.base import Base
+
+class IdempotencyKey(Base):
+    """
+    Response of a request made with an Idempotency-Key header.
+    The row is inserted when a request claims the key and completed with the response,
+    response columns stay NULL while the request is in progress.
+    """
+    __tablename__ = "idempotency_keys"
+    
+    key = Column(String(255), primary_key=True)
+    # Hash of the method and path, a key can't be reused for a different request
+    request_fingerprint = Column(String(64), nullable=False)
+    
+    status_code = Column(Integer, nullable=True)
+    content_type = Column(String(100), nullable=True)
+    response_body = Column(LargeBinary, nullable=True)
+    
+    # Lock expiry while in progress, retention expiry once completed
+    expires_at = Column(DateTime, nullable=False)
+    created_at = Column(DateTime, server_default=func.now(), nullable=False)
+    
+    __table_args__ = (
+        Index('idx_idempotency_keys_expires_at', expires_at),
+    )
+    
+    @property
+    def is_completed(self) -> bool:
+        return self.status_code is not None
+    
+    def __repr__(self):
+        return f"<IdempotencyKey(key={self.key}, status_code={self.status_code})>"
@@ -0,0 +1,42 @@
+from sqlalchemy import BigInteger, Column, DateTime, Integer, JSON, String, Text, func, Index
+
+from app.db.base import Base
+
+class NotificationOutbox(Base):
+    """
+    Notification waiting to be delivered by the outbox dispatcher.
+    Rows are written in the same transaction as the change that triggers them.
+    """
+    __tablename__ = "notification_outbox"
+    
+    STATUS_PENDING = "pending"
+    STATUS_PROCESSING = "processing"
+    STATUS_SENT = "sent"
+    STATUS_FAILED = "failed"
+    
+    # SQLite only auto-increments INTEGER primary keys
+    id = Column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True, autoincrement=True)
+    channel = Column(String(20), nullable=False)
+    recipient = Column(String(255), nullable=False)
+    subject = Column(String(255), nullable=False)
+    content = Column(JSON, nullable=False)
+    
+    status = Column(String(20), nullable=False, default=STATUS_PENDING)
+    attempts = Column(Integer, nullable=False, default=0)
+    last_error = Column(Text, nullable=True)
+    
+    # Earliest time the next delivery attempt may run (pushed back on retries)
+    available_at = Column(DateTime, server_default=func.now(), nullable=False)
+    # Lease held by a dispatcher while it delivers the row, so crashed workers' rows get picked up again
+    locked_until = Column(DateTime, nullable=True)
+    sent_at = Column(DateTime, nullable=True)
+    
+    created_at = Column(DateTime, server_default=func.now(), nullable=False)
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now(), nullable=False)
+    
+    __table_args__ = (
+        Index('idx_notification_outbox_status_available', status, available_at),
+    )
+    
+    def __repr__(self):
+        return f"<NotificationOutbox(id={self.id}, channel={self.channel}, status={self.status})>"
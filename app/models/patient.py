@@ -1,27 +1,50 @@
 import uuid
 
-from sqlalchemy import Column, DateTime, String, func, Index
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, String, func, Index
 from sqlalchemy.dialects.mysql import BINARY, MEDIUMBLOB
+from sqlalchemy.orm import relationship
 
 from app.db.base import Base
+from app.utils.uuid7 import uuid7
+
+EMAIL_UNIQUE_INDEX = "idx_patients_email_unique"
 
 class Patient(Base):
     __tablename__ = "patients"
-
-    id = Column(BINARY(16), primary_key=True, default=lambda: uuid.uuid4().bytes)
+    
+    # Time-ordered UUIDv7, so inserts append to the clustered primary key instead of splitting random pages.
+    # Patients created before may still have UUIDv4 ids, see the rekey migration 4e9b1c7a2f58
+    id = Column(BINARY(16), primary_key=True, default=lambda: uuid7().bytes)
     name = Column(String(100), nullable=False)
     email = Column(String(255), nullable=False)
     phone_number = Column(String(20), nullable=False)
     
-    document_photo = Column(MEDIUMBLOB, nullable=False)
     document_photo_filename = Column(String(255), nullable=False)
     document_photo_content_type = Column(String(100), nullable=False)
+    document_photo_sha256 = Column(String(64), nullable=False)
+    document_photo_size = Column(Integer, nullable=False)
+    # Upload size before normalization, NULL for documents stored before it was recorded
+    document_photo_original_size = Column(Integer, nullable=True)
     
     created_at = Column(DateTime, server_default=func.now(), nullable=False)
     updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now(), nullable=False)
     
+    # Document bytes live in their own table and are never loaded unless asked for,
+    # e.g. with `await patient.awaitable_attrs.document` or selectinload(Patient.document).
+    # Only set with the "database" storage backend, otherwise the document is
+    # kept in the document store under document_photo_sha256
+    document = relationship(
+        "PatientDocument",
+        uselist=False,
+        lazy="select",
+        cascade="all, delete-orphan",
+        passive_deletes=True
+    )
+    
     __table_args__ = (
-        Index('idx_patients_email_unique', email, unique=True),
+        Index(EMAIL_UNIQUE_INDEX, email, unique=True),
+        Index('idx_patients_document_photo_sha256', document_photo_sha256),
+        Index('idx_patients_created_at_id', created_at, id),
     )
     
     @property
@@ -31,6 +54,17 @@ class Patient(Base):
     
     def __str__(self):
         return f"Patient: {self.name} ({self.email})"
-
+    
     def __repr__(self):
         return f"<Patient(id={self.id_as_uuid}, name={self.name}, email={self.email})>"
+
+
+class PatientDocument(Base):
+    """Document photo bytes, one row per patient"""
+    __tablename__ = "patient_documents"
+    
+    patient_id = Column(BINARY(16), ForeignKey("patients.id", ondelete="CASCADE"), primary_key=True)
+    content = Column(MEDIUMBLOB, nullable=False)
+    
+    def __repr__(self):
+        return f"<PatientDocument(patient_id={uuid.UUID(bytes=self.patient_id)})>"
@@ -0,0 +1,20 @@
+from sqlalchemy import Column, DateTime, Integer, String, func
+from sqlalchemy.dialects.mysql import MEDIUMBLOB
+
+from app.db.base import Base
+
+class DocumentThumbnail(Base):
+    """
+    Thumbnail of a document photo.
+    Keyed by the document's content hash, so patients sharing a document share its thumbnails.
+    """
+    __tablename__ = "document_thumbnails"
+    
+    document_sha256 = Column(String(64), primary_key=True)
+    size = Column(Integer, primary_key=True)
+    content_type = Column(String(100), nullable=False)
+    content = Column(MEDIUMBLOB, nullable=False)
+    created_at = Column(DateTime, server_default=func.now(), nullable=False)
+    
+    def __repr__(self):
+        return f"<DocumentThumbnail(document_sha256={self.document_sha256}, size={self.size})>"
@@ -1,5 +1,6 @@
 import uuid
 from datetime import datetime
+from typing import List, Literal, Optional
 
 from pydantic import BaseModel, EmailStr, Field, field_validator, ConfigDict
 import re
@@ -35,11 +36,35 @@ class PatientResponse(PatientBase):
     }
 
 
+class PatientListResponse(BaseModel):
+    """Page of patients returned by the listing endpoint"""
+    items: List[PatientResponse]
+    next_cursor: Optional[str] = Field(None, description="Cursor for the next page, null on the last page")
+
+
 class PatientFormData(BaseModel):
     """Combined form data with both patient details and document"""
     patient_data: PatientCreate
     document_content: bytes
     document_filename: str
     document_content_type: str
+    document_original_size: int
     
     model_config = ConfigDict(arbitrary_types_allowed=True)
+
+
+class PatientImportRowResult(BaseModel):
+    """Outcome of importing a single manifest row"""
+    row: int = Field(..., description="1-based row number within the manifest")
+    email: Optional[str] = None
+    status: Literal["created", "rejected"]
+    id: Optional[uuid.UUID] = None
+    error: Optional[str] = None
+
+
+class PatientImportReport(BaseModel):
+    """Per-row report returned by the bulk import endpoint"""
+    total: int
+    created: int
+    rejected: int
+    results: List[PatientImportRowResult]
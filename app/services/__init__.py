@@ -1,4 +1,4 @@
 # Import all notifiers to ensure they're registered with the factory
-from app.services.notifications import Notifier, NotificationFactory
+from app.services.notifications import Notifier, NotificationFactory, fan_out, schedule_fan_out
 from app.services.email_notifier import EmailNotifier
 from app.services.sms_notifier import SMSNotifier
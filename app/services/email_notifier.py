@@ -1,53 +1,75 @@
 import logging
-from typing import Dict, Any
+from typing import Dict, Any, List, Tuple, Union
 
-from aiosmtplib import SMTP
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 
+from app.services.email_templates import DEFAULT_TEMPLATE, email_templates
 from app.services.notifications import Notifier, NotificationFactory
+from app.services.smtp_pool import close_smtp_pool, get_smtp_pool
 from app.core.config import settings
+from app.utils.batching import ThreadPoolBatcher
 
 logger = logging.getLogger(__name__)
 
 class EmailNotifier(Notifier):
-    """Email notification implementation"""
+    """
+    Email notification implementation
+    The body comes from the template named by content["template"] in the locale
+    content["locale"], rendered with the rest of the content.
+    """
+    
+    channel = "email"
+    
+    @staticmethod
+    def build_message(recipient: str, subject: str, content: Dict[str, Any]) -> MIMEMultipart:
+        """Build the MIME message for a notification, with HTML and plain text alternatives"""
+        rendered = email_templates.render(
+            content.get("template", DEFAULT_TEMPLATE),
+            content.get("locale"),
+            {**content, "subject": subject}
+        )
+        
+        message = MIMEMultipart("alternative")
+        message["Subject"] = subject
+        message["From"] = settings.EMAIL_USER
+        message["To"] = recipient
+        
+        # Clients show the last alternative they support, so HTML goes last
+        message.attach(MIMEText(rendered.text, "plain", "utf-8"))
+        message.attach(MIMEText(rendered.html, "html", "utf-8"))
+        return message
     
     async def send_notification(self, recipient: str, subject: str, content: Dict[str, Any]) -> bool:
         """Send email notification"""
         try:
-            message = MIMEMultipart("alternative")
-            message["Subject"] = subject
-            message["From"] = settings.EMAIL_USER
-            message["To"] = recipient
-            
-            html = f"""
-            <html>
-            <body>
-                <h2>{subject}</h2>
-                <p>Dear {content.get('name', 'Patient')},</p>
-                <p>{content.get('message', 'Thank you for registering with our service.')}</p>
-                <p>Best regards,<br>Patient Registration Team</p>
-            </body>
-            </html>
-            """
+            # Rendered and serialized in a worker thread, together with other messages sent at the same time
+            message = await _message_batcher.submit((recipient, subject, content))
             
-            message.attach(MIMEText(html, "html"))
-            
-            async with SMTP(
-                hostname=settings.EMAIL_HOST,
-                port=settings.EMAIL_PORT,
-                username=settings.EMAIL_USER,
-                password=settings.EMAIL_PASSWORD,
-                use_tls=False,  # Start with plain connection
-                start_tls=True,  # Auto-upgrade to TLS
-            ) as smtp:
-                await smtp.send_message(message)
+            # Reuse a warm, authenticated connection from the shared pool
+            await get_smtp_pool().sendmail(settings.EMAIL_USER, [recipient], message)
                 
-            logger.info(f"Email notification sent to {recipient}")
+            logger.info("Email notification sent to %s", recipient)
             return True
         except Exception as e:
-            logger.error(f"Failed to send email notification: {str(e)}")
+            logger.error("Failed to send email notification: %s", e)
             return False
+    
+    async def close(self) -> None:
+        """Close the pooled SMTP connections"""
+        await close_smtp_pool()
+
+
+def _serialize_messages(requests: List[Tuple[str, str, Dict[str, Any]]]) -> List[Union[bytes, Exception]]:
+    messages = []
+    for recipient, subject, content in requests:
+        try:
+            messages.append(EmailNotifier.build_message(recipient, subject, content).as_bytes())
+        except Exception as e:
+            messages.append(e)
+    return messages
+
+
+_message_batcher = ThreadPoolBatcher(_serialize_messages)
 
 NotificationFactory.register_notifier("email", EmailNotifier)
@@ -0,0 +1,79 @@
+import logging
+from pathlib import Path
+from typing import Any, Dict, Iterator, NamedTuple, Optional, Tuple
+
+from jinja2 import Environment, FileSystemLoader, Template, TemplateNotFound, select_autoescape
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+TEMPLATE_DIR = Path(__file__).resolve().parent.parent / "templates" / "email"
+DEFAULT_TEMPLATE = "notification"
+
+class RenderedEmail(NamedTuple):
+    html: str
+    text: str
+
+
+class EmailTemplates:
+    """
+    Jinja2 templates for notification emails, compiled once and cached by name and locale.
+    Each template is a pair of files, <locale>/<name>.html and <locale>/<name>.txt.
+    A locale without its own variant falls back to its language (pt-BR to pt), then to the default locale.
+    HTML templates are autoescaped, so content values can't inject markup.
+    """
+    
+    def __init__(self, directory: Path = TEMPLATE_DIR, default_locale: Optional[str] = None):
+        self.default_locale = default_locale or settings.EMAIL_DEFAULT_LOCALE
+        self.environment = Environment(
+            loader=FileSystemLoader(str(directory)),
+            autoescape=select_autoescape(["html"]),
+            # Templates ship with the code, never check them for changes
+            auto_reload=False,
+            keep_trailing_newline=True
+        )
+        self._resolved: Dict[Tuple[str, str], Tuple[Template, Template]] = {}
+    
+    def load(self) -> int:
+        """Compile every template up front, e.g. at startup. Returns the number of templates"""
+        names = self.environment.list_templates(extensions=["html", "txt"])
+        for name in names:
+            self.environment.get_template(name)
+        logger.info("Compiled %s email templates", len(names))
+        return len(names)
+    
+    def get(self, name: str, locale: Optional[str] = None) -> Tuple[Template, Template]:
+        """Get the (html, text) templates for a name and locale"""
+        key = (name, (locale or self.default_locale).lower())
+        templates = self._resolved.get(key)
+        if templates is None:
+            templates = self._resolve(*key)
+            self._resolved[key] = templates
+        return templates
+    
+    def render(self, name: str, locale: Optional[str], context: Dict[str, Any]) -> RenderedEmail:
+        html, text = self.get(name, locale)
+        return RenderedEmail(html.render(context), text.render(context))
+    
+    def _resolve(self, name: str, locale: str) -> Tuple[Template, Template]:
+        for candidate in self._fallbacks(locale):
+            try:
+                return (
+                    self.environment.get_template(f"{candidate}/{name}.html"),
+                    self.environment.get_template(f"{candidate}/{name}.txt")
+                )
+            except TemplateNotFound:
+                continue
+        raise TemplateNotFound(f"{name} ({locale})")
+    
+    def _fallbacks(self, locale: str) -> Iterator[str]:
+        yield locale
+        language = locale.replace("_", "-").split("-")[0]
+        if language != locale:
+            yield language
+        if self.default_locale not in (locale, language):
+            yield self.default_locale
+
+
+email_templates = EmailTemplates()
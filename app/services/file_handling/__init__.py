@@ -1,15 +1,20 @@
 from app.services.file_handling.validators.base import FileValidator
+from app.services.file_handling.validators.timings import validation_timings
 from app.services.file_handling.validators import (
     ContentTypeValidator,
     MagicNumberValidator, 
-    FileSizeValidator
+    FileSizeValidator,
+    build_validator_chain
 )
-from app.services.file_handling.service import FileProcessingService
+from app.services.file_handling.service import FileProcessingService, file_processing_service
 
 __all__ = [
     'FileValidator',
     'ContentTypeValidator',
     'MagicNumberValidator',
     'FileSizeValidator',
-    'FileProcessingService'
+    'FileProcessingService',
+    'build_validator_chain',
+    'file_processing_service',
+    'validation_timings'
 ]
\ No newline at end of file
@@ -1,29 +1,70 @@
+import logging
+import os
+from typing import BinaryIO, Optional, Tuple
+
 from fastapi import UploadFile, HTTPException, status
+from starlette.concurrency import run_in_threadpool
+from starlette.formparsers import MultiPartParser
 
+from app.core.config import settings
+from app.services.image_workers import run_in_image_worker
 from app.services.file_handling.validators import (
     ContentTypeValidator,
     MagicNumberValidator,
-    FileSizeValidator
+    FileSizeValidator,
+    build_validator_chain
 )
+from app.utils.image_normalization import JPEG_CONTENT_TYPE, normalize_image
+from app.utils.metrics import document_processing_seconds, document_stored_bytes, document_upload_bytes
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 64 * 1024  # 64KB
+# First read of a streamed upload, enough for every header check (libmagic sniffs 2KB)
+HEADER_CHUNK_SIZE = 4 * 1024  # 4KB
 
 class FileProcessingService:
     """Service for file validation and processing"""
     
-    def __init__(self):
+    def __init__(self, streaming: bool = True, chunk_size: int = DEFAULT_CHUNK_SIZE, normalize: Optional[bool] = None):
         # Default allowed types for document photos
         self.document_allowed_types = {"image/jpeg", "image/jpg", "image/png", "application/pdf"}
         self.max_file_size = 5 * 1024 * 1024  # 5MB
         
-        # Setup validation chain
-        size_validator = FileSizeValidator(self.max_file_size)
-        content_type_validator = ContentTypeValidator(self.document_allowed_types, size_validator)
-        self.validator_chain = MagicNumberValidator(content_type_validator)
+        # Streaming intake reads the upload in chunks and validates as it goes
+        self.streaming = streaming
+        self.chunk_size = chunk_size
+        
+        # Optional normalization shrinks image documents before they are stored
+        self.normalize = settings.DOCUMENT_NORMALIZATION if normalize is None else normalize
+        self.max_dimension = settings.DOCUMENT_MAX_DIMENSION
+        self.jpeg_quality = settings.DOCUMENT_JPEG_QUALITY
+        
+        # Setup validation chain, ordered cheapest first
+        self.validator_chain = build_validator_chain(
+            MagicNumberValidator(),
+            ContentTypeValidator(self.document_allowed_types),
+            FileSizeValidator(self.max_file_size)
+        )
+    
+    async def warm_up(self) -> None:
+        """Load the validators' resources, e.g. the libmagic database, before the first upload"""
+        await self.validator_chain.warm_up()
     
     async def validate_document(self, file: UploadFile) -> bytes:
         """
         Validate document file and return its contents
         Raises HTTPException if validation fails
         """
+        with document_processing_seconds.time("validation"):
+            content = await self._validate_document(file)
+        document_upload_bytes.observe(len(content))
+        return content
+    
+    async def _validate_document(self, file: UploadFile) -> bytes:
+        if self.streaming:
+            return await self.stream_document(file)
+        
         # Read file content first so we can validate it
         file_content = await file.read()
         
@@ -31,12 +72,109 @@ class FileProcessingService:
         is_valid, error_message = await self.validator_chain.validate(file, file_content)
         
         if not is_valid:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=error_message
-            )
+            self._reject(error_message)
         
         # Reset file pointer if needed for further processing
         await file.seek(0)
         
         return file_content
+    
+    async def stream_document(self, file: UploadFile) -> bytes:
+        """
+        Read document file in chunks, validating each chunk as it is read,
+        and return its contents.
+        The header checks (type, magic number) run once on the first chunk, later
+        chunks only go through the validators that count bytes. Stops reading and
+        raises HTTPException on the first failing chunk, so oversized or mistyped
+        uploads are rejected without being buffered.
+        """
+        header = await file.read(min(self.chunk_size, HEADER_CHUNK_SIZE))
+        if not header:
+            # Empty uploads never produce a chunk, run the full chain on them instead
+            is_valid, error_message = await self.validator_chain.validate(file, b"")
+            if not is_valid:
+                self._reject(error_message)
+            await file.seek(0)
+            return b""
+        
+        is_valid, error_message = await self.validator_chain.validate_chunk(file, header, 0)
+        if not is_valid:
+            self._reject(error_message)
+        
+        if file.size is not None:
+            # Starlette receives the whole upload before the endpoint runs, so its size is known.
+            # Size checks see it as an empty chunk at the end of the file, and once they pass the
+            # document is read in one call, the same single copy as the buffered path
+            content = header
+            if file.size > len(header):
+                is_valid, error_message = await self.validator_chain.validate_chunk(file, b"", file.size)
+                if not is_valid:
+                    self._reject(error_message)
+                if file.size > MultiPartParser.max_file_size:
+                    # Spooled to disk, where every UploadFile call is a trip to the thread pool
+                    return await run_in_threadpool(self._read_from_start, file.file)
+                await file.seek(0)
+                content = await file.read()
+            await file.seek(0)
+            return content
+        
+        chunks = [header]
+        offset = len(header)
+        
+        while chunk := await file.read(self.chunk_size):
+            is_valid, error_message = await self.validator_chain.validate_chunk(file, chunk, offset)
+            
+            if not is_valid:
+                self._reject(error_message)
+            
+            chunks.append(chunk)
+            offset += len(chunk)
+        
+        await file.seek(0)
+        
+        return b"".join(chunks)
+    
+    async def normalize_document(self, content: bytes, content_type: str, filename: str) -> Tuple[bytes, str, str]:
+        """
+        Downscale, strip metadata and re-encode an image document if normalization is enabled.
+        Runs in the image worker pool.
+        Returns (content, content_type, filename), unchanged if normalization is off,
+        doesn't apply to the document or wouldn't make it smaller
+        """
+        if self.normalize:
+            with document_processing_seconds.time("normalization"):
+                normalized = await run_in_image_worker(
+                    normalize_image, content, content_type, self.max_dimension, self.jpeg_quality
+                )
+        else:
+            normalized = None
+        
+        if normalized is None:
+            document_stored_bytes.observe(len(content))
+            return content, content_type, filename
+        
+        normalized_content, normalized_type = normalized
+        if normalized_type == JPEG_CONTENT_TYPE and not filename.lower().endswith((".jpg", ".jpeg")):
+            filename = f"{os.path.splitext(filename)[0]}.jpg"
+        
+        logger.debug("Normalized %s document from %s to %s bytes", content_type, len(content), len(normalized_content))
+        document_stored_bytes.observe(len(normalized_content))
+        return normalized_content, normalized_type, filename
+    
+    @staticmethod
+    def _read_from_start(fileobj: BinaryIO) -> bytes:
+        """Read a whole file and rewind it, in one trip to the thread pool for spooled uploads"""
+        fileobj.seek(0)
+        content = fileobj.read()
+        fileobj.seek(0)
+        return content
+    
+    @staticmethod
+    def _reject(error_message: str) -> None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=error_message
+        )
+
+
+file_processing_service = FileProcessingService()
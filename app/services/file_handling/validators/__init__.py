@@ -1,3 +1,4 @@
+from app.services.file_handling.validators.base import build_validator_chain
 from app.services.file_handling.validators.content_type import ContentTypeValidator
 from app.services.file_handling.validators.magic_number import MagicNumberValidator
 from app.services.file_handling.validators.file_size import FileSizeValidator
@@ -5,5 +6,6 @@ from app.services.file_handling.validators.file_size import FileSizeValidator
 __all__ = [
     'ContentTypeValidator',
     'MagicNumberValidator',
-    'FileSizeValidator'
+    'FileSizeValidator',
+    'build_validator_chain'
 ]
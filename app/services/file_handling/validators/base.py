@@ -1,11 +1,23 @@
+import time
 from abc import ABC, abstractmethod
-from typing import Optional, Tuple
+from typing import Awaitable, Optional, Tuple
 
 from fastapi import UploadFile
 
+from app.services.file_handling.validators.timings import validation_timings
+
+# Relative validator costs, chains built with build_validator_chain run the cheapest first
+COST_METADATA = 10  # Only looks at the request metadata
+COST_SIZE = 20      # Counts bytes
+COST_CONTENT = 100  # Parses file content, CPU bound
+
 class FileValidator(ABC):
     """Base class for file validators"""
     
+    cost = COST_CONTENT
+    # Validators that only look at the file header see the first chunk, the rest skip them
+    checks_every_chunk = False
+    
     def __init__(self, next_validator: Optional['FileValidator'] = None):
         self.next_validator = next_validator
     
@@ -14,7 +26,7 @@ class FileValidator(ABC):
         Validate the file and pass to next validator if present
         Returns: (is_valid, error_message)
         """
-        is_valid, message = await self._validate(file, file_content)
+        is_valid, message = await self._timed(self._validate(file, file_content))
         
         if not is_valid:
             return False, message
@@ -24,7 +36,66 @@ class FileValidator(ABC):
             
         return True, ""
     
+    async def validate_chunk(self, file: UploadFile, chunk: bytes, offset: int) -> Tuple[bool, str]:
+        """
+        Incrementally validate a chunk of the file as it is read and pass it on
+        to the next validator if present. `offset` is the position of the chunk
+        within the file, so validators can tell the first chunk from the rest.
+        Returns: (is_valid, error_message)
+        """
+        if offset == 0 or self.checks_every_chunk:
+            is_valid, message = await self._timed(self._validate_chunk(file, chunk, offset))
+            
+            if not is_valid:
+                return False, message
+        
+        if self.next_validator:
+            return await self.next_validator.validate_chunk(file, chunk, offset)
+        
+        return True, ""
+    
+    async def warm_up(self) -> None:
+        """Load whatever the validator and the rest of the chain need before the first file arrives"""
+        await self._warm_up()
+        if self.next_validator:
+            await self.next_validator.warm_up()
+    
+    async def _warm_up(self) -> None:
+        pass
+    
+    async def _timed(self, check: Awaitable[Tuple[bool, str]]) -> Tuple[bool, str]:
+        """Await a check, recording its duration under the validator's name"""
+        started = time.perf_counter()
+        try:
+            return await check
+        finally:
+            validation_timings.observe(type(self).__name__, time.perf_counter() - started)
+    
     @abstractmethod
     async def _validate(self, file: UploadFile, file_content: bytes) -> Tuple[bool, str]:
-        """Concrete validation implementation"""
+        """
+        Concrete validation implementation.
+        CPU-bound checks should run in a thread pool, e.g. with run_in_threadpool,
+        so they don't block the event loop.
+        """
         pass
+    
+    async def _validate_chunk(self, file: UploadFile, chunk: bytes, offset: int) -> Tuple[bool, str]:
+        """
+        Concrete incremental validation implementation.
+        Validators with nothing to check incrementally accept every chunk.
+        """
+        return True, ""
+
+
+def build_validator_chain(*validators: FileValidator) -> FileValidator:
+    """
+    Link validators into a chain ordered by cost, so cheap checks reject bad
+    files before expensive ones run. Validators of equal cost keep their order.
+    Returns the head of the chain.
+    """
+    ordered = sorted(validators, key=lambda validator: validator.cost)
+    for current, following in zip(ordered, ordered[1:]):
+        current.next_validator = following
+    ordered[-1].next_validator = None
+    return ordered[0]
@@ -2,11 +2,13 @@ from typing import Optional, Set
 
 from fastapi import UploadFile
 
-from app.services.file_handling.validators.base import FileValidator
+from app.services.file_handling.validators.base import COST_METADATA, FileValidator
 
 class ContentTypeValidator(FileValidator):
     """Validates file's content type against allowed types"""
     
+    cost = COST_METADATA
+    
     def __init__(self, allowed_types: Set[str], next_validator: Optional[FileValidator] = None):
         super().__init__(next_validator)
         self.allowed_types = allowed_types
@@ -15,3 +17,9 @@ class ContentTypeValidator(FileValidator):
         if file.content_type not in self.allowed_types:
             return False, f"Invalid file type: {file.content_type}. Allowed types: {', '.join(self.allowed_types)}"
         return True, ""
+    
+    async def _validate_chunk(self, file: UploadFile, chunk: bytes, offset: int) -> tuple[bool, str]:
+        # The declared type doesn't change, so checking it once is enough
+        if offset == 0:
+            return await self._validate(file, chunk)
+        return True, ""
@@ -1,14 +1,35 @@
 import magic
 
 from fastapi import UploadFile
+from starlette.concurrency import run_in_threadpool
 
-from app.services.file_handling.validators.base import FileValidator
+from app.services.file_handling.validators.base import COST_CONTENT, FileValidator
+
+# Magic numbers of the accepted document types sit in the first bytes of the file,
+# libmagic never needs to see more than this
+MAGIC_HEADER_BYTES = 2048
+
+# Sniffed once at startup, the first call loads the libmagic database
+WARM_UP_HEADER = b"%PDF-1.4\n"
 
 class MagicNumberValidator(FileValidator):
     """Validates file's actual content using magic numbers"""
     
+    cost = COST_CONTENT
+    
     async def _validate(self, file: UploadFile, file_content: bytes) -> tuple[bool, str]:
-        detected_type = magic.from_buffer(file_content, mime=True)
+        header = file_content[:MAGIC_HEADER_BYTES]
+        # ctypes releases the GIL around libmagic, so sniffing in a worker thread keeps the event loop free
+        detected_type = await run_in_threadpool(magic.from_buffer, header, mime=True)
         if detected_type != file.content_type:
             return False, f"File content ({detected_type}) doesn't match declared type ({file.content_type})"
         return True, ""
+    
+    async def _warm_up(self) -> None:
+        await run_in_threadpool(magic.from_buffer, WARM_UP_HEADER, mime=True)
+    
+    async def _validate_chunk(self, file: UploadFile, chunk: bytes, offset: int) -> tuple[bool, str]:
+        # Magic numbers live in the file header, so only the first chunk is sniffed
+        if offset == 0:
+            return await self._validate(file, chunk)
+        return True, ""
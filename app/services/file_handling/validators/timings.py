@@ -0,0 +1,34 @@
+import threading
+from typing import Any, Dict
+
+from app.utils.stats import Histogram
+
+# Validators run in microseconds to milliseconds, finer than the default latency buckets
+VALIDATION_BUCKETS = (0.00001, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.5)
+
+class ValidationTimings:
+    """Per-validator histograms of the time spent validating, in seconds"""
+    
+    def __init__(self):
+        self._histograms: Dict[str, Histogram] = {}
+        self._lock = threading.Lock()
+    
+    def observe(self, validator: str, seconds: float) -> None:
+        histogram = self._histograms.get(validator)
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.setdefault(validator, Histogram(VALIDATION_BUCKETS))
+        histogram.observe(seconds)
+    
+    def histograms(self) -> Dict[str, Histogram]:
+        return dict(sorted(self._histograms.items()))
+    
+    def snapshot(self) -> Dict[str, Any]:
+        return {name: histogram.snapshot() for name, histogram in sorted(self._histograms.items())}
+    
+    def clear(self) -> None:
+        with self._lock:
+            self._histograms.clear()
+
+
+validation_timings = ValidationTimings()
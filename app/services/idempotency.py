@@ -0,0 +1,243 @@
+import asyncio
+import hashlib
+import logging
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Dict, NamedTuple, Optional, Tuple
+
+from sqlalchemy import delete, update
+from sqlalchemy.exc import IntegrityError
+
+from app.core.config import settings
+from app.db.base import SessionLocal
+from app.errors.idempotency import IdempotencyKeyInProgressError, IdempotencyKeyReusedError
+from app.models.idempotency import IdempotencyKey
+
+logger = logging.getLogger(__name__)
+
+# Expired keys are deleted in bounded batches, at most once per interval
+PURGE_INTERVAL = 60.0
+PURGE_BATCH_SIZE = 1000
+
+class StoredResponse(NamedTuple):
+    status_code: int
+    content_type: str
+    body: bytes
+
+
+def request_fingerprint(method: str, path: str) -> str:
+    """Identify the request a key was first used for"""
+    return hashlib.sha256(f"{method} {path}".encode()).hexdigest()
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+class IdempotencyCache:
+    """
+    Bounded, expiring LRU of completed responses by key, in front of the idempotency_keys table.
+    Completed responses never change, so a hit skips the database entirely.
+    """
+    
+    def __init__(self, max_size: int = 1000):
+        self.max_size = max_size
+        self._entries: "OrderedDict[str, Tuple[str, StoredResponse, float]]" = OrderedDict()
+    
+    def get(self, key: str) -> Optional[Tuple[str, StoredResponse]]:
+        """Get the (fingerprint, response) stored for a key"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        fingerprint, response, expires_at = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return fingerprint, response
+    
+    def put(self, key: str, fingerprint: str, response: StoredResponse, ttl: float) -> None:
+        self._entries[key] = (fingerprint, response, time.monotonic() + ttl)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+    
+    def clear(self) -> None:
+        self._entries.clear()
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class IdempotencyStore:
+    """
+    Stores the first completed response for each Idempotency-Key.
+    A request claims its key by inserting a row, so concurrent duplicates in any
+    process find it and wait for the response instead of running again.
+    Duplicates in the same process wait on a future rather than polling the database.
+    """
+    
+    def __init__(
+        self,
+        session_factory=SessionLocal,
+        ttl: Optional[int] = None,
+        lock_seconds: Optional[int] = None,
+        wait_timeout: Optional[float] = None,
+        poll_interval: float = 0.5,
+        cache: Optional[IdempotencyCache] = None
+    ):
+        self.session_factory = session_factory
+        self.ttl = ttl or settings.IDEMPOTENCY_TTL
+        self.lock_seconds = lock_seconds or settings.IDEMPOTENCY_LOCK_SECONDS
+        self.wait_timeout = wait_timeout or settings.IDEMPOTENCY_WAIT_TIMEOUT
+        self.poll_interval = poll_interval
+        self.cache = cache if cache is not None else IdempotencyCache(settings.IDEMPOTENCY_CACHE_SIZE)
+        self._in_flight: Dict[str, asyncio.Future] = {}
+        self._last_purge = 0.0
+    
+    async def acquire(self, key: str, fingerprint: str) -> Optional[StoredResponse]:
+        """
+        Claim a key, or get the response stored for it.
+        Waits while another request with the same key is in progress.
+        Returns the stored response, or None if the caller now holds the key
+        and must complete or release it.
+        Raises IdempotencyKeyReusedError or IdempotencyKeyInProgressError
+        """
+        deadline = time.monotonic() + self.wait_timeout
+        while True:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return _matching(cached[0], fingerprint, cached[1])
+            
+            in_flight = self._in_flight.get(key)
+            if in_flight is not None:
+                await self._wait(in_flight, deadline)
+                continue
+            
+            # Reserved before touching the database, so duplicates in this process wait on it
+            self._in_flight[key] = asyncio.get_running_loop().create_future()
+            try:
+                claimed, row = await self._claim(key, fingerprint)
+            except BaseException:
+                self._resolve(key)
+                raise
+            if claimed:
+                return None
+            self._resolve(key)
+            
+            if row is None:
+                # Released or expired while we looked, try to claim it again
+                continue
+            if row.is_completed:
+                response = StoredResponse(row.status_code, row.content_type, row.response_body)
+                expires_in = (row.expires_at - _utcnow()).total_seconds()
+                self.cache.put(key, row.request_fingerprint, response, expires_in)
+                return _matching(row.request_fingerprint, fingerprint, response)
+            
+            # Held by a request in another process, poll until it completes
+            if row.request_fingerprint != fingerprint:
+                raise IdempotencyKeyReusedError()
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise IdempotencyKeyInProgressError()
+            await asyncio.sleep(min(self.poll_interval, remaining))
+    
+    async def complete(self, key: str, fingerprint: str, response: StoredResponse) -> None:
+        """Store the response of a claimed key and wake the requests waiting for it"""
+        self.cache.put(key, fingerprint, response, self.ttl)
+        try:
+            await self._save(key, response)
+        except Exception as e:
+            # The response was already sent, other processes retry once the lock expires
+            logger.error("Failed to store response for idempotency key: %s", e)
+        finally:
+            self._resolve(key)
+    
+    async def release(self, key: str) -> None:
+        """Give up a claimed key without a response, e.g. after an error, so it can be retried"""
+        try:
+            await self._delete(key)
+        except Exception as e:
+            logger.error("Failed to release idempotency key: %s", e)
+        finally:
+            self._resolve(key)
+    
+    async def _claim(self, key: str, fingerprint: str) -> Tuple[bool, Optional[IdempotencyKey]]:
+        """
+        Insert the row for a key.
+        Returns (True, None) if it was claimed, otherwise (False, existing row or None)
+        """
+        now = _utcnow()
+        async with self.session_factory() as session:
+            # Expired responses and abandoned locks (e.g. a crashed worker) can be claimed again
+            await session.execute(
+                delete(IdempotencyKey)
+                .where(IdempotencyKey.key == key, IdempotencyKey.expires_at < now)
+            )
+            if time.monotonic() - self._last_purge > PURGE_INTERVAL:
+                self._last_purge = time.monotonic()
+                await session.execute(
+                    delete(IdempotencyKey)
+                    .where(IdempotencyKey.expires_at < now)
+                    .with_dialect_options(mysql_limit=PURGE_BATCH_SIZE)
+                )
+            
+            session.add(IdempotencyKey(
+                key=key,
+                request_fingerprint=fingerprint,
+                expires_at=now + timedelta(seconds=self.lock_seconds)
+            ))
+            try:
+                await session.commit()
+                return True, None
+            except IntegrityError:
+                await session.rollback()
+            
+            return False, await session.get(IdempotencyKey, key)
+    
+    async def _save(self, key: str, response: StoredResponse) -> None:
+        async with self.session_factory() as session:
+            await session.execute(
+                update(IdempotencyKey)
+                .where(IdempotencyKey.key == key)
+                .values(
+                    status_code=response.status_code,
+                    content_type=response.content_type,
+                    response_body=response.body,
+                    expires_at=_utcnow() + timedelta(seconds=self.ttl)
+                )
+            )
+            await session.commit()
+    
+    async def _delete(self, key: str) -> None:
+        async with self.session_factory() as session:
+            await session.execute(
+                delete(IdempotencyKey)
+                .where(IdempotencyKey.key == key, IdempotencyKey.status_code.is_(None))
+            )
+            await session.commit()
+    
+    async def _wait(self, in_flight: asyncio.Future, deadline: float) -> None:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise IdempotencyKeyInProgressError()
+        try:
+            # Shielded, so a waiter timing out doesn't cancel the future for everyone else
+            await asyncio.wait_for(asyncio.shield(in_flight), remaining)
+        except asyncio.TimeoutError:
+            raise IdempotencyKeyInProgressError()
+    
+    def _resolve(self, key: str) -> None:
+        in_flight = self._in_flight.pop(key, None)
+        if in_flight is not None and not in_flight.done():
+            in_flight.set_result(None)
+
+
+def _matching(stored_fingerprint: str, fingerprint: str, response: StoredResponse) -> StoredResponse:
+    if stored_fingerprint != fingerprint:
+        raise IdempotencyKeyReusedError()
+    return response
+
+
+idempotency_store = IdempotencyStore()
@@ -0,0 +1,38 @@
+import asyncio
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_executor: Optional[ProcessPoolExecutor] = None
+
+def get_image_executor() -> ProcessPoolExecutor:
+    """Get the process pool CPU-bound image work runs in, creating it on first use"""
+    global _executor
+    if _executor is None:
+        # Spawned rather than forked, forking a process that runs an event loop and threads isn't safe
+        _executor = ProcessPoolExecutor(
+            max_workers=settings.IMAGE_WORKERS,
+            mp_context=multiprocessing.get_context("spawn")
+        )
+        logger.info("Started image worker pool with %s processes", settings.IMAGE_WORKERS)
+    return _executor
+
+async def run_in_image_worker(func: Callable[..., Any], *args: Any) -> Any:
+    """
+    Run func(*args) in the image worker pool without blocking the event loop.
+    func and its arguments must be picklable, i.e. module-level functions and plain data.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_image_executor(), func, *args)
+
+def shutdown_image_executor() -> None:
+    """Stop the image worker processes"""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
@@ -0,0 +1,99 @@
+import asyncio
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Tuple
+
+from app.core.config import settings
+from app.utils.stats import Histogram, LATENCY_BUCKETS
+
+class MemoryBudget:
+    """
+    Per-process budget of bytes held by in-flight requests.
+    Reservations that don't fit wait in FIFO order, so a large upload isn't
+    starved by a stream of small ones. A single reservation never exceeds the
+    budget, so any request can run once the process is otherwise idle.
+    """
+    
+    def __init__(self, capacity_bytes: int):
+        self.capacity_bytes = capacity_bytes
+        self.in_use_bytes = 0
+        self.admitted = 0
+        self.rejected = 0
+        self.queue_wait = Histogram(LATENCY_BUCKETS)
+        self._waiters: Deque[Tuple[int, asyncio.Future]] = deque()
+    
+    @property
+    def waiting(self) -> int:
+        return len(self._waiters)
+    
+    def cap(self, nbytes: int) -> int:
+        """Clamp a reservation to the budget"""
+        return min(nbytes, self.capacity_bytes)
+    
+    async def acquire(self, nbytes: int, timeout: float) -> bool:
+        """
+        Reserve bytes, waiting up to `timeout` seconds for others to release theirs.
+        Returns False if the reservation wasn't granted in time.
+        """
+        nbytes = self.cap(nbytes)
+        if not self._waiters and self.in_use_bytes + nbytes <= self.capacity_bytes:
+            self.in_use_bytes += nbytes
+            self.admitted += 1
+            return True
+        
+        if timeout <= 0:
+            self.rejected += 1
+            return False
+        
+        started = time.perf_counter()
+        waiter = (nbytes, asyncio.get_running_loop().create_future())
+        self._waiters.append(waiter)
+        try:
+            # Shielded, so a timeout can't cancel a future that was granted at the same moment
+            await asyncio.wait_for(asyncio.shield(waiter[1]), timeout)
+            return True
+        except asyncio.TimeoutError:
+            if waiter[1].done():
+                return True
+            self._abandon(waiter)
+            self.rejected += 1
+            return False
+        except BaseException:
+            # Client went away while queued, give back anything granted meanwhile
+            if waiter[1].done():
+                self.release(nbytes)
+            else:
+                self._abandon(waiter)
+            raise
+        finally:
+            self.queue_wait.observe(time.perf_counter() - started)
+    
+    def release(self, nbytes: int) -> None:
+        self.in_use_bytes -= self.cap(nbytes)
+        self._grant_waiters()
+    
+    def _abandon(self, waiter: Tuple[int, asyncio.Future]) -> None:
+        self._waiters.remove(waiter)
+        # The head of the queue may have been blocking smaller reservations behind it
+        self._grant_waiters()
+    
+    def _grant_waiters(self) -> None:
+        while self._waiters and self.in_use_bytes + self._waiters[0][0] <= self.capacity_bytes:
+            nbytes, future = self._waiters.popleft()
+            self.in_use_bytes += nbytes
+            self.admitted += 1
+            future.set_result(None)
+    
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "capacity_bytes": self.capacity_bytes,
+            "in_use_bytes": self.in_use_bytes,
+            "utilization": self.in_use_bytes / self.capacity_bytes if self.capacity_bytes else 0.0,
+            "waiting": self.waiting,
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            "queue_wait": self.queue_wait.snapshot()
+        }
+
+
+memory_budget = MemoryBudget(settings.MEMORY_BUDGET_BYTES)
@@ -1,40 +1,144 @@
+import asyncio
 import logging
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Type
+from typing import Dict, Any, Optional, Type
 
 from fastapi import BackgroundTasks
 
-from app.errors.notifier import NoNotifierError
+from app.core.config import settings
+from app.errors.notifier import NoNotifierError, NotificationTimeoutError
+from app.utils.metrics import notification_send_seconds, notifications_total
 
 logger = logging.getLogger(__name__)
 
 class Notifier(ABC):
-    """Abstract base class for all notification services"""
+    """
+    Abstract base class for all notification services
+    Notifiers are long-lived, one per channel, see NotificationFactory.get_notifier.
+    Each limits its own concurrent sends and how long a send may take, including
+    the wait for a free slot, so a slow channel can't hold up the others.
+    """
+    
+    # Channel name used to label metrics and look up per-channel limits
+    channel = "unknown"
+    
+    def __init__(self, concurrency: Optional[int] = None, timeout: Optional[float] = None):
+        self.concurrency = concurrency or settings.NOTIFICATION_CONCURRENCY.get(
+            self.channel, settings.NOTIFICATION_DEFAULT_CONCURRENCY
+        )
+        self.timeout = timeout or settings.NOTIFICATION_TIMEOUTS.get(
+            self.channel, settings.NOTIFICATION_DEFAULT_TIMEOUT
+        )
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._semaphore_loop: Optional[asyncio.AbstractEventLoop] = None
     
     @abstractmethod
     async def send_notification(self, recipient: str, subject: str, content: Dict[str, Any]) -> bool:
         """Send notification to recipient with given content"""
         pass
     
-    def schedule_notification(self, background_tasks: BackgroundTasks, recipient: str, 
+    async def notify(self, recipient: str, subject: str, content: Dict[str, Any]) -> bool:
+        """
+        Send notification within the channel's concurrency limit and timeout,
+        recording its latency and result.
+        Raises NotificationTimeoutError if it took longer than the timeout
+        """
+        result = "failed"
+        try:
+            with notification_send_seconds.time(self.channel):
+                sent = await asyncio.wait_for(self._limited_send(recipient, subject, content), self.timeout)
+            result = "sent" if sent else "failed"
+            return sent
+        except asyncio.TimeoutError:
+            result = "timeout"
+            raise NotificationTimeoutError(self.channel, self.timeout)
+        finally:
+            notifications_total.labels(self.channel, result).inc()
+    
+    async def _limited_send(self, recipient: str, subject: str, content: Dict[str, Any]) -> bool:
+        async with self._limiter():
+            return await self.send_notification(recipient, subject, content)
+    
+    def _limiter(self) -> asyncio.Semaphore:
+        # Semaphores belong to the loop they're first used on, notifiers outlive loops in tests and workers
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._semaphore_loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+            self._semaphore_loop = loop
+        return self._semaphore
+    
+    async def close(self) -> None:
+        """Release resources held by the notifier"""
+        pass
+    
+    def schedule_notification(self, background_tasks: BackgroundTasks, recipient: str,
                              subject: str, content: Dict[str, Any]) -> None:
         """Schedule notification to be sent in background"""
-        background_tasks.add_task(self.send_notification, recipient, subject, content)
+        background_tasks.add_task(self.notify, recipient, subject, content)
 
 
 class NotificationFactory:
-    """Factory for creating notifiers"""
+    """Factory for notifiers, each registered channel has a single shared instance"""
     _notifiers = {}
+    _instances: Dict[str, Notifier] = {}
     
     @classmethod
     def register_notifier(cls, name: str, notifier_class: Type[Notifier]):
         """Register a notifier class with the factory"""
         cls._notifiers[name.lower()] = notifier_class
-        
+        # A replaced class must not keep serving through its old instance
+        cls._instances.pop(name.lower(), None)
+    
     @classmethod
     def get_notifier(cls, type: str = "email") -> Notifier:
-        """Get appropriate notifier based on type"""
-        notifier_class = cls._notifiers.get(type.lower())
-        if not notifier_class:
-            raise NoNotifierError()
-        return notifier_class()
+        """Get the notifier for a channel, created on first use"""
+        name = type.lower()
+        notifier = cls._instances.get(name)
+        if notifier is None:
+            notifier_class = cls._notifiers.get(name)
+            if not notifier_class:
+                raise NoNotifierError()
+            notifier = cls._instances.setdefault(name, notifier_class())
+        return notifier
+    
+    @classmethod
+    async def close_all(cls) -> None:
+        """Close every notifier created so far, e.g. on shutdown"""
+        instances = list(cls._instances.values())
+        cls._instances.clear()
+        for notifier in instances:
+            try:
+                await notifier.close()
+            except Exception as e:
+                logger.error("Failed to close %s notifier: %s", notifier.channel, e)
+
+
+async def fan_out(recipients: Dict[str, str], subject: str, content: Dict[str, Any]) -> Dict[str, bool]:
+    """
+    Send one notification on several channels concurrently.
+    `recipients` maps each channel to its recipient, e.g. {"email": address, "sms": phone number}.
+    A failing, timed out or unknown channel doesn't affect the others.
+    Returns whether each channel delivered.
+    """
+    channels = list(recipients)
+    
+    async def send(channel: str) -> bool:
+        notifier = NotificationFactory.get_notifier(channel)
+        return await notifier.notify(recipients[channel], subject, content)
+    
+    results = await asyncio.gather(*(send(channel) for channel in channels), return_exceptions=True)
+    
+    delivered = {}
+    for channel, result in zip(channels, results):
+        if isinstance(result, BaseException):
+            logger.error("Failed to send %s notification: %s", channel, result)
+            delivered[channel] = False
+        else:
+            delivered[channel] = result
+    return delivered
+
+
+def schedule_fan_out(background_tasks: BackgroundTasks, recipients: Dict[str, str],
+                     subject: str, content: Dict[str, Any]) -> None:
+    """Schedule a fan-out to be sent in background"""
+    background_tasks.add_task(fan_out, recipients, subject, content)
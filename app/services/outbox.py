@@ -0,0 +1,181 @@
+import asyncio
+import logging
+import random
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import and_, func, literal_column, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.notification import NotificationOutbox
+from app.services.notifications import NotificationFactory
+
+logger = logging.getLogger(__name__)
+
+def enqueue_notification(db: AsyncSession, channel: str, recipient: str,
+                         subject: str, content: Dict[str, Any]) -> NotificationOutbox:
+    """
+    Queue a notification in the caller's transaction.
+    It's only delivered if that transaction commits.
+    """
+    notification = NotificationOutbox(
+        channel=channel.lower(),
+        recipient=recipient,
+        subject=subject,
+        content=content
+    )
+    db.add(notification)
+    return notification
+
+
+def retry_delay(attempts: int, base: Optional[float] = None, maximum: Optional[float] = None) -> float:
+    """Exponential backoff in seconds after the given number of failed attempts, with jitter"""
+    base = settings.OUTBOX_BACKOFF_BASE if base is None else base
+    maximum = settings.OUTBOX_BACKOFF_MAX if maximum is None else maximum
+    ceiling = min(maximum, base * 2 ** (attempts - 1))
+    # Jitter spreads retries from a failed burst instead of retrying them all at once
+    return random.uniform(ceiling / 2, ceiling)
+
+
+def _seconds_from_now(seconds: float):
+    """Database-side timestamp, so every worker uses the database clock"""
+    return func.timestampadd(literal_column("SECOND"), int(seconds), func.now())
+
+
+class OutboxDispatcher:
+    """
+    Delivers queued notifications through the registered notifiers.
+    Batches are claimed with SELECT ... FOR UPDATE SKIP LOCKED, so several
+    dispatchers can run side by side without sending a notification twice.
+    """
+    
+    def __init__(self, session_factory, batch_size: Optional[int] = None,
+                 poll_interval: Optional[float] = None, lease_seconds: Optional[int] = None,
+                 max_attempts: Optional[int] = None):
+        self.session_factory = session_factory
+        self.batch_size = batch_size or settings.OUTBOX_BATCH_SIZE
+        self.poll_interval = poll_interval or settings.OUTBOX_POLL_INTERVAL
+        self.lease_seconds = lease_seconds or settings.OUTBOX_LEASE_SECONDS
+        self.max_attempts = max_attempts or settings.OUTBOX_MAX_ATTEMPTS
+        self._stopping: Optional[asyncio.Event] = None
+    
+    async def claim_batch(self) -> List[NotificationOutbox]:
+        """Claim due notifications, including ones whose dispatcher lease expired"""
+        async with self.session_factory() as session:
+            async with session.begin():
+                result = await session.execute(
+                    select(NotificationOutbox)
+                    .where(or_(
+                        and_(
+                            NotificationOutbox.status == NotificationOutbox.STATUS_PENDING,
+                            NotificationOutbox.available_at <= func.now()
+                        ),
+                        and_(
+                            NotificationOutbox.status == NotificationOutbox.STATUS_PROCESSING,
+                            NotificationOutbox.locked_until < func.now()
+                        )
+                    ))
+                    .order_by(NotificationOutbox.id)
+                    .limit(self.batch_size)
+                    .with_for_update(skip_locked=True)
+                )
+                rows = list(result.scalars())
+                
+                if rows:
+                    await session.execute(
+                        update(NotificationOutbox)
+                        .where(NotificationOutbox.id.in_([row.id for row in rows]))
+                        .values(
+                            status=NotificationOutbox.STATUS_PROCESSING,
+                            locked_until=_seconds_from_now(self.lease_seconds),
+                            attempts=NotificationOutbox.attempts + 1
+                        )
+                    )
+        return rows
+    
+    async def _deliver(self, notification: NotificationOutbox) -> Optional[str]:
+        """Send one notification, returning an error message if it failed"""
+        try:
+            notifier = NotificationFactory.get_notifier(notification.channel)
+            if await notifier.notify(notification.recipient, notification.subject, notification.content):
+                return None
+            return "Notifier reported a failed delivery"
+        except Exception as e:
+            return str(e) or e.__class__.__name__
+    
+    async def _record_results(self, rows: List[NotificationOutbox], errors: List[Optional[str]]) -> None:
+        async with self.session_factory() as session:
+            async with session.begin():
+                sent_ids = [row.id for row, error in zip(rows, errors) if error is None]
+                if sent_ids:
+                    await session.execute(
+                        update(NotificationOutbox)
+                        .where(NotificationOutbox.id.in_(sent_ids))
+                        .values(
+                            status=NotificationOutbox.STATUS_SENT,
+                            sent_at=func.now(),
+                            locked_until=None,
+                            last_error=None
+                        )
+                    )
+                
+                for row, error in zip(rows, errors):
+                    if error is None:
+                        continue
+                    
+                    # The claim's UPDATE already incremented attempts, and synchronized the loaded row
+                    attempts = row.attempts
+                    if attempts >= self.max_attempts:
+                        logger.error("Notification %s failed permanently after %s attempts: %s", row.id, attempts, error)
+                        values = {"status": NotificationOutbox.STATUS_FAILED}
+                    else:
+                        delay = retry_delay(attempts)
+                        logger.warning("Notification %s failed (attempt %s), retrying in %.0fs: %s", row.id, attempts, delay, error)
+                        values = {
+                            "status": NotificationOutbox.STATUS_PENDING,
+                            "available_at": _seconds_from_now(delay)
+                        }
+                    
+                    await session.execute(
+                        update(NotificationOutbox)
+                        .where(NotificationOutbox.id == row.id)
+                        .values(locked_until=None, last_error=error[:1000], **values)
+                    )
+    
+    async def process_batch(self) -> int:
+        """Claim and deliver one batch, returning the number of notifications processed"""
+        rows = await self.claim_batch()
+        if not rows:
+            return 0
+        
+        errors = await asyncio.gather(*(self._deliver(row) for row in rows))
+        await self._record_results(rows, list(errors))
+        
+        logger.info("Dispatched %s of %s notifications", len(rows) - sum(1 for e in errors if e), len(rows))
+        return len(rows)
+    
+    async def run(self) -> None:
+        """Process batches until stopped, polling while the outbox is empty"""
+        self._stopping = asyncio.Event()
+        logger.info("Outbox dispatcher started")
+        
+        while not self._stopping.is_set():
+            try:
+                processed = await self.process_batch()
+            except Exception as e:
+                logger.error("Outbox dispatcher error: %s", e)
+                processed = 0
+            
+            # A full batch means there's likely more waiting, keep going without sleeping
+            if processed < self.batch_size:
+                try:
+                    await asyncio.wait_for(self._stopping.wait(), timeout=self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+        
+        logger.info("Outbox dispatcher stopped")
+    
+    def stop(self) -> None:
+        """Ask the dispatcher to stop after the batch in progress"""
+        if self._stopping is not None:
+            self._stopping.set()
@@ -0,0 +1,310 @@
+import codecs
+import csv
+import io
+import itertools
+import json
+import logging
+import mimetypes
+import posixpath
+import uuid
+import zipfile
+from contextlib import ExitStack, contextmanager
+from typing import Any, AsyncIterator, Dict, Iterator, List, NamedTuple, Optional, Set, Tuple
+
+from fastapi import HTTPException, UploadFile, status
+from pydantic import ValidationError
+from sqlalchemy import insert, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers
+
+from app.core.config import settings
+from app.db.errors import is_unique_violation
+from app.models.patient import EMAIL_UNIQUE_INDEX, Patient, PatientDocument
+from app.schemas.patient import PatientCreate, PatientImportReport, PatientImportRowResult
+from app.services.file_handling import FileProcessingService
+from app.services.file_handling.validators.file_size import BYTES_PER_MB
+from app.services.patient_lookup import DUPLICATE_EMAIL_ERROR, known_emails
+from app.services.storage import documents_in_database, encode_document, store_document
+from app.utils.uuid7 import uuid7
+
+logger = logging.getLogger(__name__)
+
+CSV_CONTENT_TYPES = {"text/csv", "application/csv"}
+NDJSON_CONTENT_TYPES = {"application/x-ndjson", "application/ndjson", "application/jsonl"}
+# Manifest rows parsed per trip to the thread pool
+MANIFEST_ROWS_PER_READ = 256
+
+class _ImportRow(NamedTuple):
+    """A manifest row that passed validation and is waiting to be inserted"""
+    row: int
+    email: str
+    values: Dict[str, Any]
+    content: bytes
+
+
+def _is_csv_manifest(manifest: UploadFile) -> bool:
+    filename = (manifest.filename or "").lower()
+    if manifest.content_type in CSV_CONTENT_TYPES or filename.endswith(".csv"):
+        return True
+    if manifest.content_type in NDJSON_CONTENT_TYPES or filename.endswith((".ndjson", ".jsonl")):
+        return False
+    raise HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail="Unsupported manifest format. Use NDJSON (.ndjson, .jsonl) or CSV (.csv)"
+    )
+
+
+def iter_manifest_rows(manifest: UploadFile) -> Iterator[Tuple[int, Optional[Dict[str, Any]]]]:
+    """
+    Yield (row_number, row) pairs from an NDJSON or CSV manifest, reading it line by line.
+    Malformed NDJSON lines are yielded as None so they can be reported per row.
+    """
+    is_csv = _is_csv_manifest(manifest)
+    lines = codecs.iterdecode(manifest.file, "utf-8-sig")
+    
+    if is_csv:
+        for row_number, row in enumerate(csv.DictReader(lines), start=1):
+            yield row_number, row
+        return
+    
+    row_number = 0
+    for line in lines:
+        if not line.strip():
+            continue
+        row_number += 1
+        try:
+            row = json.loads(line)
+        except json.JSONDecodeError:
+            row = None
+        yield row_number, row if isinstance(row, dict) else None
+
+
+async def aiter_manifest_rows(manifest: UploadFile,
+                              rows_per_read: int = MANIFEST_ROWS_PER_READ) -> AsyncIterator[Tuple[int, Optional[Dict[str, Any]]]]:
+    """
+    iter_manifest_rows for async callers. Manifests past Starlette's spool size are on disk,
+    so rows are read and parsed in batches in a worker thread instead of on the event loop.
+    """
+    rows = iter_manifest_rows(manifest)
+    while batch := await run_in_threadpool(lambda: list(itertools.islice(rows, rows_per_read))):
+        for row in batch:
+            yield row
+
+
+class PatientImportService:
+    """
+    Imports patients in bulk from a manifest and a zip archive of their documents.
+    Rows go through the same validation as single registrations and are inserted
+    in batches; a bad row is reported and skipped without failing its batch.
+    """
+    
+    def __init__(self, file_service: FileProcessingService,
+                 batch_size: Optional[int] = None, batch_max_bytes: Optional[int] = None):
+        self.file_service = file_service
+        self.batch_size = batch_size or settings.BULK_IMPORT_BATCH_SIZE
+        self.batch_max_bytes = batch_max_bytes or settings.BULK_IMPORT_BATCH_MAX_BYTES
+    
+    async def import_patients(self, db: AsyncSession, manifest: UploadFile,
+                              documents: UploadFile) -> PatientImportReport:
+        """Import every manifest row and return a per-row report"""
+        results: List[PatientImportRowResult] = []
+        seen_emails: Set[str] = set()
+        batch: List[_ImportRow] = []
+        batch_bytes = 0
+        
+        with self._open_archive(documents) as archive:
+            async for row_number, row in aiter_manifest_rows(manifest):
+                prepared = await self._prepare_row(archive, row_number, row, seen_emails)
+                if isinstance(prepared, PatientImportRowResult):
+                    results.append(prepared)
+                    continue
+                
+                batch.append(prepared)
+                batch_bytes += len(prepared.content)
+                if len(batch) >= self.batch_size or batch_bytes >= self.batch_max_bytes:
+                    results.extend(await self._insert_batch(db, batch))
+                    batch, batch_bytes = [], 0
+            
+            if batch:
+                results.extend(await self._insert_batch(db, batch))
+        
+        results.sort(key=lambda result: result.row)
+        created = sum(1 for result in results if result.status == "created")
+        logger.info("Bulk import finished: %s created, %s rejected", created, len(results) - created)
+        
+        return PatientImportReport(
+            total=len(results),
+            created=created,
+            rejected=len(results) - created,
+            results=results
+        )
+    
+    @staticmethod
+    @contextmanager
+    def _open_archive(documents: UploadFile) -> Iterator[zipfile.ZipFile]:
+        with ExitStack() as stack:
+            fileobj = documents.file
+            if not hasattr(fileobj, "seekable"):
+                # SpooledTemporaryFile only gained the full IO interface in Python 3.11, before that
+                # zipfile needs a real file: move the upload to disk and open its descriptor
+                fileobj.rollover()
+                fileobj = stack.enter_context(open(fileobj.fileno(), "rb", closefd=False))
+            try:
+                archive = stack.enter_context(zipfile.ZipFile(fileobj))
+            except zipfile.BadZipFile:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Documents must be uploaded as a zip archive"
+                )
+            yield archive
+    
+    @staticmethod
+    def _rejected(row: int, email: Optional[str], error: str) -> PatientImportRowResult:
+        return PatientImportRowResult(row=row, email=email, status="rejected", error=error)
+    
+    async def _prepare_row(self, archive: zipfile.ZipFile, row_number: int,
+                           row: Optional[Dict[str, Any]], seen_emails: Set[str]):
+        """Validate a manifest row and its document, returning an _ImportRow or a rejection"""
+        if row is None:
+            return self._rejected(row_number, None, "Malformed manifest row")
+        
+        email = row.get("email")
+        try:
+            patient_data = PatientCreate(
+                name=row.get("name"),
+                email=email,
+                phone_number=row.get("phone_number")
+            )
+        except ValidationError as e:
+            errors = "; ".join(f"{'.'.join(str(loc) for loc in err['loc'])}: {err['msg']}" for err in e.errors())
+            return self._rejected(row_number, email, errors)
+        
+        if patient_data.email.lower() in seen_emails:
+            return self._rejected(row_number, email, "Duplicate email within the manifest")
+        
+        document_name = row.get("document")
+        if not document_name:
+            return self._rejected(row_number, email, "Missing document reference")
+        
+        try:
+            info = archive.getinfo(document_name)
+        except KeyError:
+            return self._rejected(row_number, email, f"Document {document_name} not found in archive")
+        
+        # Check the declared size before decompressing anything
+        if info.file_size > self.file_service.max_file_size:
+            max_mb = self.file_service.max_file_size / BYTES_PER_MB
+            return self._rejected(row_number, email, f"File exceeds maximum size of {max_mb:.1f}MB")
+        
+        content_type = (
+            row.get("document_content_type")
+            or mimetypes.guess_type(document_name)[0]
+            or "application/octet-stream"
+        )
+        
+        try:
+            content = await run_in_threadpool(archive.read, info)
+            document = UploadFile(
+                file=io.BytesIO(content),
+                filename=posixpath.basename(document_name),
+                headers=Headers({"content-type": content_type})
+            )
+            original = await self.file_service.validate_document(document)
+            content, content_type, filename = await self.file_service.normalize_document(
+                original, content_type, document.filename
+            )
+        except zipfile.BadZipFile:
+            return self._rejected(row_number, email, f"Document {document_name} is corrupted")
+        except HTTPException as e:
+            return self._rejected(row_number, email, str(e.detail))
+        
+        seen_emails.add(patient_data.email.lower())
+        return _ImportRow(
+            row=row_number,
+            email=patient_data.email,
+            values={
+                "name": patient_data.name,
+                "email": patient_data.email,
+                "phone_number": patient_data.phone_number,
+                "document_photo_filename": filename,
+                "document_photo_content_type": content_type,
+                "document_photo_original_size": len(original)
+            },
+            content=content
+        )
+    
+    async def _insert_batch(self, db: AsyncSession, batch: List[_ImportRow]) -> List[PatientImportRowResult]:
+        """Insert a batch with a single multi-row INSERT, falling back to row by row on conflicts"""
+        results = []
+        
+        # Reject already registered emails before storing any documents
+        existing = await db.execute(
+            select(Patient.email).where(Patient.email.in_([item.email for item in batch]))
+        )
+        existing_emails = {email.lower() for email in existing.scalars()}
+        
+        pending = []
+        for item in batch:
+            if item.email.lower() in existing_emails:
+                results.append(self._rejected(item.row, item.email, DUPLICATE_EMAIL_ERROR))
+                continue
+            try:
+                document_columns = await store_document(item.content)
+            except Exception as e:
+                logger.error("Failed to store document for import row %s: %s", item.row, e)
+                results.append(self._rejected(item.row, item.email, "An error occurred while saving the patient document"))
+                continue
+            pending.append((item, {"id": uuid7().bytes, **item.values, **document_columns}))
+        
+        if not pending:
+            return results
+        
+        try:
+            await self._insert(db, pending)
+            await db.commit()
+            results.extend(self._created(item, values) for item, values in pending)
+            logger.debug("Inserted import batch of %s patients", len(pending))
+        except IntegrityError:
+            await db.rollback()
+            # A concurrent registration took one of the emails, find it row by row
+            logger.warning("Import batch hit a constraint violation, retrying row by row")
+            results.extend(await self._insert_rows(db, pending))
+        
+        return results
+    
+    @staticmethod
+    async def _insert(db: AsyncSession, pending) -> None:
+        await db.execute(insert(Patient), [values for _, values in pending])
+        if documents_in_database():
+            await db.execute(
+                insert(PatientDocument),
+                [{"patient_id": values["id"], "content": await encode_document(item.content)} for item, values in pending]
+            )
+    
+    async def _insert_rows(self, db: AsyncSession, pending) -> List[PatientImportRowResult]:
+        results = []
+        for item, values in pending:
+            try:
+                await self._insert(db, [(item, values)])
+                await db.commit()
+                results.append(self._created(item, values))
+            except IntegrityError as e:
+                await db.rollback()
+                if is_unique_violation(e, EMAIL_UNIQUE_INDEX, column="email"):
+                    error = DUPLICATE_EMAIL_ERROR
+                else:
+                    error = "Invalid data provided - database constraint violation"
+                results.append(self._rejected(item.row, item.email, error))
+        return results
+    
+    @staticmethod
+    def _created(item: _ImportRow, values: Dict[str, Any]) -> PatientImportRowResult:
+        known_emails.add(item.email)
+        return PatientImportRowResult(
+            row=item.row,
+            email=item.email,
+            status="created",
+            id=uuid.UUID(bytes=values["id"])
+        )
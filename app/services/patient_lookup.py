@@ -0,0 +1,74 @@
+import logging
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.patient import Patient
+
+logger = logging.getLogger(__name__)
+
+DUPLICATE_EMAIL_ERROR = "A patient with this email address already exists"
+
+class KnownEmailCache:
+    """
+    Bounded, expiring set of emails known to be registered.
+    Only positive lookups are cached: a miss always goes to the database,
+    and the unique index remains the source of truth. Patients are never
+    deleted or renamed, so entries are only dropped when they expire or are evicted.
+    """
+    
+    def __init__(self, max_size: int = 10000, ttl: float = 300.0):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, float]" = OrderedDict()
+    
+    @staticmethod
+    def _key(email: str) -> str:
+        # Emails are compared case-insensitively, like the database collation does
+        return email.strip().lower()
+    
+    def __contains__(self, email: str) -> bool:
+        key = self._key(email)
+        expires_at = self._entries.get(key)
+        if expires_at is None:
+            return False
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return False
+        self._entries.move_to_end(key)
+        return True
+    
+    def add(self, email: str) -> None:
+        key = self._key(email)
+        self._entries[key] = time.monotonic() + self.ttl
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+    
+    def clear(self) -> None:
+        self._entries.clear()
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+known_emails = KnownEmailCache(settings.KNOWN_EMAIL_CACHE_SIZE, settings.KNOWN_EMAIL_CACHE_TTL)
+
+async def email_exists(db: AsyncSession, email: str, cache: Optional[KnownEmailCache] = None) -> bool:
+    """Check whether a patient with this email exists, using the known-email cache first"""
+    cache = known_emails if cache is None else cache
+    if email in cache:
+        logger.debug("Email found in known-email cache")
+        return True
+    
+    # Served from idx_patients_email_unique without touching the row
+    result = await db.execute(select(Patient.email).where(Patient.email == email).limit(1))
+    exists = result.first() is not None
+    
+    if exists:
+        cache.add(email)
+    return exists
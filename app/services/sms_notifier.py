@@ -8,13 +8,15 @@ logger = logging.getLogger(__name__)
 class SMSNotifier(Notifier):
     """SMS notification implementation (placeholder)"""
     
+    channel = "sms"
+    
     async def send_notification(self, recipient: str, subject: str, content: Dict[str, Any]) -> bool:
         """Send SMS notification"""
         try:
-            logger.info(f"SMS notification would be sent to {recipient}: {subject}")
+            logger.info("SMS notification would be sent to %s: %s", recipient, subject)
             return True
         except Exception as e:
-            logger.error(f"Failed to send SMS notification: {str(e)}")
+            logger.error("Failed to send SMS notification: %s", e)
             return False
 
 NotificationFactory.register_notifier("sms", SMSNotifier)
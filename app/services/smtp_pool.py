@@ -0,0 +1,166 @@
+import asyncio
+import logging
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from email.message import Message
+from typing import AsyncIterator, Awaitable, Callable, Deque, Optional, Sequence, Tuple
+
+from aiosmtplib import SMTP, SMTPResponseException, SMTPServerDisconnected
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Idle connections used more recently than this are handed out without a NOOP round trip
+HEALTH_CHECK_INTERVAL = 5.0
+
+class SMTPConnectionPool:
+    """
+    Pool of connected, authenticated SMTP connections.
+    Connections are reused most-recently-used first, dropped once idle for
+    longer than idle_timeout, checked with NOOP before reuse and replaced
+    when the server has hung up on them.
+    """
+    
+    def __init__(self, hostname: str, port: int, username: Optional[str] = None,
+                 password: Optional[str] = None, start_tls: bool = True,
+                 size: int = 5, idle_timeout: float = 60.0):
+        self.hostname = hostname
+        self.port = port
+        self.username = username
+        self.password = password
+        self.start_tls = start_tls
+        self.size = size
+        self.idle_timeout = idle_timeout
+        
+        self._idle: Deque[Tuple[SMTP, float]] = deque()
+        self._semaphore = asyncio.Semaphore(size)
+    
+    async def _connect(self) -> SMTP:
+        smtp = SMTP(
+            hostname=self.hostname,
+            port=self.port,
+            username=self.username,
+            password=self.password,
+            use_tls=False,  # Start with plain connection
+            start_tls=self.start_tls,  # Auto-upgrade to TLS
+        )
+        await smtp.connect()
+        logger.debug("Opened SMTP connection to %s:%s", self.hostname, self.port)
+        return smtp
+    
+    @staticmethod
+    async def _discard(smtp: SMTP) -> None:
+        try:
+            if smtp.is_connected:
+                await smtp.quit()
+        except Exception:
+            pass
+        finally:
+            smtp.close()
+    
+    async def _is_healthy(self, smtp: SMTP, idle_for: float) -> bool:
+        if not smtp.is_connected:
+            return False
+        if idle_for < HEALTH_CHECK_INTERVAL:
+            return True
+        try:
+            await smtp.noop()
+            return True
+        except Exception as e:
+            logger.debug("Pooled SMTP connection failed health check: %s", e)
+            return False
+    
+    async def _acquire(self) -> SMTP:
+        now = time.monotonic()
+        
+        # Oldest connections sit on the left, drop the ones idle for too long
+        while self._idle and now - self._idle[0][1] > self.idle_timeout:
+            smtp, _ = self._idle.popleft()
+            await self._discard(smtp)
+        
+        while self._idle:
+            smtp, last_used = self._idle.pop()
+            if await self._is_healthy(smtp, now - last_used):
+                return smtp
+            await self._discard(smtp)
+        
+        return await self._connect()
+    
+    @asynccontextmanager
+    async def connection(self) -> AsyncIterator[SMTP]:
+        """Borrow a connection, returning it to the pool afterwards if it's still usable"""
+        async with self._semaphore:
+            smtp = await self._acquire()
+            try:
+                yield smtp
+            except SMTPResponseException:
+                # The server rejected the message, the connection itself is fine
+                self._release(smtp)
+                raise
+            except BaseException:
+                await self._discard(smtp)
+                raise
+            else:
+                self._release(smtp)
+    
+    def _release(self, smtp: SMTP) -> None:
+        if smtp.is_connected:
+            self._idle.append((smtp, time.monotonic()))
+    
+    async def send_message(self, message: Message, retries: int = 1):
+        """Send a message over a pooled connection, reconnecting if the connection was lost"""
+        return await self._send(lambda smtp: smtp.send_message(message), retries)
+    
+    async def sendmail(self, sender: str, recipients: Sequence[str], message: bytes, retries: int = 1):
+        """Send an already serialized message, see send_message"""
+        return await self._send(lambda smtp: smtp.sendmail(sender, recipients, message), retries)
+    
+    async def _send(self, operation: Callable[[SMTP], Awaitable], retries: int):
+        for attempt in range(retries + 1):
+            try:
+                async with self.connection() as smtp:
+                    return await operation(smtp)
+            except (SMTPServerDisconnected, ConnectionError) as e:
+                if attempt == retries:
+                    raise
+                logger.warning("SMTP connection lost (%s), retrying with a new connection", e)
+    
+    async def close(self) -> None:
+        """Close all idle connections"""
+        while self._idle:
+            smtp, _ = self._idle.pop()
+            await self._discard(smtp)
+
+
+_pool: Optional[SMTPConnectionPool] = None
+_pool_loop: Optional[asyncio.AbstractEventLoop] = None
+
+def get_smtp_pool() -> SMTPConnectionPool:
+    """
+    Get the process-wide SMTP connection pool.
+    Connections belong to the event loop that opened them, so a new pool is
+    created if the running loop changed.
+    """
+    global _pool, _pool_loop
+    loop = asyncio.get_running_loop()
+    if _pool is None or _pool_loop is not loop:
+        _pool = SMTPConnectionPool(
+            hostname=settings.EMAIL_HOST,
+            port=settings.EMAIL_PORT,
+            username=settings.EMAIL_USER,
+            password=settings.EMAIL_PASSWORD,
+            size=settings.EMAIL_POOL_SIZE,
+            idle_timeout=settings.EMAIL_POOL_IDLE_TIMEOUT
+        )
+        _pool_loop = loop
+    return _pool
+
+async def close_smtp_pool() -> None:
+    """Close the process-wide SMTP connection pool"""
+    global _pool, _pool_loop
+    if _pool is not None:
+        await _pool.close()
+    _pool = None
+    _pool_loop = None
@@ -0,0 +1,25 @@
+# Import all storage backends to ensure they're registered with the factory
+from app.services.storage.base import (
+    STREAM_CHUNK_SIZE,
+    DocumentStorage,
+    DocumentStorageFactory,
+    content_hash,
+    documents_in_database,
+    get_document_storage,
+    store_document
+)
+from app.services.storage.compression import decode_document, encode_document
+from app.services.storage.local import LocalDocumentStorage
+
+__all__ = [
+    'STREAM_CHUNK_SIZE',
+    'DocumentStorage',
+    'DocumentStorageFactory',
+    'LocalDocumentStorage',
+    'content_hash',
+    'decode_document',
+    'documents_in_database',
+    'encode_document',
+    'get_document_storage',
+    'store_document'
+]
@@ -0,0 +1,106 @@
+import hashlib
+from abc import ABC, abstractmethod
+from typing import Any, AsyncIterator, Dict, Optional, Type
+
+from app.core.config import settings
+from app.errors.storage import NoStorageBackendError
+
+# Backend name meaning "keep the document bytes in the patients table"
+DATABASE_BACKEND = "database"
+
+# Default size of the chunks yielded by DocumentStorage.stream
+STREAM_CHUNK_SIZE = 256 * 1024
+
+def content_hash(content: bytes) -> str:
+    """Return the SHA-256 hex digest used as the document's content address"""
+    return hashlib.sha256(content).hexdigest()
+
+class DocumentStorage(ABC):
+    """
+    Abstract base class for content-addressed document stores.
+    Documents are keyed by the SHA-256 of their content, so saving the same
+    bytes twice stores them only once.
+    """
+    
+    @abstractmethod
+    async def save(self, key: str, content: bytes) -> None:
+        """Store content under its content hash, doing nothing if it's already stored"""
+        pass
+    
+    @abstractmethod
+    async def load(self, key: str) -> bytes:
+        """Return the stored content for key, raising DocumentNotFoundError if missing"""
+        pass
+    
+    @abstractmethod
+    async def exists(self, key: str) -> bool:
+        """Check whether content for key is stored"""
+        pass
+    
+    @abstractmethod
+    async def delete(self, key: str) -> None:
+        """Remove the stored content for key if present"""
+        pass
+    
+    async def stream(self, key: str, start: int = 0, end: Optional[int] = None, chunk_size: int = STREAM_CHUNK_SIZE) -> AsyncIterator[bytes]:
+        """
+        Yield the stored content for key from `start` to the inclusive `end` in chunks.
+        Backends that can read partial content should override this, the default
+        loads the whole document.
+        """
+        content = await self.load(key)
+        stop = len(content) if end is None else end + 1
+        for position in range(start, stop, chunk_size):
+            yield content[position:min(position + chunk_size, stop)]
+
+
+class DocumentStorageFactory:
+    """Factory for creating document storage backends"""
+    _backends = {}
+    
+    @classmethod
+    def register_storage(cls, name: str, storage_class: Type[DocumentStorage]):
+        """Register a storage backend class with the factory"""
+        cls._backends[name.lower()] = storage_class
+    
+    @classmethod
+    def get_storage(cls, type: str) -> DocumentStorage:
+        """Get storage backend based on type"""
+        storage_class = cls._backends.get(type.lower())
+        if not storage_class:
+            raise NoStorageBackendError()
+        return storage_class()
+
+
+def get_document_storage() -> Optional[DocumentStorage]:
+    """
+    Get the configured document storage backend.
+    Returns None when documents are kept in the database row.
+    """
+    if documents_in_database():
+        return None
+    return DocumentStorageFactory.get_storage(settings.DOCUMENT_STORAGE_BACKEND)
+
+
+def documents_in_database() -> bool:
+    """Check whether document bytes are kept in the database rather than a document store"""
+    return settings.DOCUMENT_STORAGE_BACKEND.lower() == DATABASE_BACKEND
+
+
+async def store_document(content: bytes) -> Dict[str, Any]:
+    """
+    Store document content with the configured document store.
+    With the "database" backend nothing is stored here, the caller keeps the
+    bytes in a PatientDocument row instead.
+    Returns the patient column values describing the stored document.
+    """
+    document_hash = content_hash(content)
+    storage = get_document_storage()
+    
+    if storage:
+        await storage.save(document_hash, content)
+    
+    return {
+        "document_photo_sha256": document_hash,
+        "document_photo_size": len(content)
+    }
@@ -0,0 +1,118 @@
+import logging
+import zlib
+from typing import Callable, Dict, NamedTuple, Optional
+
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.errors.storage import DocumentCodecError
+
+try:
+    # zstandard is optional, without it documents are compressed with zlib
+    import zstandard
+except ImportError:
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+# Compressed documents start with MAGIC and a codec id. No accepted document type
+# (JPEG, PNG, PDF) starts with a NUL byte, so rows stored raw before compression
+# existed, or because it didn't pay off, are told apart by the missing header
+MAGIC = b"\x00DZ"
+HEADER_SIZE = len(MAGIC) + 1
+
+# Compressing a slice first tells already compressed formats apart cheaply
+SAMPLE_SIZE = 64 * 1024
+
+NO_COMPRESSION = "none"
+
+_zstd_fallback_logged = False
+
+class Codec(NamedTuple):
+    id: int
+    name: str
+    compress: Callable[[bytes, Optional[int]], bytes]
+    decompress: Callable[[bytes], bytes]
+
+
+def _zlib_compress(data: bytes, level: Optional[int]) -> bytes:
+    return zlib.compress(data, -1 if level is None else level)
+
+def _zstd_compress(data: bytes, level: Optional[int]) -> bytes:
+    return zstandard.ZstdCompressor(level=3 if level is None else level).compress(data)
+
+def _zstd_decompress(data: bytes) -> bytes:
+    if zstandard is None:
+        raise DocumentCodecError("zstd")
+    return zstandard.ZstdDecompressor().decompress(data)
+
+CODECS: Dict[str, Codec] = {
+    "zlib": Codec(1, "zlib", _zlib_compress, zlib.decompress),
+    "zstd": Codec(2, "zstd", _zstd_compress, _zstd_decompress),
+}
+_CODECS_BY_ID = {codec.id: codec for codec in CODECS.values()}
+
+def configured_codec() -> Optional[Codec]:
+    """The codec new documents are compressed with, None if compression is off"""
+    global _zstd_fallback_logged
+    name = settings.DOCUMENT_COMPRESSION.lower()
+    if name == NO_COMPRESSION:
+        return None
+    if name == "zstd" and zstandard is None:
+        if not _zstd_fallback_logged:
+            logger.warning("DOCUMENT_COMPRESSION is zstd but zstandard isn't installed, using zlib")
+            _zstd_fallback_logged = True
+        name = "zlib"
+    codec = CODECS.get(name)
+    if codec is None:
+        raise DocumentCodecError(name)
+    return codec
+
+def is_compressed(data: bytes) -> bool:
+    """Check whether stored bytes (or their first HEADER_SIZE bytes) have a compression header"""
+    return data[:len(MAGIC)] == MAGIC
+
+def compress_document(content: bytes, codec: Optional[Codec] = None, level: Optional[int] = None,
+                      min_savings: Optional[float] = None) -> bytes:
+    """
+    Encode document bytes for storage: the codec header and compressed bytes, or the
+    content unchanged when compression saves less than `min_savings` of its size
+    """
+    codec = codec or configured_codec()
+    if codec is None or not content:
+        return content
+    level = settings.DOCUMENT_COMPRESSION_LEVEL if level is None else level
+    min_savings = settings.DOCUMENT_COMPRESSION_MIN_SAVINGS if min_savings is None else min_savings
+    
+    if len(content) > 2 * SAMPLE_SIZE:
+        # A slice from the middle skips headers, which compress well even in JPEGs
+        middle = len(content) // 2
+        sample = content[middle:middle + SAMPLE_SIZE]
+        if len(codec.compress(sample, level)) > len(sample) * (1 - min_savings):
+            return content
+    
+    compressed = codec.compress(content, level)
+    if HEADER_SIZE + len(compressed) > len(content) * (1 - min_savings):
+        return content
+    return MAGIC + bytes([codec.id]) + compressed
+
+def decompress_document(data: bytes) -> bytes:
+    """Decode stored document bytes, raw bytes without a header are returned as they are"""
+    if not is_compressed(data):
+        return data
+    codec = _CODECS_BY_ID.get(data[len(MAGIC)])
+    if codec is None:
+        raise DocumentCodecError(str(data[len(MAGIC)]))
+    return codec.decompress(data[HEADER_SIZE:])
+
+async def encode_document(content: bytes) -> bytes:
+    """compress_document, in a worker thread for large documents"""
+    if len(content) > settings.DOCUMENT_COMPRESSION_THREADPOOL_BYTES:
+        return await run_in_threadpool(compress_document, content)
+    return compress_document(content)
+
+async def decode_document(data: bytes) -> bytes:
+    """decompress_document, in a worker thread for large documents"""
+    if is_compressed(data) and len(data) > settings.DOCUMENT_COMPRESSION_THREADPOOL_BYTES:
+        return await run_in_threadpool(decompress_document, data)
+    return decompress_document(data)
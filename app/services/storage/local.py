@@ -0,0 +1,87 @@
+import logging
+import os
+import uuid
+from pathlib import Path
+from typing import AsyncIterator, Optional
+
+import aiofiles
+import aiofiles.os
+
+from app.core.config import settings
+from app.errors.storage import DocumentNotFoundError
+from app.services.storage.base import STREAM_CHUNK_SIZE, DocumentStorage, DocumentStorageFactory
+
+logger = logging.getLogger(__name__)
+
+class LocalDocumentStorage(DocumentStorage):
+    """
+    Content-addressed document store on the local filesystem.
+    Files are laid out as <root>/<key[:2]>/<key[2:4]>/<key> to keep directories small.
+    """
+    
+    def __init__(self, root: Optional[str] = None):
+        self.root = Path(root or settings.DOCUMENT_STORAGE_PATH)
+    
+    def path_for(self, key: str) -> Path:
+        """Return the on-disk path for a content hash"""
+        return self.root / key[:2] / key[2:4] / key
+    
+    async def save(self, key: str, content: bytes) -> None:
+        path = self.path_for(key)
+        if await aiofiles.os.path.exists(path):
+            logger.debug("Document %s already stored, skipping write", key)
+            return
+        
+        await aiofiles.os.makedirs(path.parent, exist_ok=True)
+        
+        # Write to a temporary file and rename it so readers never see partial content
+        tmp_path = path.with_name(f".{key}.{uuid.uuid4().hex}.tmp")
+        try:
+            async with aiofiles.open(tmp_path, "wb") as f:
+                await f.write(content)
+                await f.flush()
+                await aiofiles.os.wrap(os.fsync)(f.fileno())
+            await aiofiles.os.replace(tmp_path, path)
+        except Exception:
+            if await aiofiles.os.path.exists(tmp_path):
+                await aiofiles.os.remove(tmp_path)
+            raise
+        
+        logger.debug("Document %s stored at %s", key, path)
+    
+    async def load(self, key: str) -> bytes:
+        try:
+            async with aiofiles.open(self.path_for(key), "rb") as f:
+                return await f.read()
+        except FileNotFoundError:
+            raise DocumentNotFoundError()
+    
+    async def stream(self, key: str, start: int = 0, end: Optional[int] = None, chunk_size: int = STREAM_CHUNK_SIZE) -> AsyncIterator[bytes]:
+        try:
+            f = await aiofiles.open(self.path_for(key), "rb")
+        except FileNotFoundError:
+            raise DocumentNotFoundError()
+        
+        try:
+            await f.seek(start)
+            remaining = None if end is None else end + 1 - start
+            while remaining is None or remaining > 0:
+                chunk = await f.read(chunk_size if remaining is None else min(chunk_size, remaining))
+                if not chunk:
+                    break
+                if remaining is not None:
+                    remaining -= len(chunk)
+                yield chunk
+        finally:
+            await f.close()
+    
+    async def exists(self, key: str) -> bool:
+        return await aiofiles.os.path.exists(self.path_for(key))
+    
+    async def delete(self, key: str) -> None:
+        try:
+            await aiofiles.os.remove(self.path_for(key))
+        except FileNotFoundError:
+            pass
+
+DocumentStorageFactory.register_storage("local", LocalDocumentStorage)
@@ -0,0 +1,170 @@
+import logging
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db.base import SessionLocal
+from app.models.patient import PatientDocument
+from app.models.thumbnail import DocumentThumbnail
+from app.services.image_workers import run_in_image_worker
+from app.services.storage import decode_document, get_document_storage
+from app.utils.thumbnails import THUMBNAIL_CONTENT_TYPE, render_thumbnails
+
+logger = logging.getLogger(__name__)
+
+class ThumbnailCache:
+    """
+    In-memory LRU of recently served thumbnails, bounded by their total size in bytes.
+    Thumbnails never change for a given document hash, so entries never expire.
+    """
+    
+    def __init__(self, max_bytes: int = 32 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.size_bytes = 0
+        self._entries: "OrderedDict[Tuple[str, int], bytes]" = OrderedDict()
+    
+    def get(self, key: Tuple[str, int]) -> Optional[bytes]:
+        content = self._entries.get(key)
+        if content is not None:
+            self._entries.move_to_end(key)
+        return content
+    
+    def put(self, key: Tuple[str, int], content: bytes) -> None:
+        if len(content) > self.max_bytes:
+            return
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self.size_bytes -= len(previous)
+        self._entries[key] = content
+        self.size_bytes += len(content)
+        while self.size_bytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self.size_bytes -= len(evicted)
+    
+    def clear(self) -> None:
+        self._entries.clear()
+        self.size_bytes = 0
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class ThumbnailService:
+    """
+    Renders document thumbnails in the image worker pool and stores them keyed by document hash.
+    Rendering is CPU bound, so it never runs on the event loop.
+    """
+    
+    def __init__(
+        self,
+        session_factory=SessionLocal,
+        sizes: Optional[Iterable[int]] = None,
+        quality: Optional[int] = None,
+        cache: Optional[ThumbnailCache] = None
+    ):
+        self.session_factory = session_factory
+        self.sizes = sorted(set(sizes or settings.THUMBNAIL_SIZES))
+        self.quality = quality or settings.THUMBNAIL_QUALITY
+        self.cache = cache if cache is not None else ThumbnailCache(settings.THUMBNAIL_CACHE_MAX_BYTES)
+    
+    async def render(self, content: bytes, content_type: str, sizes: Iterable[int]) -> Dict[int, bytes]:
+        """Render thumbnails in the image worker pool"""
+        return await run_in_image_worker(render_thumbnails, content, content_type, list(sizes), self.quality)
+    
+    async def generate(self, document_sha256: str, content: bytes, content_type: str) -> Dict[int, bytes]:
+        """
+        Render and store the thumbnails a document doesn't have yet.
+        Returns the newly rendered thumbnails by size.
+        """
+        async with self.session_factory() as session:
+            existing = set(await session.scalars(
+                select(DocumentThumbnail.size).where(DocumentThumbnail.document_sha256 == document_sha256)
+            ))
+        
+        missing = [size for size in self.sizes if size not in existing]
+        if not missing:
+            return {}
+        
+        # Rendered without holding a database connection
+        thumbnails = await self.render(content, content_type, missing)
+        if not thumbnails:
+            logger.debug("No thumbnails available for %s document %s", content_type, document_sha256)
+            return {}
+        
+        try:
+            async with self.session_factory() as session:
+                session.add_all(
+                    DocumentThumbnail(
+                        document_sha256=document_sha256,
+                        size=size,
+                        content_type=THUMBNAIL_CONTENT_TYPE,
+                        content=thumbnail
+                    )
+                    for size, thumbnail in thumbnails.items()
+                )
+                await session.commit()
+        except IntegrityError:
+            # Generated concurrently for another patient with the same document
+            logger.debug("Thumbnails for document %s already stored", document_sha256)
+        
+        for size, thumbnail in thumbnails.items():
+            self.cache.put((document_sha256, size), thumbnail)
+        
+        logger.info("Generated %s thumbnails for document %s", len(thumbnails), document_sha256)
+        return thumbnails
+    
+    async def generate_in_background(self, document_sha256: str, content: bytes, content_type: str) -> None:
+        """Generate thumbnails after a response was sent, logging instead of raising"""
+        try:
+            await self.generate(document_sha256, content, content_type)
+        except Exception as e:
+            logger.error("Failed to generate thumbnails for document %s: %s", document_sha256, e)
+    
+    async def get_thumbnail(
+        self,
+        db: AsyncSession,
+        patient_id: bytes,
+        document_sha256: str,
+        content_type: str,
+        size: int
+    ) -> Optional[bytes]:
+        """
+        Get a thumbnail from the cache or the database, generating it if missing.
+        Returns None if the document can't be previewed.
+        """
+        key = (document_sha256, size)
+        thumbnail = self.cache.get(key)
+        if thumbnail is not None:
+            return thumbnail
+        
+        thumbnail = await db.scalar(
+            select(DocumentThumbnail.content)
+            .where(DocumentThumbnail.document_sha256 == document_sha256, DocumentThumbnail.size == size)
+        )
+        
+        if thumbnail is None:
+            # Not generated yet, e.g. for imported patients or while generation is still running
+            original = await _load_original(db, patient_id, document_sha256)
+            if original is None:
+                return None
+            thumbnail = (await self.generate(document_sha256, original, content_type)).get(size)
+            if thumbnail is None:
+                return None
+        
+        self.cache.put(key, thumbnail)
+        return thumbnail
+
+
+async def _load_original(db: AsyncSession, patient_id: bytes, document_sha256: str) -> Optional[bytes]:
+    storage = get_document_storage()
+    if storage:
+        return await storage.load(document_sha256)
+    content = await db.scalar(select(PatientDocument.content).where(PatientDocument.patient_id == patient_id))
+    return None if content is None else await decode_document(content)
+
+
+thumbnail_service = ThumbnailService()
@@ -0,0 +1,81 @@
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+PENDING = "pending"
+READY = "ready"
+FAILED = "failed"
+
+class WarmUp:
+    """
+    Startup steps that get the process ready to serve, e.g. opening pool connections.
+    Steps run concurrently in the background once the server has started, a failed step
+    is retried with exponential backoff. The process is ready once every step has
+    succeeded, and stops being ready when shutdown begins, so load balancers drain it.
+    """
+    
+    def __init__(self, retry_initial: float, retry_max: float):
+        self.retry_initial = retry_initial
+        self.retry_max = retry_max
+        self.steps: Dict[str, Callable[[], Awaitable[Any]]] = {}
+        self.status: Dict[str, str] = {}
+        self.errors: Dict[str, str] = {}
+        self.stopping = False
+        self._started: Optional[float] = None
+        self._ready_after: Optional[float] = None
+    
+    def add(self, name: str, step: Callable[[], Awaitable[Any]]) -> None:
+        self.steps[name] = step
+        self.status[name] = PENDING
+    
+    @property
+    def ready(self) -> bool:
+        return self._ready_after is not None and not self.stopping
+    
+    async def run(self) -> None:
+        """Run every step until it succeeds"""
+        self.stopping = False
+        self._ready_after = None
+        self.errors.clear()
+        self.status = {name: PENDING for name in self.steps}
+        self._started = time.perf_counter()
+        await asyncio.gather(*(self._run_step(name, step) for name, step in self.steps.items()))
+        self._ready_after = time.perf_counter() - self._started
+        logger.info("Warm-up finished in %.2fs, ready to serve", self._ready_after)
+    
+    async def _run_step(self, name: str, step: Callable[[], Awaitable[Any]]) -> None:
+        delay = self.retry_initial
+        while True:
+            started = time.perf_counter()
+            try:
+                await step()
+            except Exception as e:
+                self.status[name] = FAILED
+                self.errors[name] = str(e)
+                logger.warning("Warm-up step %s failed, retrying in %.1fs: %s", name, delay, e)
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, self.retry_max)
+                continue
+            self.status[name] = READY
+            self.errors.pop(name, None)
+            logger.debug("Warm-up step %s took %.3fs", name, time.perf_counter() - started)
+            return
+    
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "ready": self.ready,
+            "stopping": self.stopping,
+            "ready_after_seconds": self._ready_after,
+            "steps": {
+                name: {"status": status, **({"error": self.errors[name]} if name in self.errors else {})}
+                for name, status in self.status.items()
+            }
+        }
+
+
+warm_up = WarmUp(settings.WARMUP_RETRY_INITIAL, settings.WARMUP_RETRY_MAX)
@@ -0,0 +1,57 @@
+import asyncio
+from typing import Callable, Generic, List, Set, Tuple, TypeVar, Union
+
+from starlette.concurrency import run_in_threadpool
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+class ThreadPoolBatcher(Generic[T, R]):
+    """
+    Coalesces calls made during the same event loop iteration into a single
+    thread pool call, e.g. the messages of one outbox batch sent with gather().
+    `func` takes a list of items and returns one result per item, an exception
+    instance in place of a result fails only that item.
+    """
+    
+    def __init__(self, func: Callable[[List[T]], List[Union[R, BaseException]]], max_batch_size: int = 100):
+        self.func = func
+        self.max_batch_size = max_batch_size
+        self._pending: List[Tuple[T, asyncio.Future]] = []
+        self._flush_scheduled = False
+        self._running: Set[asyncio.Task] = set()
+    
+    async def submit(self, item: T) -> R:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((item, future))
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif not self._flush_scheduled:
+            # Runs after every task that is already ready, so their items join this batch
+            self._flush_scheduled = True
+            loop.call_soon(self._flush)
+        return await future
+    
+    def _flush(self) -> None:
+        self._flush_scheduled = False
+        batch, self._pending = self._pending, []
+        if batch:
+            task = asyncio.get_running_loop().create_task(self._run(batch))
+            # Keep a reference until the task is done, the loop only holds weak ones
+            self._running.add(task)
+            task.add_done_callback(self._running.discard)
+    
+    async def _run(self, batch: List[Tuple[T, asyncio.Future]]) -> None:
+        try:
+            results = await run_in_threadpool(self.func, [item for item, _ in batch])
+        except Exception as e:
+            results = [e] * len(batch)
+        
+        for (_, future), result in zip(batch, results):
+            if future.done():
+                continue
+            if isinstance(result, BaseException):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
@@ -1,38 +1,70 @@
-from fastapi import Form, File, UploadFile, HTTPException, status
+import time
+
+from fastapi import Depends, Form, File, Request, UploadFile, HTTPException, status
 from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.db.base import get_db
 from app.schemas.patient import PatientCreate, PatientFormData
-from app.services.file_handling import FileProcessingService
-
-file_service = FileProcessingService()
+from app.services.file_handling import file_processing_service
+from app.services.patient_lookup import DUPLICATE_EMAIL_ERROR, email_exists
+from app.utils.metrics import registration_stage_seconds
 
 async def get_patient_form(
+    request: Request,
     name: str = Form(...),
     email: str = Form(...),
     phone_number: str = Form(...),
-    document_photo: UploadFile = File(...)
+    document_photo: UploadFile = File(...),
+    db: AsyncSession = Depends(get_db)
 ) -> PatientFormData:
     """
     Process and validate all form data including document.
     Returns a combined object with validated patient data and document content.
     """
+    # Middlewares run before the body is read: idempotency checks and waiting for the memory budget.
+    # From admission until the form is handed to us, the request was receiving and parsing the multipart body
+    request_started = getattr(request.state, "request_started", None)
+    request_admitted = getattr(request.state, "request_admitted", None)
+    if request_started is not None and request_admitted is not None:
+        registration_stage_seconds.labels("admission").observe(request_admitted - request_started)
+    body_started = request_started if request_admitted is None else request_admitted
+    if body_started is not None:
+        registration_stage_seconds.labels("request_body").observe(time.perf_counter() - body_started)
+    
     try:
         # 1. Validate patient data through Pydantic
-        patient_data = PatientCreate(
-            name=name,
-            email=email,
-            phone_number=phone_number
-        )
+        with registration_stage_seconds.time("patient_validation"):
+            patient_data = PatientCreate(
+                name=name,
+                email=email,
+                phone_number=phone_number
+            )
         
-        # 2. Validate document using service
-        document_content = await file_service.validate_document(document_photo)
+        # 2. Reject known emails before reading the document
+        with registration_stage_seconds.time("duplicate_check"):
+            email_taken = await email_exists(db, patient_data.email)
+        if email_taken:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=DUPLICATE_EMAIL_ERROR
+            )
+        
+        # 3. Validate document using service
+        original_content = await file_processing_service.validate_document(document_photo)
+        
+        # 4. Shrink the document for storage, if enabled
+        document_content, document_content_type, document_filename = await file_processing_service.normalize_document(
+            original_content, document_photo.content_type, document_photo.filename
+        )
         
-        # 3. Return combined validated data
+        # 5. Return combined validated data
         return PatientFormData(
             patient_data=patient_data,
             document_content=document_content,
-            document_filename=document_photo.filename,
-            document_content_type=document_photo.content_type
+            document_filename=document_filename,
+            document_content_type=document_content_type,
+            document_original_size=len(original_content)
         )
     except ValidationError as e:
         raise HTTPException(
@@ -0,0 +1,67 @@
+from typing import Optional, Tuple
+
+from fastapi import HTTPException, status
+
+def parse_range_header(range_header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """
+    Parse a single "bytes=" Range header against a resource of `size` bytes
+    Returns the inclusive (start, end) byte positions, or None when the whole
+    resource should be sent (no header, another unit, or several ranges)
+    Raises HTTPException 416 if the range can't be satisfied
+    """
+    if not range_header:
+        return None
+    
+    unit, _, spec = range_header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        # Multipart byteranges aren't worth it for a single document, ignoring
+        # the header is allowed and sends the full representation instead
+        return None
+    
+    first, sep, last = spec.strip().partition("-")
+    if not sep:
+        return None
+    
+    try:
+        if first:
+            start = int(first)
+            end = int(last) if last else size - 1
+        else:
+            # Suffix range, "bytes=-500" is the last 500 bytes
+            suffix = int(last)
+            if suffix == 0:
+                raise _unsatisfiable(size)
+            start = max(size - suffix, 0)
+            end = size - 1
+    except ValueError:
+        return None
+    
+    if start >= size:
+        raise _unsatisfiable(size)
+    if end < start:
+        return None
+    
+    return start, min(end, size - 1)
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Check an If-None-Match header against an entity tag
+    Uses the weak comparison RFC 9110 requires for If-None-Match
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    
+    opaque = _strip_weak(etag)
+    return any(_strip_weak(candidate.strip()) == opaque for candidate in if_none_match.split(","))
+
+def _strip_weak(etag: str) -> str:
+    return etag[2:] if etag.startswith("W/") else etag
+
+def _unsatisfiable(size: int) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+        detail="Requested range not satisfiable",
+        headers={"Content-Range": f"bytes */{size}"}
+    )
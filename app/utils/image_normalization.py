@@ -0,0 +1,61 @@
+import io
+from typing import Optional, Tuple
+
+from PIL import Image, ImageOps
+
+# Kept free of app imports: normalize_image runs in worker processes
+
+JPEG_CONTENT_TYPE = "image/jpeg"
+PNG_CONTENT_TYPE = "image/png"
+NORMALIZABLE_TYPES = {"image/jpeg", "image/jpg", PNG_CONTENT_TYPE}
+
+# PNGs with at most this many colours are graphics or scans rather than photos, JPEG would blur them
+MAX_GRAPHIC_COLORS = 256
+
+def normalize_image(content: bytes, content_type: str, max_dimension: int, quality: int) -> Optional[Tuple[bytes, str]]:
+    """
+    Downscale an image to max_dimension, strip its metadata and re-encode it
+    Photos are encoded as JPEG, PNGs with transparency or few colours stay PNG.
+    Returns (content, content_type), or None if the image should be stored as uploaded
+    """
+    if content_type not in NORMALIZABLE_TYPES:
+        return None
+    
+    try:
+        image = Image.open(io.BytesIO(content))
+        # Let the JPEG decoder scale down while decoding
+        image.draft("RGB", (max_dimension, max_dimension))
+        # Apply the EXIF rotation before the EXIF data is dropped
+        image = ImageOps.exif_transpose(image)
+        image.thumbnail((max_dimension, max_dimension), Image.Resampling.LANCZOS)
+        keep_png = content_type == PNG_CONTENT_TYPE and _is_graphic(image)
+        
+        # Only the colour profile is kept, EXIF (camera, GPS...) and other metadata are dropped
+        icc_profile = image.info.get("icc_profile")
+        image.info = {}
+        
+        buffer = io.BytesIO()
+        if keep_png:
+            image.save(buffer, "PNG", optimize=True, icc_profile=icc_profile)
+            normalized_type = PNG_CONTENT_TYPE
+        else:
+            if image.mode not in ("RGB", "L"):
+                image = image.convert("RGB")
+            image.save(buffer, "JPEG", quality=quality, optimize=True, progressive=True, icc_profile=icc_profile)
+            normalized_type = JPEG_CONTENT_TYPE
+    except (OSError, Image.DecompressionBombError):
+        # Unreadable images are stored as uploaded
+        return None
+    
+    normalized = buffer.getvalue()
+    if len(normalized) >= len(content):
+        return None
+    return normalized, normalized_type
+
+def _is_graphic(image: Image.Image) -> bool:
+    """Check whether a PNG has real transparency or a small palette, i.e. shouldn't become a JPEG"""
+    if image.mode in ("RGBA", "LA", "PA") or "transparency" in image.info:
+        alpha = image.convert("RGBA").getchannel("A")
+        if alpha.getextrema()[0] < 255:
+            return True
+    return image.getcolors(MAX_GRAPHIC_COLORS) is not None
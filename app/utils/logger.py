@@ -1,5 +1,18 @@
+import atexit
+import copy
+import json
 import logging
+import queue
+import random
 import sys
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Optional, Union
+
+from app.core.config import settings
+
+# Attributes every LogRecord has, anything else was passed with `extra=`
+_RECORD_ATTRS = set(vars(logging.makeLogRecord({}))) | {"message", "asctime", "taskName"}
 
 class ColoredFormatter(logging.Formatter):
     """Custom formatter that adds colors to log levels"""
@@ -25,17 +38,134 @@ class ColoredFormatter(logging.Formatter):
         
         return message
 
-def setup_logging(log_level=logging.INFO):
-    """Configure application logging with colored output"""
-    formatter = ColoredFormatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+class JsonFormatter(logging.Formatter):
+    """Formats records as compact single-line JSON objects"""
+    
+    def format(self, record):
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exc"] = record.exc_text
+        if record.stack_info:
+            entry["stack"] = self.formatStack(record.stack_info)
+        
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS and not key.startswith("_"):
+                entry[key] = value
+        
+        return json.dumps(entry, separators=(",", ":"), ensure_ascii=False, default=str)
+
+class SamplingFilter(logging.Filter):
+    """
+    Keeps only a fraction of INFO and lower records of high-volume loggers.
+    Rates are keyed by logger name and apply to its children, the most specific
+    name wins. Warnings and errors are never dropped.
+    """
+    
+    def __init__(self, rates: Dict[str, float]):
+        super().__init__()
+        self.rates = dict(rates)
+        self._resolved: Dict[str, float] = {}
+    
+    def rate_for(self, name: str) -> float:
+        rate = self._resolved.get(name)
+        if rate is None:
+            rate = 1.0
+            prefix = name
+            while prefix:
+                if prefix in self.rates:
+                    rate = self.rates[prefix]
+                    break
+                prefix = prefix.rpartition(".")[0]
+            self._resolved[name] = rate
+        return rate
+    
+    def filter(self, record):
+        if record.levelno > logging.INFO:
+            return True
+        rate = self.rate_for(record.name)
+        return rate >= 1.0 or random.random() < rate
+
+class _DeferredFormattingQueueHandler(QueueHandler):
+    """
+    Queue handler that only resolves the message in the calling thread.
+    Formatting and writing are left to the listener thread.
+    """
+    
+    def prepare(self, record):
+        record = copy.copy(record)
+        # The arguments may change after the call returns, so the message is built now
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+_listener: Optional[QueueListener] = None
+
+def setup_logging(
+    log_level: Union[int, str, None] = None,
+    log_format: Optional[str] = None,
+    use_queue: Optional[bool] = None,
+    sampling: Optional[Dict[str, float]] = None
+):
+    """
+    Configure application logging.
+    "console" format writes coloured lines, "json" compact JSON lines for log shippers.
+    With use_queue, records are handed to a background thread that does the
+    formatting and writing, so logging never blocks the event loop on stdout.
+    Arguments default to the LOG_* settings.
+    """
+    global _listener
+    log_level = settings.LOG_LEVEL if log_level is None else log_level
+    log_format = settings.LOG_FORMAT if log_format is None else log_format
+    use_queue = settings.LOG_QUEUE if use_queue is None else use_queue
+    sampling = settings.LOG_SAMPLING if sampling is None else sampling
+    
+    stop_logging()
+    
+    if log_format.lower() == "json":
+        formatter = JsonFormatter()
+    else:
+        formatter = ColoredFormatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
     handler = logging.StreamHandler(sys.stdout)
     handler.setFormatter(formatter)
-
+    
+    if use_queue:
+        log_queue = queue.SimpleQueue()
+        _listener = QueueListener(log_queue, handler, respect_handler_level=True)
+        _listener.start()
+        handler = _DeferredFormattingQueueHandler(log_queue)
+    
+    # Sampled before the record is queued or formatted
+    if sampling:
+        handler.addFilter(SamplingFilter(sampling))
+    
     root_logger = logging.getLogger()
-    root_logger.setLevel(log_level)
+    root_logger.setLevel(_level(log_level))
     root_logger.handlers = [handler]
-
+    
     app_logger = logging.getLogger("app")
-    app_logger.setLevel(logging.DEBUG)
+    app_logger.setLevel(_level(settings.APP_LOG_LEVEL))
     
     return root_logger
+
+def stop_logging() -> None:
+    """Write out queued records and stop the background writer thread, if any"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+def _level(level: Union[int, str]) -> Union[int, str]:
+    return level.upper() if isinstance(level, str) else level
+
+atexit.register(stop_logging)
@@ -0,0 +1,193 @@
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, Iterator, List, Sequence, Tuple
+
+from app.utils.stats import LATENCY_BUCKETS, Histogram
+
+# Buckets for payload sizes, in bytes (1KB to 16MB)
+SIZE_BUCKETS = tuple(1024 * 4 ** exponent for exponent in range(8))
+
+class _Metric(ABC):
+    """Metric family with optional labels, children are created on first use"""
+    
+    type = ""
+    
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+    
+    def labels(self, *values: str, **labels: str):
+        """Get the child metric for a set of label values"""
+        key = tuple(str(value) for value in values) or tuple(str(labels[name]) for name in self.labelnames)
+        child = self._children.get(key)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(key, self._new_child())
+        return child
+    
+    @abstractmethod
+    def _new_child(self):
+        """Create the value holder for one set of label values"""
+        pass
+    
+    def _label_text(self, key: Tuple[str, ...]) -> str:
+        pairs = [f'{name}="{_escape(value)}"' for name, value in zip(self.labelnames, key)]
+        return "{" + ",".join(pairs) + "}" if pairs else ""
+    
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type}"]
+        for key, child in sorted(self._children.items()):
+            lines.extend(self._render_child(key, child))
+        return lines
+    
+    @abstractmethod
+    def _render_child(self, key, child) -> Iterable[str]:
+        """Exposition lines for one child"""
+        pass
+
+
+class _CounterValue:
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+    
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value += amount
+
+
+class Counter(_Metric):
+    """Monotonically increasing count"""
+    
+    type = "counter"
+    
+    def _new_child(self):
+        return _CounterValue()
+    
+    def inc(self, amount: float = 1.0) -> None:
+        self.labels().inc(amount)
+    
+    def _render_child(self, key, child):
+        yield f"{self.name}{self._label_text(key)} {child.value:g}"
+
+
+class HistogramMetric(_Metric):
+    """Distribution of observed values in fixed buckets"""
+    
+    type = "histogram"
+    
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = buckets
+    
+    def _new_child(self):
+        return Histogram(self.buckets)
+    
+    def observe(self, value: float) -> None:
+        self.labels().observe(value)
+    
+    @contextmanager
+    def time(self, *values: str, **labels: str) -> Iterator[None]:
+        """Observe the duration of the block in seconds"""
+        histogram = self.labels(*values, **labels)
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            histogram.observe(time.perf_counter() - started)
+    
+    def _render_child(self, key, child):
+        return render_histogram(self.name, child, dict(zip(self.labelnames, key)))
+
+
+def render_histogram(name: str, histogram: Histogram, labels: Dict[str, str] = None) -> List[str]:
+    """Render a Histogram as Prometheus bucket, sum and count samples"""
+    pairs = [f'{label}="{_escape(value)}"' for label, value in (labels or {}).items()]
+    snapshot = histogram.snapshot()
+    lines = []
+    for bound, count in snapshot["buckets"].items():
+        bucket_labels = ",".join(pairs + [f'le="{bound}"'])
+        lines.append(f"{name}_bucket{{{bucket_labels}}} {count}")
+    label_text = "{" + ",".join(pairs) + "}" if pairs else ""
+    lines.append(f"{name}_sum{label_text} {snapshot['sum']:g}")
+    lines.append(f"{name}_count{label_text} {snapshot['count']}")
+    return lines
+
+
+class MetricsRegistry:
+    """
+    Process-wide metrics rendered in the Prometheus text exposition format.
+    Collectors add samples computed at scrape time, e.g. from existing statistics.
+    """
+    
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._collectors: List[Callable[[], Iterable[str]]] = []
+    
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+    
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = LATENCY_BUCKETS) -> HistogramMetric:
+        return self._register(HistogramMetric(name, documentation, labelnames, buckets))
+    
+    def register_collector(self, collector: Callable[[], Iterable[str]]) -> None:
+        """Register a callable returning exposition lines on every scrape"""
+        self._collectors.append(collector)
+    
+    def _register(self, metric):
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} is already registered")
+        self._metrics[metric.name] = metric
+        return metric
+    
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        for collector in self._collectors:
+            lines.extend(collector())
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+metrics = MetricsRegistry()
+
+# HTTP
+http_requests_total = metrics.counter(
+    "http_requests_total", "HTTP requests by route and status", ["method", "route", "status"]
+)
+http_request_duration_seconds = metrics.histogram(
+    "http_request_duration_seconds", "HTTP request latency by route", ["method", "route"]
+)
+
+# Patient registration
+registration_stage_seconds = metrics.histogram(
+    "patient_registration_stage_seconds", "Time spent in each stage of POST /api/patients/", ["stage"]
+)
+document_processing_seconds = metrics.histogram(
+    "document_processing_seconds", "Time spent validating and normalizing uploaded documents", ["stage"]
+)
+document_upload_bytes = metrics.histogram(
+    "document_upload_bytes", "Size of uploaded documents", buckets=SIZE_BUCKETS
+)
+document_stored_bytes = metrics.histogram(
+    "document_stored_bytes", "Size of documents as stored, after normalization", buckets=SIZE_BUCKETS
+)
+
+# Notifications
+notification_send_seconds = metrics.histogram(
+    "notification_send_seconds", "Notification delivery latency by channel", ["channel"]
+)
+notifications_total = metrics.counter(
+    "notifications_total", "Notification deliveries by channel and result", ["channel", "result"]
+)
@@ -0,0 +1,49 @@
+import bisect
+import threading
+from typing import Any, Dict, Sequence
+
+# Default buckets for latencies, in seconds
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+class Histogram:
+    """Fixed-bucket histogram of observed values with count and sum"""
+    
+    def __init__(self, buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self._counts = [0] * (len(self.buckets) + 1)  # Last slot is +Inf
+        self._sum = 0.0
+        self._lock = threading.Lock()
+    
+    def observe(self, value: float) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += value
+    
+    @property
+    def count(self) -> int:
+        return sum(self._counts)
+    
+    @property
+    def sum(self) -> float:
+        return self._sum
+    
+    def cumulative_counts(self) -> Dict[str, int]:
+        """Counts of observations less than or equal to each bucket bound"""
+        with self._lock:
+            counts = list(self._counts)
+        cumulative = {}
+        total = 0
+        for bound, count in zip(self.buckets, counts):
+            total += count
+            cumulative[f"{bound:.15g}"] = total
+        cumulative["+Inf"] = total + counts[-1]
+        return cumulative
+    
+    def snapshot(self) -> Dict[str, Any]:
+        buckets = self.cumulative_counts()
+        return {
+            "count": buckets["+Inf"],
+            "sum": self._sum,
+            "buckets": buckets
+        }
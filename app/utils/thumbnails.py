@@ -0,0 +1,79 @@
+import io
+from typing import Dict, Iterable, Optional
+
+from PIL import Image, ImageOps
+
+try:
+    # PyMuPDF is optional, without it PDFs simply get no preview
+    import fitz
+except ImportError:
+    fitz = None
+
+# Kept free of app imports: these functions run in worker processes
+
+THUMBNAIL_CONTENT_TYPE = "image/jpeg"
+PDF_CONTENT_TYPE = "application/pdf"
+
+def render_thumbnails(content: bytes, content_type: str, sizes: Iterable[int], quality: int = 80) -> Dict[int, bytes]:
+    """
+    Render a JPEG thumbnail of the document for each size (longest edge in pixels)
+    PDFs are previewed from their first page.
+    Returns an empty dict if the document can't be previewed
+    """
+    sizes = sorted(set(sizes), reverse=True)
+    if not sizes:
+        return {}
+    
+    try:
+        image = _open_first_page(content, content_type, sizes[0])
+        if image is None:
+            return {}
+        image = _to_rgb(ImageOps.exif_transpose(image))
+        image.load()
+    except (OSError, Image.DecompressionBombError):
+        # Unreadable, truncated or suspiciously large images get no thumbnail
+        return {}
+    
+    thumbnails = {}
+    # Largest first, each size is downscaled from the previous one
+    for size in sizes:
+        image.thumbnail((size, size), Image.Resampling.LANCZOS)
+        buffer = io.BytesIO()
+        image.save(buffer, "JPEG", quality=quality, optimize=True)
+        thumbnails[size] = buffer.getvalue()
+    return thumbnails
+
+def _open_first_page(content: bytes, content_type: str, size: int) -> Optional[Image.Image]:
+    if content_type == PDF_CONTENT_TYPE:
+        return _render_pdf_page(content, size)
+    
+    image = Image.open(io.BytesIO(content))
+    # Let the JPEG decoder scale down by up to 8x while decoding, much cheaper than a full decode
+    image.draft("RGB", (size, size))
+    return image
+
+def _render_pdf_page(content: bytes, size: int) -> Optional[Image.Image]:
+    if fitz is None:
+        return None
+    
+    try:
+        with fitz.open(stream=content, filetype="pdf") as document:
+            if document.page_count == 0:
+                return None
+            page = document[0]
+            zoom = size / max(page.rect.width, page.rect.height, 1)
+            pixmap = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom), alpha=False)
+            return Image.frombytes("RGB", (pixmap.width, pixmap.height), pixmap.samples)
+    except RuntimeError:
+        # Malformed PDFs that still start with %PDF, fitz.FileDataError derives from RuntimeError
+        return None
+
+def _to_rgb(image: Image.Image) -> Image.Image:
+    """Flatten transparency onto white, JPEG has no alpha channel"""
+    if image.mode in ("RGB", "L"):
+        return image
+    
+    image = image.convert("RGBA")
+    background = Image.new("RGB", image.size, (255, 255, 255))
+    background.paste(image, mask=image.getchannel("A"))
+    return background
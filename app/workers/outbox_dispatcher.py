@@ -0,0 +1,34 @@
+"""
+Notification outbox dispatcher worker.
+
+Run with: python -m app.workers.outbox_dispatcher
+"""
+import asyncio
+import logging
+import signal
+
+from app.db.base import SessionLocal, dispose_engines
+from app.services import NotificationFactory
+from app.services.email_templates import email_templates
+from app.services.outbox import OutboxDispatcher
+from app.utils.logger import setup_logging
+
+logger = logging.getLogger(__name__)
+
+async def main() -> None:
+    email_templates.load()
+    dispatcher = OutboxDispatcher(SessionLocal)
+    
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, dispatcher.stop)
+    
+    try:
+        await dispatcher.run()
+    finally:
+        await NotificationFactory.close_all()
+        await dispose_engines()
+
+if __name__ == "__main__":
+    setup_logging()
+    asyncio.run(main())
@@ -0,0 +1,19 @@
+"""
+Notification hot paths: building the registration email.
+"""
+from benchmarks import _env  # noqa: F401
+from benchmarks.harness import benchmark
+
+from app.services.email_notifier import EmailNotifier
+
+notifier = EmailNotifier()
+CONTENT = {"name": "Jane Doe", "message": "Thank you for registering with our service."}
+
+@benchmark("email.build_message", group="notifications")
+def email_build_message():
+    notifier.build_message("jane.doe@example.com", "Registration Successful", CONTENT)
+
+@benchmark("email.build_message_as_bytes", group="notifications")
+def email_build_message_as_bytes():
+    # Serialization is what aiosmtplib does with the message before sending it
+    notifier.build_message("jane.doe@example.com", "Registration Successful", CONTENT).as_bytes()
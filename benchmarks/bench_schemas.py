@@ -0,0 +1,62 @@
+"""
+Patient schema hot paths: request validation and response serialization.
+"""
+import uuid
+from datetime import datetime
+
+from benchmarks import _env  # noqa: F401
+from benchmarks.harness import benchmark
+
+from app.models.patient import Patient
+from app.schemas.patient import PatientCreate, PatientListResponse, PatientResponse
+
+PATIENT_INPUT = {
+    "name": "Jane Doe",
+    "email": "jane.doe@example.com",
+    "phone_number": "+1 (555) 123-4567",
+}
+
+def _patient() -> Patient:
+    now = datetime(2024, 1, 1, 12, 0, 0)
+    return Patient(
+        id=uuid.uuid4().bytes,
+        name="Jane Doe",
+        email="jane.doe@example.com",
+        phone_number="+1 (555) 123-4567",
+        document_photo_filename="document.jpg",
+        document_photo_content_type="image/jpeg",
+        document_photo_sha256="0" * 64,
+        document_photo_size=1024,
+        created_at=now,
+        updated_at=now,
+    )
+
+PATIENT = _patient()
+PATIENT_PAGE = [_patient() for _ in range(50)]
+PATIENT_RESPONSE = PatientResponse.model_validate(PATIENT)
+
+@benchmark("patient_create.validate", group="schemas")
+def patient_create_validate():
+    PatientCreate(**PATIENT_INPUT)
+
+@benchmark("patient_create.validate_invalid_phone", group="schemas")
+def patient_create_validate_invalid_phone():
+    try:
+        PatientCreate(**{**PATIENT_INPUT, "phone_number": "not a phone"})
+    except ValueError:
+        pass
+
+@benchmark("patient_response.from_orm", group="schemas")
+def patient_response_from_orm():
+    PatientResponse.model_validate(PATIENT)
+
+@benchmark("patient_response.dump_json", group="schemas")
+def patient_response_dump_json():
+    PATIENT_RESPONSE.model_dump_json()
+
+@benchmark("patient_list_response.from_orm_page_50", group="schemas")
+def patient_list_response_from_orm_page():
+    PatientListResponse(
+        items=[PatientResponse.model_validate(patient) for patient in PATIENT_PAGE],
+        next_cursor=None
+    ).model_dump_json()
@@ -0,0 +1,117 @@
+"""
+Document validation: each FileValidator on its own and the full chain across upload sizes,
+and the intake of an accepted upload into PatientFormData, streamed or buffered.
+"""
+import io
+import os
+from tempfile import SpooledTemporaryFile
+
+from fastapi import UploadFile
+from PIL import Image
+from starlette.datastructures import Headers
+
+from benchmarks import _env  # noqa: F401
+from benchmarks.harness import benchmark
+
+from app.schemas.patient import PatientCreate, PatientFormData
+from app.services.file_handling import (
+    ContentTypeValidator,
+    FileProcessingService,
+    FileSizeValidator,
+    MagicNumberValidator,
+)
+
+# Typical phone photo and scan sizes, up to the 5MB limit
+DOCUMENT_SIZES = {
+    "64kb": 64 * 1024,
+    "512kb": 512 * 1024,
+    "2mb": 2 * 1024 * 1024,
+    "5mb": 5 * 1024 * 1024,
+}
+
+def _jpeg(size: int) -> bytes:
+    """A real JPEG header padded to `size` bytes, validators only sniff the header"""
+    buffer = io.BytesIO()
+    Image.new("RGB", (64, 64), (200, 120, 40)).save(buffer, "JPEG")
+    header = buffer.getvalue()
+    return header + os.urandom(max(size - len(header), 0))
+
+# Starlette spools multipart uploads to disk past 1MB, see MultiPartParser.max_file_size
+SPOOL_MAX_SIZE = 1024 * 1024
+
+def _upload(content: bytes) -> UploadFile:
+    file = SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE)
+    file.write(content)
+    file.seek(0)
+    return UploadFile(
+        file=file,
+        size=len(content),
+        filename="document.jpg",
+        headers=Headers({"content-type": "image/jpeg"}),
+    )
+
+DOCUMENTS = {label: _jpeg(size) for label, size in DOCUMENT_SIZES.items()}
+SMALL_DOCUMENT = DOCUMENTS["64kb"]
+SMALL_UPLOAD = _upload(SMALL_DOCUMENT)
+
+content_type_validator = ContentTypeValidator({"image/jpeg", "image/jpg", "image/png", "application/pdf"})
+file_size_validator = FileSizeValidator()
+magic_number_validator = MagicNumberValidator()
+
+@benchmark("validator.content_type", group="validators")
+async def validator_content_type():
+    await content_type_validator.validate(SMALL_UPLOAD, SMALL_DOCUMENT)
+
+@benchmark("validator.file_size", group="validators")
+async def validator_file_size():
+    await file_size_validator.validate(SMALL_UPLOAD, SMALL_DOCUMENT)
+
+@benchmark("validator.magic_number", group="validators")
+async def validator_magic_number():
+    await magic_number_validator.validate(SMALL_UPLOAD, SMALL_DOCUMENT)
+
+def _register_chain_benchmarks(label: str, content: bytes) -> None:
+    upload = _upload(content)
+    streaming = FileProcessingService(streaming=True, normalize=False)
+    buffered = FileProcessingService(streaming=False, normalize=False)
+    
+    # validate_document rewinds the upload, so the same one is reused every iteration
+    @benchmark(f"validate_document.streaming_{label}", group="validation_chain")
+    async def validate_streaming():
+        await streaming.validate_document(upload)
+    
+    @benchmark(f"validate_document.buffered_{label}", group="validation_chain")
+    async def validate_buffered():
+        await buffered.validate_document(upload)
+
+for _label, _content in DOCUMENTS.items():
+    _register_chain_benchmarks(_label, _content)
+
+PATIENT = PatientCreate(name="Jane Doe", email="jane@example.com", phone_number="+1234567890")
+
+def _register_intake_benchmarks(label: str, content: bytes) -> None:
+    upload = _upload(content)
+    streaming = FileProcessingService(streaming=True, normalize=False)
+    buffered = FileProcessingService(streaming=False, normalize=False)
+    
+    async def intake(service: FileProcessingService) -> PatientFormData:
+        document = await service.validate_document(upload)
+        return PatientFormData(
+            patient_data=PATIENT,
+            document_content=document,
+            document_filename=upload.filename,
+            document_content_type=upload.content_type,
+            document_original_size=len(document)
+        )
+    
+    # Every accepted registration takes this path, streaming should be no slower than buffered
+    @benchmark(f"document_intake.streaming_{label}", group="document_intake")
+    async def intake_streaming():
+        await intake(streaming)
+    
+    @benchmark(f"document_intake.buffered_{label}", group="document_intake")
+    async def intake_buffered():
+        await intake(buffered)
+
+for _label in ("512kb", "5mb"):
+    _register_intake_benchmarks(_label, DOCUMENTS[_label])
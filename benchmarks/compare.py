@@ -0,0 +1,58 @@
+"""
+Compare two benchmark result files.
+
+    python -m benchmarks.compare baseline.json current.json [--threshold 0.10]
+
+Exits with status 1 if any benchmark got slower, or allocates more per
+operation, by more than the threshold.
+"""
+import argparse
+import json
+import sys
+from typing import Dict, List, Tuple
+
+def _load(path: str) -> Dict[str, dict]:
+    with open(path) as f:
+        return {result["name"]: result for result in json.load(f)["results"]}
+
+def _change(baseline: float, current: float) -> float:
+    if baseline == 0:
+        return 0.0 if current == 0 else float("inf")
+    return (current - baseline) / baseline
+
+def compare(baseline: Dict[str, dict], current: Dict[str, dict], threshold: float) -> Tuple[List[str], List[str]]:
+    """
+    Compare median time and allocated bytes per operation.
+    Returns (report lines, names of regressed benchmarks)
+    """
+    lines = [f"{'benchmark':<50} {'time':>9} {'alloc':>9}"]
+    regressions = []
+    for name in sorted(baseline.keys() & current.keys()):
+        time_change = _change(baseline[name]["median_us"], current[name]["median_us"])
+        alloc_change = _change(baseline[name]["peak_bytes_per_op"], current[name]["peak_bytes_per_op"])
+        regressed = time_change > threshold or alloc_change > threshold
+        if regressed:
+            regressions.append(name)
+        lines.append(f"{name:<50} {time_change:>+9.1%} {alloc_change:>+9.1%}{'  REGRESSION' if regressed else ''}")
+    for name in sorted(baseline.keys() - current.keys()):
+        lines.append(f"{name:<50} {'removed':>9}")
+    for name in sorted(current.keys() - baseline.keys()):
+        lines.append(f"{name:<50} {'new':>9}")
+    return lines, regressions
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Compare two benchmark result files")
+    parser.add_argument("baseline")
+    parser.add_argument("current")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Allowed relative slowdown, 0.10 is 10%%")
+    args = parser.parse_args(argv)
+    
+    lines, regressions = compare(_load(args.baseline), _load(args.current), args.threshold)
+    print("\n".join(lines))
+    if regressions:
+        print(f"\n{len(regressions)} benchmark(s) regressed by more than {args.threshold:.0%}")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
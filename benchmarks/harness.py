@@ -0,0 +1,120 @@
+"""
+Minimal benchmark harness: registration, timing and allocation measurement.
+"""
+import asyncio
+import gc
+import statistics
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+@dataclass
+class Benchmark:
+    name: str
+    group: str
+    func: Callable[[], Any]
+    is_async: bool = False
+
+@dataclass
+class BenchmarkResult:
+    name: str
+    group: str
+    iterations: int
+    ops_per_sec: float
+    mean_us: float
+    median_us: float
+    stdev_us: float
+    peak_bytes_per_op: float
+    retained_bytes_per_op: float
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+_registry: List[Benchmark] = []
+
+def benchmark(name: str, group: str):
+    """Register a zero-argument function (or coroutine function) as a benchmark"""
+    def decorator(func):
+        _registry.append(Benchmark(name, group, func, asyncio.iscoroutinefunction(func)))
+        return func
+    return decorator
+
+def registered_benchmarks() -> List[Benchmark]:
+    return list(_registry)
+
+def _runner(bench: Benchmark, loop: asyncio.AbstractEventLoop) -> Callable[[], Any]:
+    if bench.is_async:
+        return lambda: loop.run_until_complete(bench.func())
+    return bench.func
+
+def _calibrate(run: Callable[[], Any], target: float) -> int:
+    """Find an iteration count that takes roughly `target` seconds per round"""
+    iterations = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(iterations):
+            run()
+        elapsed = time.perf_counter() - started
+        if elapsed >= target or iterations >= 1_000_000:
+            return iterations
+        iterations = max(iterations * 2, int(iterations * target / max(elapsed, 1e-9)))
+
+def run_benchmark(bench: Benchmark, rounds: int = 5, round_time: float = 0.2,
+                  loop: Optional[asyncio.AbstractEventLoop] = None) -> BenchmarkResult:
+    """
+    Time a benchmark over several rounds and measure its allocations.
+    Timing rounds run with the garbage collector disabled, allocations are
+    measured in a separate pass because tracemalloc slows everything down.
+    """
+    loop = loop or asyncio.new_event_loop()
+    run = _runner(bench, loop)
+    
+    # Warm up caches, lazy imports and compiled regexes
+    for _ in range(3):
+        run()
+    iterations = _calibrate(run, round_time)
+    
+    per_op = []
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(rounds):
+            started = time.perf_counter()
+            for _ in range(iterations):
+                run()
+            per_op.append((time.perf_counter() - started) / iterations)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    
+    # Peak traced memory per call is the transient allocation pressure of one operation,
+    # the snapshot difference over all calls is what stays allocated (caches, leaks)
+    allocation_iterations = max(1, min(iterations, 200))
+    gc.collect()
+    tracemalloc.start()
+    try:
+        peak_total = 0
+        before = tracemalloc.take_snapshot()
+        for _ in range(allocation_iterations):
+            current, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            run()
+            peak_total += tracemalloc.get_traced_memory()[1] - current
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+    retained = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    
+    mean = statistics.fmean(per_op)
+    return BenchmarkResult(
+        name=bench.name,
+        group=bench.group,
+        iterations=iterations * rounds,
+        ops_per_sec=1 / mean if mean else float("inf"),
+        mean_us=mean * 1e6,
+        median_us=statistics.median(per_op) * 1e6,
+        stdev_us=(statistics.stdev(per_op) if len(per_op) > 1 else 0.0) * 1e6,
+        peak_bytes_per_op=peak_total / allocation_iterations,
+        retained_bytes_per_op=max(retained, 0) / allocation_iterations,
+    )
@@ -0,0 +1,141 @@
+"""
+Insert throughput of random (UUIDv4) and time-ordered (UUIDv7) primary keys as the table grows.
+
+    python -m benchmarks.insert_keys --url mysql+asyncmy://user:password@db:3306/test_db --rows 500000
+
+Each key kind fills its own scratch table shaped like `patients` (BINARY(16) clustered
+primary key, a few columns and a blob), in batches, and reports rows per second for
+every --step rows inserted. On MySQL it also reports the table's data and index size
+at the end, random keys leave half-empty pages behind after splitting them.
+Without --url it runs against a temporary SQLite file (WITHOUT ROWID, so also clustered).
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+from app.utils.uuid7 import uuid7
+
+KEY_KINDS: Dict[str, Callable[[], uuid.UUID]] = {
+    "uuid4": uuid.uuid4,
+    "uuid7": uuid7,
+}
+
+def _table(kind: str) -> str:
+    return f"bench_insert_keys_{kind}"
+
+def _create_table_sql(dialect: str, table: str) -> str:
+    if dialect == "mysql":
+        return (
+            f"CREATE TABLE {table} (id BINARY(16) NOT NULL PRIMARY KEY, name VARCHAR(100) NOT NULL, "
+            "email VARCHAR(255) NOT NULL, created_at DATETIME NOT NULL, payload BLOB NOT NULL) ENGINE=InnoDB"
+        )
+    return (
+        f"CREATE TABLE {table} (id BLOB NOT NULL PRIMARY KEY, name TEXT NOT NULL, "
+        "email TEXT NOT NULL, created_at TIMESTAMP NOT NULL, payload BLOB NOT NULL) WITHOUT ROWID"
+    )
+
+async def _table_bytes(engine: AsyncEngine, table: str) -> Dict[str, int]:
+    if engine.dialect.name != "mysql":
+        return {}
+    async with engine.connect() as connection:
+        await connection.execute(text(f"ANALYZE TABLE {table}"))
+        row = (await connection.execute(text(
+            "SELECT data_length, index_length FROM information_schema.tables "
+            "WHERE table_schema = DATABASE() AND table_name = :table"
+        ), {"table": table})).one()
+    return {"data_bytes": int(row[0]), "index_bytes": int(row[1])}
+
+async def run_kind(engine: AsyncEngine, kind: str, rows: int, step: int, batch_size: int,
+                   payload_bytes: int) -> Dict[str, Any]:
+    table = _table(kind)
+    new_key = KEY_KINDS[kind]
+    payload = os.urandom(payload_bytes)
+    insert = text(f"INSERT INTO {table} (id, name, email, created_at, payload) VALUES (:id, :name, :email, :created_at, :payload)")
+    
+    async with engine.begin() as connection:
+        await connection.execute(text(f"DROP TABLE IF EXISTS {table}"))
+        await connection.execute(text(_create_table_sql(engine.dialect.name, table)))
+    
+    segments: List[Dict[str, Any]] = []
+    inserted = 0
+    try:
+        while inserted < rows:
+            segment_rows = min(step, rows - inserted)
+            started = time.perf_counter()
+            done = 0
+            while done < segment_rows:
+                count = min(batch_size, segment_rows - done)
+                now = datetime.now(timezone.utc).replace(tzinfo=None)
+                batch = [
+                    {"id": new_key().bytes, "name": "Jane Doe", "email": f"patient{inserted + done + i}@example.com",
+                     "created_at": now, "payload": payload}
+                    for i in range(count)
+                ]
+                async with engine.begin() as connection:
+                    await connection.execute(insert, batch)
+                done += count
+            elapsed = time.perf_counter() - started
+            inserted += segment_rows
+            segments.append({
+                "table_rows": inserted,
+                "rows_per_sec": segment_rows / elapsed if elapsed else float("inf"),
+            })
+            print(f"{kind:<6} {inserted:>12,} rows {segments[-1]['rows_per_sec']:>12,.0f} rows/s", file=sys.stderr)
+        return {"key": kind, "segments": segments, **await _table_bytes(engine, table)}
+    finally:
+        async with engine.begin() as connection:
+            await connection.execute(text(f"DROP TABLE IF EXISTS {table}"))
+
+async def run(url: str, kinds: List[str], rows: int, step: int, batch_size: int, payload_bytes: int) -> List[Dict[str, Any]]:
+    engine = create_async_engine(url)
+    try:
+        return [await run_kind(engine, kind, rows, step, batch_size, payload_bytes) for kind in kinds]
+    finally:
+        await engine.dispose()
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Compare insert throughput of UUIDv4 and UUIDv7 primary keys")
+    parser.add_argument("--url", help="Database to create the scratch tables in (default: a temporary SQLite file)")
+    parser.add_argument("--rows", type=int, default=200_000, help="Rows inserted per key kind")
+    parser.add_argument("--step", type=int, help="Report throughput every this many rows (default: rows / 10)")
+    parser.add_argument("--batch-size", type=int, default=500, help="Rows per INSERT transaction")
+    parser.add_argument("--payload-bytes", type=int, default=2048, help="Blob size per row")
+    parser.add_argument("--keys", nargs="+", choices=list(KEY_KINDS), default=list(KEY_KINDS))
+    parser.add_argument("--output", "-o", help="Write JSON results to this file instead of stdout")
+    args = parser.parse_args(argv)
+    
+    with tempfile.TemporaryDirectory() as directory:
+        url = args.url or f"sqlite+aiosqlite:///{os.path.join(directory, 'insert_keys.db')}"
+        results = asyncio.run(run(
+            url, args.keys, args.rows, args.step or max(args.rows // 10, 1), args.batch_size, args.payload_bytes
+        ))
+    
+    report = json.dumps({
+        "metadata": {
+            "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "dialect": url.split(":", 1)[0],
+            "rows": args.rows,
+            "batch_size": args.batch_size,
+            "payload_bytes": args.payload_bytes,
+        },
+        "results": results,
+    }, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(report + "\n")
+    else:
+        print(report)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
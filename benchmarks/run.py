@@ -0,0 +1,76 @@
+"""
+Run the microbenchmarks and write the results as JSON.
+
+    python -m benchmarks.run --output results.json [--filter validator] [--rounds 5]
+
+Compare two result files with `python -m benchmarks.compare`.
+"""
+import argparse
+import asyncio
+import json
+import platform
+import subprocess
+import sys
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+from benchmarks import bench_notifications, bench_schemas, bench_validators  # noqa: F401
+from benchmarks.harness import registered_benchmarks, run_benchmark
+
+def _git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def _metadata(args: argparse.Namespace) -> Dict[str, Any]:
+    import pydantic
+    
+    return {
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "git_revision": _git_revision(),
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "pydantic": pydantic.VERSION,
+        "rounds": args.rounds,
+        "round_time": args.round_time,
+    }
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Run the microbenchmarks")
+    parser.add_argument("--output", "-o", help="Write JSON results to this file instead of stdout")
+    parser.add_argument("--filter", "-k", default="", help="Only run benchmarks whose name contains this")
+    parser.add_argument("--rounds", type=int, default=5, help="Timing rounds per benchmark")
+    parser.add_argument("--round-time", type=float, default=0.2, help="Target duration of a round in seconds")
+    args = parser.parse_args(argv)
+    
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    results = []
+    try:
+        for bench in registered_benchmarks():
+            if args.filter not in bench.name:
+                continue
+            result = run_benchmark(bench, rounds=args.rounds, round_time=args.round_time, loop=loop)
+            results.append(result.to_dict())
+            print(
+                f"{result.name:<50} {result.ops_per_sec:>14,.0f} ops/s "
+                f"{result.mean_us:>12.2f} us {result.peak_bytes_per_op:>12,.0f} B/op",
+                file=sys.stderr
+            )
+    finally:
+        loop.close()
+    
+    report = json.dumps({"metadata": _metadata(args), "results": results}, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(report + "\n")
+    else:
+        print(report)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
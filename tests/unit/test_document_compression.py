@@ -0,0 +1,93 @@
+import os
+import zlib
+
+import pytest
+
+from app.errors.storage import DocumentCodecError
+from app.services.storage import compression
+from app.services.storage.compression import (
+    CODECS,
+    MAGIC,
+    compress_document,
+    decode_document,
+    decompress_document,
+    encode_document,
+    is_compressed
+)
+
+# Uncompressed PDF streams compress well, JPEG data doesn't
+PDF_CONTENT = b"%PDF-1.4\n" + b"1 0 obj << /Type /Page >> stream BT /F1 12 Tf (Patient document) Tj ET endstream\n" * 2000
+JPEG_CONTENT = b"\xff\xd8\xff\xe0" + os.urandom(300 * 1024)
+
+@pytest.mark.parametrize("codec", ["zlib", pytest.param("zstd", marks=pytest.mark.skipif(
+    compression.zstandard is None, reason="zstandard not installed"
+))])
+def test_compressible_document_round_trips(codec):
+    # Act
+    stored = compress_document(PDF_CONTENT, CODECS[codec], min_savings=0.1)
+    
+    # Assert
+    assert is_compressed(stored)
+    assert stored[len(MAGIC)] == CODECS[codec].id
+    assert len(stored) < len(PDF_CONTENT) // 10
+    assert decompress_document(stored) == PDF_CONTENT
+
+def test_incompressible_document_is_stored_raw():
+    stored = compress_document(JPEG_CONTENT, CODECS["zlib"], min_savings=0.1)
+    
+    assert stored is JPEG_CONTENT
+    assert not is_compressed(stored)
+
+def test_small_gain_below_threshold_is_stored_raw():
+    # Arrange: half compressible, half random
+    content = b"a" * 10_000 + os.urandom(10_000)
+    
+    # Act / Assert: saves about half, which is enough for 10% but not for 60%
+    assert is_compressed(compress_document(content, CODECS["zlib"], min_savings=0.1))
+    assert compress_document(content, CODECS["zlib"], min_savings=0.6) is content
+
+def test_raw_rows_stored_before_compression_stay_readable():
+    assert decompress_document(JPEG_CONTENT) is JPEG_CONTENT
+    assert decompress_document(PDF_CONTENT) is PDF_CONTENT
+
+def test_unknown_codec_id_is_rejected():
+    stored = MAGIC + bytes([99]) + zlib.compress(PDF_CONTENT)
+    
+    with pytest.raises(DocumentCodecError):
+        decompress_document(stored)
+
+def test_compression_can_be_disabled(monkeypatch):
+    monkeypatch.setattr(compression.settings, "DOCUMENT_COMPRESSION", "none")
+    
+    assert compress_document(PDF_CONTENT) is PDF_CONTENT
+
+def test_zstd_falls_back_to_zlib_when_not_installed(monkeypatch):
+    monkeypatch.setattr(compression, "zstandard", None)
+    monkeypatch.setattr(compression.settings, "DOCUMENT_COMPRESSION", "zstd")
+    
+    stored = compress_document(PDF_CONTENT)
+    
+    assert stored[len(MAGIC)] == CODECS["zlib"].id
+
+@pytest.mark.asyncio
+async def test_large_documents_are_encoded_in_a_worker_thread(monkeypatch):
+    # Arrange
+    offloaded = []
+    
+    async def fake_run_in_threadpool(func, *args):
+        offloaded.append(len(args[0]))
+        return func(*args)
+    
+    monkeypatch.setattr(compression, "run_in_threadpool", fake_run_in_threadpool)
+    monkeypatch.setattr(compression.settings, "DOCUMENT_COMPRESSION_THREADPOOL_BYTES", 64 * 1024)
+    small = PDF_CONTENT[:1024]
+    
+    # Act
+    stored_small = await encode_document(small)
+    stored_large = await encode_document(PDF_CONTENT)
+    
+    # Assert: only the large document was offloaded, its compressed form is small enough to decode inline
+    assert offloaded == [len(PDF_CONTENT)]
+    assert await decode_document(stored_small) == small
+    assert await decode_document(stored_large) == PDF_CONTENT
+    assert offloaded == [len(PDF_CONTENT)]
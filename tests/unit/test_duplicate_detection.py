@@ -0,0 +1,69 @@
+import sqlite3
+
+from sqlalchemy.exc import IntegrityError
+
+from app.db.errors import is_unique_violation
+from app.models.patient import EMAIL_UNIQUE_INDEX
+from app.services.patient_lookup import KnownEmailCache
+
+class MySQLIntegrityError(Exception):
+    """Stand-in for a MySQL driver error, which carries (code, message) args"""
+
+class PostgresUniqueViolation(Exception):
+    """Stand-in for an asyncpg UniqueViolationError"""
+    sqlstate = "23505"
+    constraint_name = EMAIL_UNIQUE_INDEX
+
+def integrity_error(orig: Exception) -> IntegrityError:
+    return IntegrityError("INSERT INTO patients ...", {}, orig)
+
+def test_mysql_duplicate_email_detected_by_index_name():
+    error = integrity_error(MySQLIntegrityError(
+        1062, "Duplicate entry 'jane@example.com' for key 'patients.idx_patients_email_unique'"
+    ))
+    
+    assert is_unique_violation(error) is True
+    assert is_unique_violation(error, EMAIL_UNIQUE_INDEX) is True
+    assert is_unique_violation(error, "idx_other_unique") is False
+
+def test_mysql_other_integrity_errors_are_not_unique_violations():
+    # 1048: Column cannot be null
+    error = integrity_error(MySQLIntegrityError(1048, "Column 'email' cannot be null"))
+    
+    assert is_unique_violation(error) is False
+
+def test_postgres_unique_violation_detected_by_constraint():
+    error = integrity_error(PostgresUniqueViolation("duplicate key value violates unique constraint"))
+    
+    assert is_unique_violation(error, EMAIL_UNIQUE_INDEX) is True
+    assert is_unique_violation(error, "idx_other_unique") is False
+
+def test_sqlite_unique_violation_detected_by_column():
+    error = integrity_error(sqlite3.IntegrityError("UNIQUE constraint failed: patients.email"))
+    
+    assert is_unique_violation(error) is True
+    assert is_unique_violation(error, EMAIL_UNIQUE_INDEX, column="email") is True
+    assert is_unique_violation(error, EMAIL_UNIQUE_INDEX, column="phone_number") is False
+
+def test_known_email_cache_is_case_insensitive():
+    cache = KnownEmailCache()
+    cache.add("Jane@Example.com")
+    
+    assert "jane@example.com" in cache
+    assert "JANE@example.com" in cache
+    assert "john@example.com" not in cache
+
+def test_known_email_cache_evicts_least_recently_used_and_expired():
+    cache = KnownEmailCache(max_size=2)
+    cache.add("a@example.com")
+    cache.add("b@example.com")
+    assert "a@example.com" in cache  # a is now the most recently used
+    cache.add("c@example.com")
+    
+    assert "b@example.com" not in cache
+    assert "a@example.com" in cache
+    assert len(cache) == 2
+    
+    expired = KnownEmailCache(ttl=-1)
+    expired.add("a@example.com")
+    assert "a@example.com" not in expired
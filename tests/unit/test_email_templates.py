@@ -0,0 +1,55 @@
+import asyncio
+import email
+
+import pytest
+
+from app.services.email_notifier import EmailNotifier
+from app.services.email_templates import EmailTemplates
+from app.utils.batching import ThreadPoolBatcher
+
+def test_html_body_escapes_content_but_text_body_does_not():
+    # Arrange
+    templates = EmailTemplates(default_locale="en")
+    
+    # Act
+    rendered = templates.render("notification", None, {"subject": "Welcome", "name": "<b>Jane</b> & co"})
+    
+    # Assert
+    assert "&lt;b&gt;Jane&lt;/b&gt; &amp; co" in rendered.html
+    assert "<b>Jane</b> & co" in rendered.text
+
+def test_locale_falls_back_to_language_then_default():
+    templates = EmailTemplates(default_locale="en")
+    
+    assert "Estimado/a" in templates.render("notification", "es-UY", {"name": "Ana"}).text
+    assert "Dear" in templates.render("notification", "fr", {"name": "Ana"}).text
+
+def test_templates_are_resolved_once_per_name_and_locale():
+    templates = EmailTemplates(default_locale="en")
+    
+    assert templates.load() >= 2
+    assert templates.get("notification", "es-UY") is templates.get("notification", "es-uy")
+
+def test_message_has_plain_text_and_html_alternatives():
+    message = EmailNotifier.build_message("jane@example.com", "Welcome", {"name": "Jane", "message": "Hello"})
+    
+    parsed = email.message_from_bytes(message.as_bytes())
+    parts = [part.get_content_type() for part in parsed.get_payload()]
+    assert parts == ["text/plain", "text/html"]
+
+@pytest.mark.asyncio
+async def test_batcher_coalesces_concurrent_submissions():
+    # Arrange
+    batches = []
+    def double(items):
+        batches.append(list(items))
+        return [ValueError("odd") if item % 2 else item * 2 for item in items]
+    batcher = ThreadPoolBatcher(double)
+    
+    # Act
+    results = await asyncio.gather(*(batcher.submit(item) for item in range(4)), return_exceptions=True)
+    
+    # Assert
+    assert batches == [[0, 1, 2, 3]]
+    assert results[0] == 0 and results[2] == 4
+    assert isinstance(results[1], ValueError)
@@ -0,0 +1,36 @@
+import pytest
+from fastapi import HTTPException
+
+from app.utils.http_range import etag_matches, parse_range_header
+
+@pytest.mark.parametrize("header,expected", [
+    (None, None),
+    ("bytes=0-99", (0, 99)),
+    ("bytes=100-", (100, 999)),
+    ("bytes=-100", (900, 999)),
+    ("bytes=-5000", (0, 999)),
+    ("bytes=900-5000", (900, 999)),
+    ("bytes=0-1,5-6", None),
+    ("items=0-1", None),
+    ("bytes=abc", None),
+    ("bytes=50-10", None),
+])
+def test_parse_range_header(header, expected):
+    assert parse_range_header(header, 1000) == expected
+
+@pytest.mark.parametrize("header", ["bytes=1000-", "bytes=-0"])
+def test_unsatisfiable_range(header):
+    with pytest.raises(HTTPException) as exc_info:
+        parse_range_header(header, 1000)
+    
+    assert exc_info.value.status_code == 416
+    assert exc_info.value.headers["Content-Range"] == "bytes */1000"
+
+def test_etag_matches():
+    etag = '"abc123"'
+    
+    assert etag_matches('"abc123"', etag) is True
+    assert etag_matches('"other", W/"abc123"', etag) is True
+    assert etag_matches("*", etag) is True
+    assert etag_matches('"other"', etag) is False
+    assert etag_matches(None, etag) is False
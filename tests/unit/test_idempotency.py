@@ -0,0 +1,154 @@
+import asyncio
+
+import httpx
+import pytest
+from fastapi import FastAPI, HTTPException, Request
+
+from app.middleware.idempotency import IdempotencyMiddleware
+from app.services.idempotency import IdempotencyCache, IdempotencyStore, StoredResponse
+
+class InMemoryIdempotencyStore(IdempotencyStore):
+    """Store keeping its rows in a dict instead of the database"""
+    
+    def __init__(self, **kwargs):
+        super().__init__(session_factory=None, cache=IdempotencyCache(), **kwargs)
+        self.rows = {}
+    
+    async def _claim(self, key, fingerprint):
+        if key in self.rows:
+            return False, self.rows[key]
+        self.rows[key] = None
+        return True, None
+    
+    async def _save(self, key, response):
+        self.rows[key] = response
+    
+    async def _delete(self, key):
+        self.rows.pop(key, None)
+
+def make_app(store: IdempotencyStore):
+    app = FastAPI()
+    app.state.calls = 0
+    
+    @app.post("/api/patients/", status_code=201)
+    async def create(request: Request):
+        app.state.calls += 1
+        await asyncio.sleep(0.05)
+        if request.headers.get("x-fail"):
+            raise HTTPException(status_code=500, detail="Failed")
+        return {"id": app.state.calls, "body_size": len(await request.body())}
+    
+    app.add_middleware(IdempotencyMiddleware, paths=["/api/patients/"], store=store)
+    return app
+
+def client_for(app) -> httpx.AsyncClient:
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test")
+
+@pytest.mark.asyncio
+async def test_retry_replays_the_first_response():
+    # Arrange
+    store = InMemoryIdempotencyStore()
+    app = make_app(store)
+    
+    # Act
+    async with client_for(app) as client:
+        first = await client.post("/api/patients/", content=b"document", headers={"Idempotency-Key": "abc"})
+        retry = await client.post("/api/patients/", content=b"document", headers={"Idempotency-Key": "abc"})
+    
+    # Assert
+    assert first.status_code == retry.status_code == 201
+    assert retry.json() == first.json()
+    assert retry.headers["idempotent-replayed"] == "true"
+    assert app.state.calls == 1
+
+@pytest.mark.asyncio
+async def test_concurrent_duplicates_wait_for_the_first_request():
+    # Arrange
+    store = InMemoryIdempotencyStore()
+    app = make_app(store)
+    
+    # Act
+    async with client_for(app) as client:
+        responses = await asyncio.gather(*(
+            client.post("/api/patients/", content=b"document", headers={"Idempotency-Key": "abc"})
+            for _ in range(5)
+        ))
+    
+    # Assert
+    assert app.state.calls == 1
+    assert {response.json()["id"] for response in responses} == {1}
+
+@pytest.mark.asyncio
+async def test_failed_requests_are_not_stored():
+    # Arrange
+    store = InMemoryIdempotencyStore()
+    app = make_app(store)
+    
+    # Act
+    async with client_for(app) as client:
+        failed = await client.post("/api/patients/", headers={"Idempotency-Key": "abc", "X-Fail": "1"})
+        retry = await client.post("/api/patients/", headers={"Idempotency-Key": "abc"})
+    
+    # Assert
+    assert failed.status_code == 500
+    assert retry.status_code == 201
+    assert app.state.calls == 2
+
+@pytest.mark.asyncio
+async def test_requests_without_a_key_are_not_deduplicated():
+    app = make_app(InMemoryIdempotencyStore())
+    
+    async with client_for(app) as client:
+        await client.post("/api/patients/")
+        await client.post("/api/patients/")
+    
+    assert app.state.calls == 2
+
+@pytest.mark.asyncio
+async def test_key_reused_for_another_request_is_rejected():
+    # Arrange
+    store = InMemoryIdempotencyStore()
+    await store.acquire("abc", "other-fingerprint")
+    await store.complete("abc", "other-fingerprint", StoredResponse(201, "application/json", b"{}"))
+    app = make_app(store)
+    
+    # Act
+    async with client_for(app) as client:
+        response = await client.post("/api/patients/", headers={"Idempotency-Key": "abc"})
+    
+    # Assert
+    assert response.status_code == 422
+    assert app.state.calls == 0
+
+@pytest.mark.asyncio
+async def test_key_in_progress_elsewhere_times_out_with_conflict():
+    # Arrange
+    store = InMemoryIdempotencyStore(wait_timeout=0.05, poll_interval=0.01)
+    app = make_app(store)
+    
+    class PendingRow:
+        is_completed = False
+        request_fingerprint = None
+    
+    async def claimed_by_another_process(key, fingerprint):
+        PendingRow.request_fingerprint = fingerprint
+        return False, PendingRow
+    store._claim = claimed_by_another_process
+    
+    # Act
+    async with client_for(app) as client:
+        response = await client.post("/api/patients/", headers={"Idempotency-Key": "abc"})
+    
+    # Assert
+    assert response.status_code == 409
+    assert response.headers["retry-after"] == "1"
+    assert app.state.calls == 0
+
+def test_idempotency_responses_carry_cors_headers(client):
+    # Act: an invalid key is answered by the middleware without reaching the endpoint
+    response = client.post("/api/patients/", headers={"Idempotency-Key": "k" * 300, "Origin": "http://example.com"})
+    
+    # Assert
+    assert response.status_code == 400
+    assert "access-control-allow-origin" in response.headers
+    assert "idempotent-replayed" in response.headers["access-control-expose-headers"].lower()
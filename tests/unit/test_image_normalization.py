@@ -0,0 +1,83 @@
+import io
+import os
+
+import pytest
+from PIL import Image
+
+from app.services.file_handling import FileProcessingService
+from app.services.image_workers import shutdown_image_executor
+from app.utils.image_normalization import normalize_image
+
+def _photo(size, format="JPEG", exif=None):
+    # Random noise compresses like a photo, not like a flat graphic
+    image = Image.frombytes("RGB", size, os.urandom(size[0] * size[1] * 3))
+    buffer = io.BytesIO()
+    if exif is not None:
+        image.save(buffer, format, exif=exif, quality=95)
+    else:
+        image.save(buffer, format)
+    return buffer.getvalue()
+
+def test_normalize_downscales_and_strips_metadata():
+    # Arrange
+    exif = Image.Exif()
+    exif[0x010F] = "PhoneMaker"  # Make
+    content = _photo((1600, 800), exif=exif.tobytes())
+    
+    # Act
+    normalized, content_type = normalize_image(content, "image/jpeg", 400, 80)
+    
+    # Assert
+    image = Image.open(io.BytesIO(normalized))
+    assert content_type == "image/jpeg"
+    assert image.size == (400, 200)
+    assert "exif" not in image.info
+    assert len(normalized) < len(content)
+
+def test_normalize_converts_png_photos_to_jpeg():
+    content = _photo((600, 600), format="PNG")
+    
+    normalized, content_type = normalize_image(content, "image/png", 2048, 85)
+    
+    assert content_type == "image/jpeg"
+    assert Image.open(io.BytesIO(normalized)).format == "JPEG"
+
+def test_normalize_keeps_png_graphics_lossless():
+    # Arrange - a two-colour scan-like image, JPEG would only blur it
+    image = Image.new("RGB", (2000, 1000), (255, 255, 255))
+    image.paste((0, 0, 0), (100, 100, 1900, 200))
+    buffer = io.BytesIO()
+    image.save(buffer, "PNG", compress_level=0)
+    
+    # Act
+    normalized, content_type = normalize_image(buffer.getvalue(), "image/png", 1000, 85)
+    
+    # Assert
+    assert content_type == "image/png"
+    assert Image.open(io.BytesIO(normalized)).size == (1000, 500)
+
+@pytest.mark.parametrize("content,content_type", [
+    (b"%PDF-1.4 document", "application/pdf"),
+    (b"\xff\xd8\xff\xe0 not really a jpeg", "image/jpeg"),
+])
+def test_normalize_skips_other_documents(content, content_type):
+    assert normalize_image(content, content_type, 2048, 85) is None
+
+@pytest.mark.asyncio
+async def test_service_normalization_is_opt_in():
+    # Arrange
+    content = _photo((1200, 900), format="PNG")
+    disabled = FileProcessingService(normalize=False)
+    enabled = FileProcessingService(normalize=True)
+    
+    # Act
+    try:
+        unchanged = await disabled.normalize_document(content, "image/png", "scan.png")
+        normalized = await enabled.normalize_document(content, "image/png", "scan.png")
+    finally:
+        shutdown_image_executor()
+    
+    # Assert
+    assert unchanged == (content, "image/png", "scan.png")
+    assert normalized[1:] == ("image/jpeg", "scan.jpg")
+    assert len(normalized[0]) < len(content)
@@ -0,0 +1,65 @@
+import json
+import logging
+
+import pytest
+
+from app.utils.logger import JsonFormatter, SamplingFilter, setup_logging, stop_logging
+
+@pytest.fixture
+def restore_logging():
+    root_logger = logging.getLogger()
+    app_logger = logging.getLogger("app")
+    handlers, level, app_level = root_logger.handlers, root_logger.level, app_logger.level
+    yield
+    stop_logging()
+    root_logger.handlers, root_logger.level = handlers, level
+    app_logger.setLevel(app_level)
+
+def _record(name="app.test", level=logging.INFO, msg="Patient %s created", args=("abc",), **extra):
+    record = logging.LogRecord(name, level, __file__, 1, msg, args, None)
+    record.__dict__.update(extra)
+    return record
+
+def test_json_formatter_outputs_compact_json():
+    # Act
+    line = JsonFormatter().format(_record(patient_id="abc"))
+    
+    # Assert
+    entry = json.loads(line)
+    assert "\n" not in line and ", " not in line
+    assert entry["level"] == "INFO"
+    assert entry["logger"] == "app.test"
+    assert entry["msg"] == "Patient abc created"
+    assert entry["patient_id"] == "abc"
+    assert entry["ts"].endswith("+00:00")
+
+def test_sampling_filter_uses_most_specific_logger_rate():
+    sampling = SamplingFilter({"app": 1.0, "app.api.endpoints.create_patients": 0.0})
+    
+    assert sampling.filter(_record(name="app.api.endpoints.create_patients")) is False
+    assert sampling.filter(_record(name="app.api.endpoints.list_patients")) is True
+    assert sampling.filter(_record(name="uvicorn")) is True
+
+def test_sampling_filter_never_drops_warnings():
+    sampling = SamplingFilter({"app": 0.0})
+    
+    assert sampling.filter(_record(level=logging.DEBUG)) is False
+    assert sampling.filter(_record(level=logging.WARNING)) is True
+
+def test_queued_json_logging_writes_from_listener(restore_logging, capsys):
+    # Arrange
+    setup_logging("INFO", log_format="json", use_queue=True, sampling={})
+    logger = logging.getLogger("app.test")
+    
+    # Act
+    logger.info("Imported %s patients", 3)
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        logger.exception("Import failed")
+    stop_logging()
+    
+    # Assert
+    entries = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert [entry["msg"] for entry in entries] == ["Imported 3 patients", "Import failed"]
+    assert "ValueError: boom" in entries[1]["exc"]
@@ -0,0 +1,123 @@
+import asyncio
+
+import httpx
+import pytest
+from unittest.mock import AsyncMock
+from fastapi import FastAPI, Request
+
+from app.middleware.memory_budget import MemoryBudgetMiddleware
+from app.middleware.metrics import MetricsMiddleware
+from app.services.memory_budget import MemoryBudget, memory_budget
+
+@pytest.mark.asyncio
+async def test_reservations_over_budget_wait_for_release():
+    # Arrange
+    budget = MemoryBudget(100)
+    assert await budget.acquire(80, timeout=0)
+    
+    # Act
+    waiting = asyncio.create_task(budget.acquire(50, timeout=1))
+    await asyncio.sleep(0.01)
+    assert budget.waiting == 1
+    budget.release(80)
+    
+    # Assert
+    assert await waiting is True
+    assert budget.in_use_bytes == 50
+    assert budget.waiting == 0
+
+@pytest.mark.asyncio
+async def test_reservation_is_rejected_after_timeout():
+    budget = MemoryBudget(100)
+    await budget.acquire(100, timeout=0)
+    
+    assert await budget.acquire(10, timeout=0.01) is False
+    assert budget.rejected == 1
+    assert budget.waiting == 0
+    assert budget.in_use_bytes == 100
+
+@pytest.mark.asyncio
+async def test_waiters_are_granted_in_order():
+    # Arrange
+    budget = MemoryBudget(100)
+    await budget.acquire(100, timeout=0)
+    large = asyncio.create_task(budget.acquire(90, timeout=1))
+    await asyncio.sleep(0)
+    
+    # Act: the small request fits after a partial release, but queues behind the large one
+    budget.release(20)
+    small = asyncio.create_task(budget.acquire(10, timeout=0.01))
+    
+    # Assert
+    assert await small is False
+    budget.release(80)
+    assert await large is True
+
+@pytest.mark.asyncio
+async def test_oversized_reservation_is_capped_to_the_budget():
+    budget = MemoryBudget(100)
+    
+    assert await budget.acquire(1000, timeout=0)
+    assert budget.in_use_bytes == 100
+    
+    budget.release(1000)
+    assert budget.in_use_bytes == 0
+
+@pytest.mark.asyncio
+async def test_middleware_rejects_uploads_over_budget_with_retry_after():
+    # Arrange
+    budget = MemoryBudget(1000)
+    app = FastAPI()
+    
+    @app.post("/api/patients/")
+    async def create():
+        return {"in_use_bytes": budget.in_use_bytes}
+    
+    app.add_middleware(MemoryBudgetMiddleware, paths=["/api/patients/"], budget=budget, copies=2, queue_timeout=0)
+    transport = httpx.ASGITransport(app=app)
+    
+    # Act
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        admitted = await client.post("/api/patients/", content=b"x" * 100)
+        await budget.acquire(900, timeout=0)
+        rejected = await client.post("/api/patients/", content=b"x" * 100)
+    
+    # Assert
+    assert admitted.json() == {"in_use_bytes": 200}
+    assert rejected.status_code == 503
+    assert "retry-after" in rejected.headers
+    assert budget.in_use_bytes == 900
+
+@pytest.mark.asyncio
+async def test_middleware_records_when_the_request_was_admitted():
+    # Arrange: a request waits for the budget before its body is read
+    budget = MemoryBudget(100)
+    app = FastAPI()
+    
+    @app.post("/api/patients/")
+    async def create(request: Request):
+        return {"waited": request.state.request_admitted - request.state.request_started}
+    
+    app.add_middleware(MemoryBudgetMiddleware, paths=["/api/patients/"], budget=budget, copies=1, queue_timeout=1)
+    app.add_middleware(MetricsMiddleware)
+    await budget.acquire(100, timeout=0)
+    asyncio.get_running_loop().call_later(0.05, budget.release, 100)
+    
+    # Act
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        response = await client.post("/api/patients/", content=b"x" * 100)
+    
+    # Assert: the wait is measured up to admission, not counted as receiving the body
+    assert response.json()["waited"] >= 0.04
+
+def test_budget_rejection_carries_cors_headers(client, monkeypatch):
+    # Arrange
+    monkeypatch.setattr(memory_budget, "acquire", AsyncMock(return_value=False))
+    
+    # Act
+    response = client.post("/api/patients/", content=b"x" * 100, headers={"Origin": "http://example.com"})
+    
+    # Assert: browsers can read the 503 and its Retry-After instead of seeing a CORS error
+    assert response.status_code == 503
+    assert "access-control-allow-origin" in response.headers
+    assert "retry-after" in response.headers["access-control-expose-headers"].lower()
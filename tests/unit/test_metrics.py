@@ -0,0 +1,69 @@
+import pytest
+
+from app.services.notifications import Notifier
+from app.utils.metrics import MetricsRegistry, notifications_total, render_histogram
+from app.utils.stats import Histogram
+
+def test_counter_renders_labelled_samples():
+    # Arrange
+    registry = MetricsRegistry()
+    requests = registry.counter("requests_total", "Requests", ["route", "status"])
+    
+    # Act
+    requests.labels("/api/patients/", "201").inc()
+    requests.labels(route="/api/patients/", status="201").inc()
+    requests.labels("/api/patients/", "400").inc()
+    
+    # Assert
+    output = registry.render()
+    assert "# TYPE requests_total counter" in output
+    assert 'requests_total{route="/api/patients/",status="201"} 2' in output
+    assert 'requests_total{route="/api/patients/",status="400"} 1' in output
+
+def test_histogram_timer_renders_cumulative_buckets():
+    # Arrange
+    registry = MetricsRegistry()
+    stages = registry.histogram("stage_seconds", "Stages", ["stage"], buckets=(0.5, 1.0))
+    
+    # Act
+    with stages.time("insert"):
+        pass
+    stages.labels("insert").observe(0.75)
+    
+    # Assert
+    output = registry.render()
+    assert 'stage_seconds_bucket{stage="insert",le="0.5"} 1' in output
+    assert 'stage_seconds_bucket{stage="insert",le="1"} 2' in output
+    assert 'stage_seconds_bucket{stage="insert",le="+Inf"} 2' in output
+    assert 'stage_seconds_count{stage="insert"} 2' in output
+
+def test_render_histogram_keeps_exact_bucket_bounds():
+    histogram = Histogram((1024, 1048576))
+    histogram.observe(2048)
+    
+    lines = render_histogram("upload_bytes", histogram)
+    
+    assert 'upload_bytes_bucket{le="1048576"} 1' in lines
+
+def test_duplicate_metric_names_are_rejected():
+    registry = MetricsRegistry()
+    registry.counter("requests_total", "Requests")
+    
+    with pytest.raises(ValueError):
+        registry.counter("requests_total", "Requests")
+
+@pytest.mark.asyncio
+async def test_notify_counts_failed_deliveries():
+    # Arrange
+    class FailingNotifier(Notifier):
+        channel = "test-failing"
+        
+        async def send_notification(self, recipient, subject, content):
+            raise ConnectionError("unreachable")
+    
+    # Act
+    with pytest.raises(ConnectionError):
+        await FailingNotifier().notify("a@example.com", "Subject", {})
+    
+    # Assert
+    assert notifications_total.labels("test-failing", "failed").value == 1
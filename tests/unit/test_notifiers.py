@@ -1,13 +1,18 @@
+import asyncio
+
 import pytest
 from unittest.mock import AsyncMock, patch, MagicMock
 from fastapi import BackgroundTasks
 
-from app.services.notifications import NotificationFactory, Notifier
+from app.errors.notifier import NotificationTimeoutError
+from app.services.notifications import NotificationFactory, Notifier, fan_out
 from app.services.email_notifier import EmailNotifier
 from app.core.config import settings
 
 class TestNotifier(Notifier):
     """Test notifier implementation for testing factory"""
+    __test__ = False
+    
     async def send_notification(self, recipient, subject, content):
         return True
 
@@ -33,12 +38,12 @@ def test_notification_factory_default_registrations():
     assert isinstance(email_notifier, EmailNotifier)
 
 @pytest.mark.asyncio
-@patch('app.services.email_notifier.SMTP')
-async def test_email_notifier_send_notification(mock_smtp):
-    """Test email notification sending with mocked SMTP"""
+@patch('app.services.email_notifier.get_smtp_pool')
+async def test_email_notifier_send_notification(mock_get_pool):
+    """Test email notification sending with mocked SMTP pool"""
     # Setup mock
-    mock_smtp_instance = AsyncMock()
-    mock_smtp.return_value.__aenter__.return_value = mock_smtp_instance
+    mock_pool = AsyncMock()
+    mock_get_pool.return_value = mock_pool
     
     # Create notifier and send notification
     notifier = EmailNotifier()
@@ -50,16 +55,16 @@ async def test_email_notifier_send_notification(mock_smtp):
     
     # Verify SMTP was called correctly
     assert result is True
-    mock_smtp_instance.send_message.assert_called_once()
+    mock_pool.sendmail.assert_called_once()
 
 @pytest.mark.asyncio
-@patch('app.services.email_notifier.SMTP')
-async def test_email_notifier_handles_error(mock_smtp):
+@patch('app.services.email_notifier.get_smtp_pool')
+async def test_email_notifier_handles_error(mock_get_pool):
     """Test error handling in email notification"""
     # Setup mock to raise exception
-    mock_smtp_instance = AsyncMock()
-    mock_smtp_instance.send_message.side_effect = Exception("SMTP Error")
-    mock_smtp.return_value.__aenter__.return_value = mock_smtp_instance
+    mock_pool = AsyncMock()
+    mock_pool.sendmail.side_effect = Exception("SMTP Error")
+    mock_get_pool.return_value = mock_pool
     
     # Create notifier and attempt to send notification
     notifier = EmailNotifier()
@@ -88,6 +93,71 @@ def test_notification_scheduling():
     
     # Verify task was added
     background_tasks.add_task.assert_called_once()
-    # First arg should be the send_notification method
+    # First arg should be the notify method, which wraps send_notification with metrics
     args, _ = background_tasks.add_task.call_args
-    assert args[0] == notifier.send_notification
+    assert args[0] == notifier.notify
+
+
+class SlowNotifier(Notifier):
+    """Notifier that takes a while to deliver, tracking how many sends overlap"""
+    channel = "slow"
+    
+    def __init__(self, delay: float = 0.05, **kwargs):
+        super().__init__(**kwargs)
+        self.delay = delay
+        self.active = 0
+        self.max_active = 0
+    
+    async def send_notification(self, recipient, subject, content):
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        await asyncio.sleep(self.delay)
+        self.active -= 1
+        return True
+
+def test_factory_returns_one_instance_per_channel():
+    NotificationFactory.register_notifier("test", TestNotifier)
+    
+    assert NotificationFactory.get_notifier("test") is NotificationFactory.get_notifier("TEST")
+    assert NotificationFactory.get_notifier("email") is not NotificationFactory.get_notifier("sms")
+
+@pytest.mark.asyncio
+async def test_notifier_limits_concurrent_sends():
+    # Arrange
+    notifier = SlowNotifier(delay=0.01, concurrency=2, timeout=5)
+    
+    # Act
+    results = await asyncio.gather(*(notifier.notify(f"{i}@example.com", "Subject", {}) for i in range(6)))
+    
+    # Assert
+    assert all(results)
+    assert notifier.max_active == 2
+
+@pytest.mark.asyncio
+async def test_notify_times_out_slow_channel():
+    notifier = SlowNotifier(delay=1, timeout=0.01)
+    
+    with pytest.raises(NotificationTimeoutError):
+        await notifier.notify("a@example.com", "Subject", {})
+
+@pytest.mark.asyncio
+async def test_fan_out_isolates_slow_and_unknown_channels():
+    # Arrange
+    class TimingOutNotifier(SlowNotifier):
+        channel = "test-timing-out"
+        
+        def __init__(self):
+            super().__init__(delay=1, timeout=0.05)
+    
+    NotificationFactory.register_notifier("test-timing-out", TimingOutNotifier)
+    NotificationFactory.register_notifier("test", TestNotifier)
+    
+    # Act
+    delivered = await fan_out(
+        {"test": "a@example.com", "test-timing-out": "+1234567890", "pigeon": "roof"},
+        "Subject",
+        {}
+    )
+    
+    # Assert
+    assert delivered == {"test": True, "test-timing-out": False, "pigeon": False}
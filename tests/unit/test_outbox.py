@@ -0,0 +1,99 @@
+import pytest
+import pytest_asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from app.models.notification import NotificationOutbox
+from app.services import outbox
+from app.services.notifications import NotificationFactory, Notifier
+from app.services.outbox import OutboxDispatcher, enqueue_notification, retry_delay
+
+class FailingNotifier(Notifier):
+    """Notifier that reports every delivery as failed"""
+    async def send_notification(self, recipient, subject, content):
+        return False
+
+def make_notification(channel: str) -> NotificationOutbox:
+    return NotificationOutbox(
+        id=1,
+        channel=channel,
+        recipient="test@example.com",
+        subject="Test Subject",
+        content={"name": "Test User"},
+        attempts=0
+    )
+
+def test_enqueue_notification_adds_row_to_session():
+    db = MagicMock()
+    
+    notification = enqueue_notification(db, "EMAIL", "test@example.com", "Test Subject", {"name": "Test User"})
+    
+    db.add.assert_called_once_with(notification)
+    assert notification.channel == "email"
+
+def test_retry_delay_grows_exponentially_up_to_maximum():
+    assert 2.5 <= retry_delay(1, base=5, maximum=60) <= 5
+    assert 10 <= retry_delay(3, base=5, maximum=60) <= 20
+    assert 30 <= retry_delay(10, base=5, maximum=60) <= 60
+
+@pytest.mark.asyncio
+async def test_dispatcher_delivery_outcomes():
+    NotificationFactory.register_notifier("failing", FailingNotifier)
+    dispatcher = OutboxDispatcher(session_factory=None)
+    
+    # Successful delivery has no error
+    sms = make_notification("sms")
+    assert await dispatcher._deliver(sms) is None
+    
+    # Failed deliveries and unknown channels are reported as errors instead of raising
+    assert await dispatcher._deliver(make_notification("failing")) is not None
+    assert "No notifier found" in await dispatcher._deliver(make_notification("pigeon"))
+
+@pytest.mark.asyncio
+async def test_dispatcher_run_stops_when_outbox_is_drained():
+    dispatcher = OutboxDispatcher(session_factory=None, poll_interval=0.01)
+    
+    async def process_batch():
+        dispatcher.stop()
+        return 0
+    dispatcher.process_batch = AsyncMock(side_effect=process_batch)
+    
+    await dispatcher.run()
+    
+    dispatcher.process_batch.assert_called_once()
+
+@pytest_asyncio.fixture
+async def outbox_sessions(monkeypatch):
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    async with engine.begin() as conn:
+        await conn.run_sync(NotificationOutbox.__table__.create)
+    # TIMESTAMPADD is MySQL only
+    monkeypatch.setattr(outbox, "_seconds_from_now", lambda seconds: func.datetime("now", f"+{int(seconds)} seconds"))
+    yield async_sessionmaker(engine, expire_on_commit=False)
+    await engine.dispose()
+
+@pytest.mark.asyncio
+async def test_dispatcher_counts_each_failed_attempt_once(outbox_sessions):
+    # Arrange
+    NotificationFactory.register_notifier("failing", FailingNotifier)
+    async with outbox_sessions() as session, session.begin():
+        enqueue_notification(session, "failing", "test@example.com", "Test Subject", {"name": "Test User"})
+    dispatcher = OutboxDispatcher(session_factory=outbox_sessions, max_attempts=2)
+    
+    # Act: fail the first attempt, then make the row due again and fail the second
+    await dispatcher.process_batch()
+    async with outbox_sessions() as session:
+        first = await session.scalar(select(NotificationOutbox))
+    async with outbox_sessions() as session, session.begin():
+        await session.execute(update(NotificationOutbox).values(available_at=func.datetime("now", "-1 seconds")))
+    await dispatcher.process_batch()
+    async with outbox_sessions() as session:
+        second = await session.scalar(select(NotificationOutbox))
+    
+    # Assert
+    assert (first.attempts, first.status) == (1, NotificationOutbox.STATUS_PENDING)
+    assert first.locked_until is None and first.last_error
+    assert (second.attempts, second.status) == (2, NotificationOutbox.STATUS_FAILED)
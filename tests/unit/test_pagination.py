@@ -0,0 +1,118 @@
+import uuid
+from datetime import datetime, timedelta
+
+import httpx
+import pytest
+import pytest_asyncio
+from fastapi import HTTPException
+from sqlalchemy import event, insert
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from app.db.base import get_read_db
+from app.main import app
+from app.models.patient import Patient
+from app.utils.pagination import decode_cursor, encode_cursor
+from app.utils.uuid7 import uuid7
+
+START = datetime(2025, 3, 1, 12, 0, 0)
+
+def test_cursor_round_trip():
+    created_at = datetime(2025, 3, 1, 15, 19, 59)
+    patient_id = uuid.uuid4().bytes
+    
+    cursor = encode_cursor(created_at, patient_id)
+    
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == (created_at, patient_id)
+
+@pytest.mark.parametrize("cursor", ["garbage", "", "eyJjIjoxfQ"])
+def test_invalid_cursor_rejected(cursor):
+    with pytest.raises(HTTPException) as exc_info:
+        decode_cursor(cursor)
+    
+    assert exc_info.value.status_code == 400
+
+@pytest_asyncio.fixture
+async def patients_client():
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    async with engine.begin() as conn:
+        await conn.run_sync(Patient.__table__.create)
+        # Three patients per second, so pages have to break ties on id
+        await conn.execute(insert(Patient), [
+            {
+                "id": uuid7().bytes,
+                "name": f"Patient {i}",
+                "email": f"patient{i}@example.com",
+                "phone_number": "+1234567890",
+                "document_photo_filename": "document.jpg",
+                "document_photo_content_type": "image/jpeg",
+                "document_photo_sha256": "0" * 64,
+                "document_photo_size": 100,
+                "created_at": START + timedelta(seconds=i // 3),
+                "updated_at": START
+            }
+            for i in range(10)
+        ])
+    
+    statements = []
+    event.listen(engine.sync_engine, "before_cursor_execute",
+                 lambda conn, cursor, statement, *args: statements.append(statement))
+    sessions = async_sessionmaker(engine, expire_on_commit=False)
+    
+    async def read_db():
+        async with sessions() as session:
+            yield session
+    
+    app.dependency_overrides[get_read_db] = read_db
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        yield client, statements
+    app.dependency_overrides.pop(get_read_db, None)
+    await engine.dispose()
+
+async def list_all(client, **params):
+    pages, cursor = [], None
+    while True:
+        response = await client.get("/api/patients/", params={**params, **({"cursor": cursor} if cursor else {})})
+        assert response.status_code == 200
+        pages.append(response.json()["items"])
+        cursor = response.json()["next_cursor"]
+        if cursor is None:
+            return pages
+
+@pytest.mark.asyncio
+async def test_list_patients_pages_through_ties_without_gaps_or_duplicates(patients_client):
+    # Arrange
+    client, statements = patients_client
+    
+    # Act
+    pages = await list_all(client, limit=2)
+    
+    # Assert
+    emails = [item["email"] for page in pages for item in page]
+    assert [len(page) for page in pages] == [2, 2, 2, 2, 2]
+    assert sorted(emails) == sorted(f"patient{i}@example.com" for i in range(10))
+    assert len(set(emails)) == 10
+    created = [item["created_at"] for page in pages for item in page]
+    assert created == sorted(created, reverse=True)
+    # Listing reads the projected columns of patients only, never the documents
+    assert all("patient_documents" not in statement for statement in statements)
+    assert all("document_photo_sha256" not in statement for statement in statements)
+
+@pytest.mark.asyncio
+async def test_list_patients_filters_by_creation_time(patients_client):
+    # Arrange
+    client, _ = patients_client
+    
+    # Act: seconds 1 and 2 hold patients 3 to 8
+    pages = await list_all(
+        client,
+        limit=4,
+        created_after=(START + timedelta(seconds=1)).isoformat(),
+        created_before=(START + timedelta(seconds=3)).isoformat()
+    )
+    
+    # Assert
+    emails = {item["email"] for page in pages for item in page}
+    assert emails == {f"patient{i}@example.com" for i in range(3, 9)}
+    assert [len(page) for page in pages] == [4, 2]
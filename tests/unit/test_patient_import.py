@@ -0,0 +1,113 @@
+import io
+import zipfile
+from pathlib import Path
+from tempfile import SpooledTemporaryFile
+
+import pytest
+from fastapi import UploadFile
+from starlette.datastructures import Headers
+
+from app.schemas.patient import PatientImportRowResult
+from app.services.file_handling import FileProcessingService
+from app.services.patient_import import PatientImportService, aiter_manifest_rows, iter_manifest_rows
+
+TEST_IMAGE = Path(__file__).parent.parent / "test_data" / "test_image.jpg"
+
+def make_upload(content: bytes, filename: str, content_type: str) -> UploadFile:
+    return UploadFile(file=io.BytesIO(content), filename=filename, headers=Headers({"content-type": content_type}))
+
+@pytest.fixture
+def archive():
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as zf:
+        zf.writestr("docs/jane.jpg", TEST_IMAGE.read_bytes())
+        zf.writestr("docs/fake.jpg", b"%PDF-1.4 not really a jpeg")
+    buffer.seek(0)
+    return zipfile.ZipFile(buffer)
+
+def test_iter_manifest_rows_ndjson():
+    manifest = make_upload(
+        b'{"name": "Jane Doe", "email": "jane@example.com"}\n\nnot json\n[1, 2]\n',
+        "patients.ndjson",
+        "application/x-ndjson"
+    )
+    
+    rows = list(iter_manifest_rows(manifest))
+    
+    assert rows == [(1, {"name": "Jane Doe", "email": "jane@example.com"}), (2, None), (3, None)]
+
+def test_iter_manifest_rows_csv():
+    manifest = make_upload(
+        b"name,email,phone_number,document\r\nJane Doe,jane@example.com,+1234567890,docs/jane.jpg\r\n",
+        "patients.csv",
+        "text/csv"
+    )
+    
+    rows = list(iter_manifest_rows(manifest))
+    
+    assert rows == [(1, {
+        "name": "Jane Doe",
+        "email": "jane@example.com",
+        "phone_number": "+1234567890",
+        "document": "docs/jane.jpg"
+    })]
+
+@pytest.mark.asyncio
+async def test_aiter_manifest_rows_reads_spooled_manifest_in_batches():
+    # Arrange: a manifest spooled to disk, like large uploads
+    spooled = SpooledTemporaryFile(max_size=16)
+    spooled.write(b"".join(b'{"email": "patient%d@example.com"}\n' % i for i in range(5)))
+    spooled.seek(0)
+    manifest = UploadFile(file=spooled, filename="patients.ndjson", headers=Headers({"content-type": "application/x-ndjson"}))
+    
+    # Act
+    rows = [row async for row in aiter_manifest_rows(manifest, rows_per_read=2)]
+    await manifest.close()
+    
+    # Assert
+    assert [number for number, _ in rows] == [1, 2, 3, 4, 5]
+    assert rows[-1][1] == {"email": "patient4@example.com"}
+
+def test_open_archive_reads_spooled_upload():
+    # Arrange
+    spooled = SpooledTemporaryFile(max_size=1024 * 1024)
+    with zipfile.ZipFile(spooled, "w") as zf:
+        zf.writestr("docs/jane.jpg", TEST_IMAGE.read_bytes())
+    spooled.seek(0)
+    documents = UploadFile(file=spooled, filename="documents.zip")
+    
+    # Act
+    with PatientImportService._open_archive(documents) as archive:
+        names = archive.namelist()
+    spooled.close()
+    
+    # Assert
+    assert names == ["docs/jane.jpg"]
+
+@pytest.mark.asyncio
+async def test_prepare_row_validates_patient_and_document(archive):
+    service = PatientImportService(FileProcessingService())
+    seen_emails = set()
+    row = {"name": "Jane Doe", "email": "jane@example.com", "phone_number": "+1234567890", "document": "docs/jane.jpg"}
+    
+    # Valid row is prepared for insertion
+    prepared = await service._prepare_row(archive, 1, row, seen_emails)
+    assert not isinstance(prepared, PatientImportRowResult)
+    assert prepared.values["document_photo_content_type"] == "image/jpeg"
+    assert prepared.content == TEST_IMAGE.read_bytes()
+    
+    # Same email again in the manifest is rejected
+    rejected = await service._prepare_row(archive, 2, row, seen_emails)
+    assert rejected.status == "rejected"
+    assert "Duplicate email" in rejected.error
+    
+    # Document content not matching its type is rejected by the validator chain
+    rejected = await service._prepare_row(archive, 3, {**row, "email": "john@example.com", "document": "docs/fake.jpg"}, seen_emails)
+    assert rejected.status == "rejected"
+    assert "doesn't match declared type" in rejected.error
+    
+    # Missing document and invalid patient data are reported too
+    rejected = await service._prepare_row(archive, 4, {**row, "email": "jim@example.com", "document": "missing.jpg"}, seen_emails)
+    assert "not found in archive" in rejected.error
+    rejected = await service._prepare_row(archive, 5, {**row, "phone_number": "abc"}, seen_emails)
+    assert "phone_number" in rejected.error
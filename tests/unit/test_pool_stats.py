@@ -0,0 +1,53 @@
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.db.pool_stats import PoolStatistics, instrumented_pool_class
+from app.utils.stats import Histogram
+
+def test_histogram_cumulative_buckets():
+    histogram = Histogram(buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 2.0):
+        histogram.observe(value)
+    
+    snapshot = histogram.snapshot()
+    
+    assert snapshot["count"] == 4
+    assert snapshot["sum"] == pytest.approx(2.65)
+    assert snapshot["buckets"] == {"0.1": 2, "1": 3, "+Inf": 4}
+
+@pytest.mark.asyncio
+async def test_pool_statistics_track_checkouts_and_lifetimes():
+    stats = PoolStatistics()
+    engine = create_async_engine(
+        "sqlite+aiosqlite://",
+        poolclass=instrumented_pool_class(stats),
+        pool_size=2,
+        max_overflow=1
+    )
+    stats.attach(engine)
+    
+    async with engine.connect() as first, engine.connect() as second:
+        await first.execute(text("SELECT 1"))
+        await second.execute(text("SELECT 1"))
+        snapshot = stats.snapshot()
+        assert snapshot["checked_out"] == 2
+        assert snapshot["size"] == 2
+    
+    await engine.dispose()
+    snapshot = stats.snapshot()
+    
+    assert snapshot["checked_out"] == 0
+    assert snapshot["checkouts"] == 2
+    assert snapshot["connections_opened"] == 2
+    assert snapshot["checkout_wait_seconds"]["count"] == 2
+    assert snapshot["connection_lifetime_seconds"]["count"] == 2
+
+@pytest.mark.asyncio
+async def test_instrumented_pool_logs_under_sqlalchemy():
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=instrumented_pool_class(PoolStatistics()))
+    
+    logger_name = engine.sync_engine.pool.logger.name
+    
+    assert logger_name.startswith("sqlalchemy.pool.")
+    await engine.dispose()
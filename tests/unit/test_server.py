@@ -0,0 +1,98 @@
+import signal
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from sqlalchemy.util import greenlet_spawn
+
+from app import gunicorn_conf
+from app.db import base
+from app.middleware import worker_recycle
+from app.middleware.worker_recycle import WorkerRecycleMiddleware, resident_memory_bytes
+
+def test_one_worker_per_core_by_default(monkeypatch):
+    monkeypatch.setattr(gunicorn_conf.settings, "SERVER_WORKERS", 0)
+    monkeypatch.setattr(gunicorn_conf, "available_cores", lambda: 6)
+    
+    assert gunicorn_conf.worker_count() == 6
+    
+    monkeypatch.setattr(gunicorn_conf.settings, "SERVER_WORKERS", 2)
+    assert gunicorn_conf.worker_count() == 2
+
+def test_resident_memory_is_measured():
+    assert resident_memory_bytes() > 1024 * 1024
+
+def recycle_app(memory_used: int, **kwargs):
+    app = FastAPI()
+    
+    @app.get("/")
+    async def root():
+        return {}
+    
+    middleware = WorkerRecycleMiddleware(app, memory_usage=lambda: memory_used, **kwargs)
+    return middleware, httpx.AsyncClient(transport=httpx.ASGITransport(app=middleware), base_url="http://test")
+
+@pytest.mark.asyncio
+async def test_worker_over_memory_limit_is_stopped_gracefully(monkeypatch):
+    # Arrange
+    signals = []
+    monkeypatch.setattr(worker_recycle.os, "kill", lambda pid, sig: signals.append(sig))
+    middleware, client = recycle_app(memory_used=300, max_memory_bytes=200, check_interval=2)
+    
+    # Act
+    async with client:
+        first = await client.get("/")
+        assert signals == []
+        for _ in range(3):
+            await client.get("/")
+    
+    # Assert: checked on the second request, requests keep being served until the worker stops
+    assert first.status_code == 200
+    assert signals == [signal.SIGTERM]
+    assert middleware.recycling
+
+@pytest.mark.asyncio
+async def test_worker_under_memory_limit_keeps_running(monkeypatch):
+    signals = []
+    monkeypatch.setattr(worker_recycle.os, "kill", lambda pid, sig: signals.append(sig))
+    _, client = recycle_app(memory_used=100, max_memory_bytes=200, check_interval=1)
+    
+    async with client:
+        for _ in range(3):
+            await client.get("/")
+    
+    assert signals == []
+
+@pytest.mark.asyncio
+async def test_memory_limit_of_zero_disables_recycling(monkeypatch):
+    signals = []
+    monkeypatch.setattr(worker_recycle.os, "kill", lambda pid, sig: signals.append(sig))
+    middleware, client = recycle_app(memory_used=10 ** 12, max_memory_bytes=0, check_interval=1)
+    
+    async with client:
+        await client.get("/")
+    
+    assert signals == []
+    assert middleware.requests == 0
+
+@pytest.mark.asyncio
+async def test_forked_worker_gets_its_own_pool(monkeypatch):
+    # Arrange: a pool with a connection opened by the "parent"
+    engine = create_async_engine("sqlite+aiosqlite:///file:fork?mode=memory&uri=true", poolclass=AsyncAdaptedQueuePool)
+    monkeypatch.setattr(base, "_engine", engine)
+    async with engine.connect():
+        pass
+    inherited_pool = engine.sync_engine.pool
+    assert inherited_pool.checkedin() == 1
+    
+    # Act
+    base.dispose_engines_after_fork()
+    
+    # Assert
+    assert engine.sync_engine.pool is not inherited_pool
+    assert engine.sync_engine.pool.checkedin() == 0
+    # Only the parent may close its connections
+    await greenlet_spawn(inherited_pool.dispose)
+    await engine.dispose()
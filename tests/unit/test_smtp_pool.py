@@ -0,0 +1,88 @@
+import socket
+from email.message import EmailMessage
+
+import pytest
+import pytest_asyncio
+from aiosmtpd.controller import Controller
+
+from app.services.smtp_pool import SMTPConnectionPool
+
+class RecordingHandler:
+    """aiosmtpd handler that records which connection delivered each message"""
+    def __init__(self):
+        self.peers = []
+    
+    async def handle_DATA(self, server, session, envelope):
+        self.peers.append(session.peer)
+        return "250 Message accepted for delivery"
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def make_message(recipient: str) -> EmailMessage:
+    message = EmailMessage()
+    message["Subject"] = "Test Subject"
+    message["From"] = "sender@example.com"
+    message["To"] = recipient
+    message.set_content("Hello world")
+    return message
+
+@pytest.fixture
+def smtp_server():
+    handler = RecordingHandler()
+    controller = Controller(handler, hostname="127.0.0.1", port=free_port())
+    controller.start()
+    yield controller, handler
+    controller.stop()
+
+@pytest_asyncio.fixture
+async def pool(smtp_server):
+    controller, _ = smtp_server
+    pool = SMTPConnectionPool(controller.hostname, controller.port, start_tls=False, size=2)
+    yield pool
+    await pool.close()
+
+@pytest.mark.asyncio
+async def test_pool_reuses_connection_across_sends(pool, smtp_server):
+    _, handler = smtp_server
+    
+    for i in range(5):
+        await pool.send_message(make_message(f"patient{i}@example.com"))
+    
+    # All messages went over the same warm connection
+    assert len(handler.peers) == 5
+    assert len(set(handler.peers)) == 1
+
+@pytest.mark.asyncio
+async def test_pool_reconnects_after_connection_is_lost(pool, smtp_server):
+    _, handler = smtp_server
+    await pool.send_message(make_message("first@example.com"))
+    
+    # Simulate the server dropping the idle connection
+    smtp, _ = pool._idle[0]
+    smtp.close()
+    
+    await pool.send_message(make_message("second@example.com"))
+    
+    assert len(handler.peers) == 2
+    assert handler.peers[0] != handler.peers[1]
+
+@pytest.mark.asyncio
+async def test_pool_drops_connections_idle_for_too_long(pool, smtp_server):
+    _, handler = smtp_server
+    pool.idle_timeout = 0
+    
+    await pool.send_message(make_message("first@example.com"))
+    await pool.send_message(make_message("second@example.com"))
+    
+    assert handler.peers[0] != handler.peers[1]
+
+@pytest.mark.asyncio
+async def test_pool_sends_serialized_messages(pool, smtp_server):
+    _, handler = smtp_server
+    
+    await pool.sendmail("sender@example.com", ["patient@example.com"], make_message("patient@example.com").as_bytes())
+    
+    assert len(handler.peers) == 1
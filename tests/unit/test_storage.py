@@ -0,0 +1,69 @@
+import pytest
+
+from app.errors.storage import DocumentNotFoundError, NoStorageBackendError
+from app.services.storage import DocumentStorageFactory, LocalDocumentStorage, content_hash
+
+@pytest.fixture
+def storage(tmp_path):
+    return LocalDocumentStorage(root=str(tmp_path))
+
+@pytest.mark.asyncio
+async def test_local_storage_round_trip(storage):
+    # Arrange
+    content = b"%PDF-1.4 test document"
+    key = content_hash(content)
+    
+    # Act
+    await storage.save(key, content)
+    
+    # Assert
+    assert await storage.exists(key) is True
+    assert await storage.load(key) == content
+    assert storage.path_for(key).parent.parent.parent == storage.root
+
+@pytest.mark.asyncio
+async def test_local_storage_deduplicates_identical_content(storage, tmp_path):
+    # Arrange
+    content = b"same bytes uploaded twice"
+    key = content_hash(content)
+    
+    # Act
+    await storage.save(key, content)
+    await storage.save(key, content)
+    
+    # Assert - a single file, no leftover temporary files
+    stored_files = [p for p in tmp_path.rglob("*") if p.is_file()]
+    assert stored_files == [storage.path_for(key)]
+
+@pytest.mark.asyncio
+async def test_local_storage_missing_document(storage):
+    key = content_hash(b"never stored")
+    
+    assert await storage.exists(key) is False
+    with pytest.raises(DocumentNotFoundError):
+        await storage.load(key)
+    
+    # Deleting a missing document is a no-op
+    await storage.delete(key)
+
+@pytest.mark.asyncio
+async def test_local_storage_streams_byte_range(storage):
+    # Arrange
+    content = bytes(range(256)) * 10
+    key = content_hash(content)
+    await storage.save(key, content)
+    
+    # Act
+    full = [chunk async for chunk in storage.stream(key, chunk_size=1000)]
+    partial = [chunk async for chunk in storage.stream(key, 100, 2099, chunk_size=1000)]
+    
+    # Assert
+    assert b"".join(full) == content
+    assert [len(chunk) for chunk in full] == [1000, 1000, 560]
+    assert b"".join(partial) == content[100:2100]
+
+def test_storage_factory_default_registrations():
+    assert isinstance(DocumentStorageFactory.get_storage("local"), LocalDocumentStorage)
+    
+    with pytest.raises(NoStorageBackendError):
+        DocumentStorageFactory.get_storage("nonexistent")
@@ -0,0 +1,65 @@
+import io
+
+from PIL import Image
+
+from app.services.thumbnails import ThumbnailCache
+from app.utils import thumbnails
+from app.utils.thumbnails import render_thumbnails
+
+def _image_bytes(size, mode="RGB", format="JPEG"):
+    buffer = io.BytesIO()
+    Image.new(mode, size, (200, 30, 30, 128) if mode == "RGBA" else (200, 30, 30)).save(buffer, format)
+    return buffer.getvalue()
+
+def test_render_thumbnails_fits_each_size():
+    # Arrange
+    content = _image_bytes((2000, 1000))
+    
+    # Act
+    result = render_thumbnails(content, "image/jpeg", [512, 128])
+    
+    # Assert
+    assert sorted(result) == [128, 512]
+    assert Image.open(io.BytesIO(result[512])).size == (512, 256)
+    assert Image.open(io.BytesIO(result[128])).size == (128, 64)
+    assert Image.open(io.BytesIO(result[128])).format == "JPEG"
+
+def test_render_thumbnails_flattens_transparency():
+    content = _image_bytes((300, 300), mode="RGBA", format="PNG")
+    
+    result = render_thumbnails(content, "image/png", [128])
+    
+    assert Image.open(io.BytesIO(result[128])).mode == "RGB"
+
+def test_pdf_without_renderer_has_no_thumbnails(monkeypatch):
+    monkeypatch.setattr(thumbnails, "fitz", None)
+    
+    assert render_thumbnails(b"%PDF-1.4", "application/pdf", [128]) == {}
+
+def test_malformed_pdf_has_no_thumbnails(monkeypatch):
+    class BrokenRenderer:
+        @staticmethod
+        def open(stream, filetype):
+            raise RuntimeError("cannot open broken document")
+    monkeypatch.setattr(thumbnails, "fitz", BrokenRenderer)
+    
+    assert render_thumbnails(b"%PDF-1.4 truncated", "application/pdf", [128]) == {}
+
+def test_thumbnail_cache_evicts_least_recently_used():
+    # Arrange
+    cache = ThumbnailCache(max_bytes=10)
+    cache.put(("a", 128), b"1234")
+    cache.put(("b", 128), b"1234")
+    
+    # Act - touching "a" makes "b" the eviction candidate
+    cache.get(("a", 128))
+    cache.put(("c", 128), b"1234")
+    
+    # Assert
+    assert cache.get(("b", 128)) is None
+    assert cache.get(("a", 128)) == b"1234"
+    assert cache.size_bytes == 8
+    assert len(cache) == 2
+
+def test_unreadable_image_has_no_thumbnails():
+    assert render_thumbnails(b"\xff\xd8\xff\xe0 not really a jpeg", "image/jpeg", [128]) == {}
@@ -0,0 +1,52 @@
+import uuid
+from datetime import datetime, timezone
+
+from app.models.patient import Patient
+from app.utils import uuid7 as uuid7_module
+from app.utils.uuid7 import uuid7, uuid7_at, uuid7_timestamp
+
+def test_uuid7_version_and_variant():
+    value = uuid7()
+    
+    assert value.version == 7
+    assert value.variant == uuid.RFC_4122
+
+def test_uuid7_is_strictly_increasing_within_a_millisecond(monkeypatch):
+    # Arrange: a frozen clock
+    monkeypatch.setattr(uuid7_module.time, "time_ns", lambda: 1_700_000_000_000_000_000)
+    
+    # Act: more keys than fit in one millisecond's counter
+    values = [uuid7() for _ in range(5000)]
+    
+    # Assert
+    assert values == sorted(values)
+    assert len(set(values)) == len(values)
+
+def test_uuid7_stays_increasing_when_the_clock_steps_back(monkeypatch):
+    now = [1_700_000_000_000_000_000]
+    monkeypatch.setattr(uuid7_module.time, "time_ns", lambda: now[0])
+    first = uuid7()
+    
+    now[0] -= 5_000_000_000
+    second = uuid7()
+    
+    assert second > first
+
+def test_uuid7_at_embeds_the_given_time():
+    created_at = datetime(2024, 1, 1, 12, 30, 15, 250000)
+    
+    value = uuid7_at(created_at)
+    
+    assert value.version == 7
+    assert uuid7_timestamp(value) == created_at.replace(tzinfo=timezone.utc)
+    assert uuid7_at(datetime(2024, 1, 1, 12, 30, 16)) > value
+
+def test_uuid7_timestamp_of_other_versions_is_none():
+    assert uuid7_timestamp(uuid.uuid4()) is None
+
+def test_patient_ids_are_uuid7():
+    id_column = Patient.__table__.c.id
+    
+    patient = Patient(id=id_column.default.arg(None))
+    
+    assert patient.id_as_uuid.version == 7
@@ -1,9 +1,15 @@
 import pytest
 from io import BytesIO
+from pathlib import Path
+
+from fastapi import HTTPException
 
 from app.services.file_handling.validators.file_size import FileSizeValidator
 from app.services.file_handling.validators.content_type import ContentTypeValidator
-from app.services.file_handling.validators.magic_number import MagicNumberValidator
+from app.services.file_handling.validators.magic_number import MAGIC_HEADER_BYTES, MagicNumberValidator
+from app.services.file_handling.validators.timings import validation_timings
+from app.services.file_handling.validators import build_validator_chain
+from app.services.file_handling.service import FileProcessingService
 
 # Create a mock UploadFile for testing
 class MockUploadFile:
@@ -11,10 +17,14 @@ class MockUploadFile:
         self.file = BytesIO(content)
         self.content_type = content_type
         self.filename = filename
+        self.size = len(content)
+        
+        self.bytes_read = 0
         
-    async def read(self):
-        self.file.seek(0)
-        return self.file.read()
+    async def read(self, size: int = -1):
+        data = self.file.read(size)
+        self.bytes_read += len(data)
+        return data
         
     async def seek(self, position):
         self.file.seek(position)
@@ -91,3 +101,176 @@ async def test_magic_number_validator(create_upload_file):
     is_valid, message = await validator._validate(invalid_file, jpeg_header)
     assert is_valid is False
     assert "doesn't match declared type" in message
+
+@pytest.mark.asyncio
+async def test_file_size_validator_chunk_rejects_once_limit_is_crossed(create_upload_file):
+    # Arrange
+    file = create_upload_file(b"", "text/plain", "test.txt")
+    validator = FileSizeValidator(max_size_bytes=100)
+    
+    # Act & Assert - Running total still under the limit
+    is_valid, _ = await validator._validate_chunk(file, b"x" * 60, 0)
+    assert is_valid is True
+    
+    # Act & Assert - Second chunk pushes the running total over the limit
+    is_valid, message = await validator._validate_chunk(file, b"x" * 60, 60)
+    assert is_valid is False
+    assert "exceeds maximum size" in message
+
+@pytest.mark.asyncio
+async def test_magic_number_validator_chunk_only_sniffs_first_chunk(create_upload_file):
+    # Arrange
+    jpeg_header = b"\xff\xd8\xff\xe0\x00\x10JFIF\x00\x01\x01\x01\x00H\x00H\x00\x00\xff\xdb\x00C"
+    file = create_upload_file(jpeg_header, "image/png", "fake.png")
+    validator = MagicNumberValidator()
+    
+    # Act & Assert - Header chunk is sniffed and rejected
+    is_valid, message = await validator._validate_chunk(file, jpeg_header, 0)
+    assert is_valid is False
+    assert "doesn't match declared type" in message
+    
+    # Act & Assert - Later chunks are not sniffed
+    is_valid, _ = await validator._validate_chunk(file, b"random bytes", 1024)
+    assert is_valid is True
+
+@pytest.mark.asyncio
+async def test_stream_document_returns_content(create_upload_file):
+    # Arrange
+    content = (Path(__file__).parent.parent / "test_data" / "test_image.jpg").read_bytes()
+    file = create_upload_file(content, "image/jpeg", "test_image.jpg")
+    service = FileProcessingService(chunk_size=1024)
+    
+    # Act
+    result = await service.stream_document(file)
+    
+    # Assert
+    assert result == content
+
+@pytest.mark.asyncio
+async def test_stream_document_aborts_oversized_upload_early(create_upload_file):
+    # Arrange - JPEG header followed by far more data than allowed
+    jpeg_header = b"\xff\xd8\xff\xe0\x00\x10JFIF\x00\x01\x01\x01\x00H\x00H\x00\x00\xff\xdb\x00C"
+    content = jpeg_header + b"\x00" * (2 * 1024 * 1024)
+    file = create_upload_file(content, "image/jpeg", "big.jpg")
+    service = FileProcessingService(chunk_size=64 * 1024)
+    service.validator_chain = MagicNumberValidator(FileSizeValidator(max_size_bytes=100 * 1024))
+    
+    # Act & Assert
+    with pytest.raises(HTTPException) as exc_info:
+        await service.stream_document(file)
+    
+    assert exc_info.value.status_code == 400
+    assert file.bytes_read < len(content)
+
+@pytest.mark.asyncio
+async def test_stream_document_rejects_mistyped_upload_after_first_chunk(create_upload_file):
+    # Arrange - PDF content declared as a JPEG
+    content = b"%PDF-1.4\n" + b"0" * (1024 * 1024)
+    file = create_upload_file(content, "image/jpeg", "fake.jpg")
+    service = FileProcessingService(chunk_size=4096)
+    
+    # Act & Assert
+    with pytest.raises(HTTPException):
+        await service.stream_document(file)
+    
+    assert file.bytes_read == 4096
+
+@pytest.mark.asyncio
+async def test_stream_document_runs_header_checks_once(create_upload_file):
+    # Arrange - upload of unknown size, read chunk by chunk
+    validation_timings.clear()
+    content = (Path(__file__).parent.parent / "test_data" / "test_image.jpg").read_bytes()
+    file = create_upload_file(content, "image/jpeg", "test_image.jpg")
+    file.size = None
+    service = FileProcessingService(chunk_size=16)
+    
+    # Act
+    result = await service.stream_document(file)
+    
+    # Assert: the size is checked on every chunk, the type and magic number only on the first
+    chunks = -(-len(content) // 16)
+    snapshot = validation_timings.snapshot()
+    assert result == content
+    assert snapshot["FileSizeValidator"]["count"] == chunks > 1
+    assert snapshot["ContentTypeValidator"]["count"] == snapshot["MagicNumberValidator"]["count"] == 1
+
+@pytest.mark.asyncio
+async def test_stream_document_checks_known_size_before_reading_the_rest(create_upload_file):
+    # Arrange
+    validation_timings.clear()
+    content = (Path(__file__).parent.parent / "test_data" / "test_image.jpg").read_bytes()
+    file = create_upload_file(content, "image/jpeg", "test_image.jpg")
+    service = FileProcessingService(chunk_size=16)
+    
+    # Act
+    result = await service.stream_document(file)
+    
+    # Assert: the header chunk and the declared size are checked, then the document is read at once
+    assert type(result) is bytes and result == content
+    assert validation_timings.snapshot()["FileSizeValidator"]["count"] == 2
+    assert file.bytes_read == 16 + len(content)
+    assert file.file.tell() == 0
+
+def test_build_validator_chain_runs_cheapest_first():
+    # Arrange
+    magic_validator = MagicNumberValidator()
+    size_validator = FileSizeValidator(max_size_bytes=100)
+    content_type_validator = ContentTypeValidator({"image/jpeg"})
+    
+    # Act
+    chain = build_validator_chain(magic_validator, size_validator, content_type_validator)
+    
+    # Assert
+    assert chain is content_type_validator
+    assert content_type_validator.next_validator is size_validator
+    assert size_validator.next_validator is magic_validator
+    assert magic_validator.next_validator is None
+
+@pytest.mark.asyncio
+async def test_magic_number_validator_only_sniffs_header(create_upload_file, monkeypatch):
+    # Arrange
+    sniffed = []
+    def fake_from_buffer(buffer, mime):
+        sniffed.append(len(buffer))
+        return "image/jpeg"
+    monkeypatch.setattr("app.services.file_handling.validators.magic_number.magic.from_buffer", fake_from_buffer)
+    content = b"\xff\xd8\xff" + b"\x00" * (1024 * 1024)
+    file = create_upload_file(content, "image/jpeg", "big.jpg")
+    
+    # Act
+    is_valid, _ = await MagicNumberValidator()._validate(file, content)
+    
+    # Assert
+    assert is_valid is True
+    assert sniffed == [MAGIC_HEADER_BYTES]
+
+@pytest.mark.asyncio
+async def test_validation_records_per_validator_timings(create_upload_file):
+    # Arrange
+    validation_timings.clear()
+    file = create_upload_file(b"content", "text/plain", "test.txt")
+    chain = build_validator_chain(ContentTypeValidator({"text/plain"}), FileSizeValidator(max_size_bytes=100))
+    
+    # Act
+    await chain.validate(file, b"content")
+    
+    # Assert
+    snapshot = validation_timings.snapshot()
+    assert snapshot["ContentTypeValidator"]["count"] == 1
+    assert snapshot["FileSizeValidator"]["count"] == 1
+
+@pytest.mark.asyncio
+async def test_warm_up_loads_libmagic_once_for_the_chain(monkeypatch):
+    # Arrange
+    sniffed = []
+    def fake_from_buffer(buffer, mime):
+        sniffed.append(buffer)
+        return "application/pdf"
+    monkeypatch.setattr("app.services.file_handling.validators.magic_number.magic.from_buffer", fake_from_buffer)
+    service = FileProcessingService()
+    
+    # Act
+    await service.warm_up()
+    
+    # Assert
+    assert len(sniffed) == 1
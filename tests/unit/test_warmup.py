@@ -0,0 +1,98 @@
+import httpx
+import pytest
+from fastapi import FastAPI
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.api.endpoints import health
+from app.db import base
+from app.db.pool_stats import PoolStatistics, instrumented_pool_class
+from app.services.warmup import FAILED, READY, WarmUp
+
+@pytest.mark.asyncio
+async def test_failed_steps_are_retried_until_ready():
+    # Arrange: the database comes up on the third attempt
+    attempts = []
+    
+    async def connect():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise ConnectionRefusedError("Connection refused")
+    
+    async def load_templates():
+        pass
+    
+    warm_up = WarmUp(retry_initial=0.001, retry_max=0.002)
+    warm_up.add("database_pool", connect)
+    warm_up.add("email_templates", load_templates)
+    
+    # Act
+    await warm_up.run()
+    
+    # Assert
+    assert len(attempts) == 3
+    assert warm_up.ready
+    assert warm_up.snapshot()["steps"] == {"database_pool": {"status": READY}, "email_templates": {"status": READY}}
+
+def test_not_ready_before_warm_up_or_while_stopping():
+    warm_up = WarmUp(retry_initial=0.001, retry_max=0.002)
+    assert not warm_up.ready
+    
+    warm_up._ready_after = 0.1
+    assert warm_up.ready
+    
+    warm_up.stopping = True
+    assert not warm_up.ready
+
+@pytest.mark.asyncio
+async def test_readiness_endpoint_reports_failed_steps(monkeypatch):
+    # Arrange
+    warm_up = WarmUp(retry_initial=0.001, retry_max=0.002)
+    warm_up.add("database_pool", None)
+    warm_up.status["database_pool"] = FAILED
+    warm_up.errors["database_pool"] = "Connection refused"
+    monkeypatch.setattr(health, "warm_up", warm_up)
+    app = FastAPI()
+    app.include_router(health.router)
+    
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        # Act
+        not_ready = await client.get("/health/ready")
+        warm_up._ready_after = 0.1
+        ready = await client.get("/health/ready")
+        live = await client.get("/health/live")
+    
+    # Assert
+    assert not_ready.status_code == 503
+    assert not_ready.json()["steps"]["database_pool"] == {"status": FAILED, "error": "Connection refused"}
+    assert ready.status_code == 200
+    assert live.status_code == 200
+
+@pytest.mark.asyncio
+async def test_warm_up_pool_leaves_connections_in_the_pool(monkeypatch):
+    # Arrange
+    stats = PoolStatistics()
+    engine = create_async_engine(
+        "sqlite+aiosqlite:///file:warmup?mode=memory&uri=true",
+        poolclass=instrumented_pool_class(stats),
+        pool_size=5
+    )
+    stats.attach(engine)
+    monkeypatch.setattr(base, "_engine", engine)
+    
+    # Act
+    await base.warm_up_pool(3)
+    
+    # Assert
+    snapshot = stats.snapshot()
+    assert snapshot["connections_opened"] == 3
+    assert snapshot["checked_out"] == 0
+    await engine.dispose()
+
+def test_sessions_bind_to_the_engine_on_first_use(monkeypatch):
+    engine = create_async_engine("sqlite+aiosqlite://")
+    monkeypatch.setattr(base, "_engine", engine)
+    session_factory = base._PrimarySessionMaker(class_=base.AsyncSession)
+    
+    session = session_factory()
+    
+    assert session.bind is engine